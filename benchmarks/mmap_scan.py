@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.analysis_context import AnalysisContext
+from modules.generic_rule_engine import GenericRuleEngine
+from modules.project_walker import walk_project
+from pinesawfly.scan_pipeline import MMAP_SCAN_MIN_BYTES
+
+BENCHMARK_EXTENSIONS = {".php", ".py", ".java"}
+
+
+def decoded_scan(engine: GenericRuleEngine, file_path: str) -> list[dict]:
+    return engine.scan_file(file_path, AnalysisContext.from_file(file_path))
+
+
+def mapped_scan(engine: GenericRuleEngine, file_path: str) -> list[dict]:
+    return engine.scan_mapped_file(file_path)
+
+
+def measure(scan: Callable[[GenericRuleEngine, str], list[dict]], files: list[str], repeat: int) -> tuple[float, list[list[dict]]]:
+    engine = GenericRuleEngine()
+    best = float("inf")
+    results: list[list[dict]] = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        results = [scan(engine, file_path) for file_path in files]
+        best = min(best, time.perf_counter() - started_at)
+    return best, results
+
+
+def peak_memory(scan: Callable[[GenericRuleEngine, str], list[dict]], files: list[str]) -> int:
+    engine = GenericRuleEngine()
+    peak = 0
+    for file_path in files:
+        tracemalloc.start()
+        scan(engine, file_path)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peak
+
+
+def findings_key(results: list[list[dict]]) -> list[list[tuple[object, ...]]]:
+    return [sorted((result["rule_id"], result["line"], result["match"]) for result in file_results) for file_results in results]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="对比规则引擎解码全文扫描与内存映射按字节扫描的耗时和峰值内存")
+    parser.add_argument("path", type=Path, help="待扫描的源码目录，建议包含较大的打包/压缩文件")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="重复次数，取最快一次")
+    parser.add_argument("--min-size", type=int, default=MMAP_SCAN_MIN_BYTES, help="只统计不小于该字节数的文件")
+    parser.add_argument("--include-dependencies", action="store_true", help="包含 vendor 等依赖目录")
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    inventory = walk_project(args.path, args.include_dependencies)
+    files = [str(path) for path in inventory.files_with_suffix(BENCHMARK_EXTENSIONS) if path.stat().st_size >= args.min_size]
+    size = sum(Path(file_path).stat().st_size for file_path in files)
+    print(f"文件 {len(files)} 个，共 {size / 1024 / 1024:.1f} MiB")
+    if not files:
+        return 0
+
+    decoded, expected = measure(decoded_scan, files, args.repeat)
+    mapped, actual = measure(mapped_scan, files, args.repeat)
+    print(f"解码全文: {decoded:.3f}s，峰值内存 {peak_memory(decoded_scan, files) / 1024 / 1024:.1f} MiB")
+    print(f"内存映射: {mapped:.3f}s（{decoded / mapped:.1f}x），峰值内存 {peak_memory(mapped_scan, files) / 1024 / 1024:.1f} MiB")
+    if findings_key(actual) != findings_key(expected):
+        print("错误：内存映射扫描的结果与解码全文扫描不一致", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.analysis_context import AnalysisContext
+from modules.generic_rule_engine import GenericRuleEngine
+from modules.project_walker import walk_project
+
+
+def legacy_string_comment_spans(content: str, start: int, end: int) -> list[tuple[int, int, str]]:
+    spans: list[tuple[int, int, str]] = []
+    i = start
+    while i < end:
+        char = content[i]
+        next_char = content[i + 1] if i + 1 < end else ""
+        if char in {"'", '"', "`"}:
+            span_start = i
+            quote = char
+            i += 1
+            while i < end:
+                if content[i] == "\\":
+                    i += 2
+                    continue
+                if content[i] == quote:
+                    i += 1
+                    break
+                i += 1
+            spans.append((span_start, min(i, end), "string"))
+            continue
+        if char == "/" and next_char == "/":
+            span_start = i
+            i = content.find("\n", i + 2)
+            if i == -1 or i > end:
+                i = end
+            spans.append((span_start, i, "comment"))
+            continue
+        if char == "#":
+            span_start = i
+            i = content.find("\n", i + 1)
+            if i == -1 or i > end:
+                i = end
+            spans.append((span_start, i, "comment"))
+            continue
+        if char == "/" and next_char == "*":
+            span_start = i
+            block_end = content.find("*/", i + 2)
+            i = end if block_end == -1 or block_end > end else block_end + 2
+            spans.append((span_start, i, "comment"))
+            continue
+        i += 1
+    return spans
+
+
+def measure(spans_for, engine: GenericRuleEngine, contents: list[str], repeat: int) -> tuple[float, list[list[tuple[int, int, str]]]]:
+    best = float("inf")
+    results: list[list[tuple[int, int, str]]] = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        results = [
+            [span for start, end in engine._php_code_spans(content) for span in spans_for(content, start, end)]
+            for content in contents
+        ]
+        best = min(best, time.perf_counter() - started_at)
+    return best, results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="对比 PHP 字符串/注释区间扫描的新旧实现吞吐量")
+    parser.add_argument("path", type=Path, help="待扫描的 PHP 源码目录")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="重复次数，取最快一次")
+    parser.add_argument("--include-dependencies", action="store_true", help="包含 vendor 等依赖目录")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    inventory = walk_project(args.path, args.include_dependencies)
+    contents = [AnalysisContext.from_file(path).content for path in inventory.files_with_suffix({".php"})]
+    size = sum(len(content) for content in contents) / 1024 / 1024
+    print(f"PHP 文件 {len(contents)} 个，共 {size:.1f} MiB")
+
+    engine = GenericRuleEngine()
+    legacy, expected = measure(legacy_string_comment_spans, engine, contents, args.repeat)
+    current, actual = measure(engine._php_string_comment_spans, engine, contents, args.repeat)
+    print(f"逐字符扫描: {legacy:.3f}s（{size / legacy:.1f} MiB/s）")
+    print(f"正则分词: {current:.3f}s（{size / current:.1f} MiB/s，{legacy / current:.1f}x）")
+
+    mismatched = [
+        index for index, content in enumerate(contents)
+        if "<<<" not in content and actual[index] != expected[index]
+    ]
+    heredoc_files = sum("<<<" in content for content in contents)
+    if heredoc_files:
+        print(f"{heredoc_files} 个文件含 heredoc/nowdoc，旧实现不识别，未参与一致性校验")
+    if mismatched:
+        print(f"错误：{len(mismatched)} 个文件的区间与旧实现不一致", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.analysis_context import AnalysisContext
+from modules.generic_rule_engine import GenericRuleEngine
+from modules.project_walker import walk_project
+
+BENCHMARK_EXTENSIONS = {".php", ".py", ".java"}
+
+
+def run_engine(engine: GenericRuleEngine, contexts: list[AnalysisContext], repeat: int) -> tuple[float, list[list[dict]]]:
+    best = float("inf")
+    results: list[list[dict]] = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        results = [engine.scan_file(context.path, context) for context in contexts]
+        best = min(best, time.perf_counter() - started_at)
+    return best, results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="对比规则引擎启用/关闭字面量预过滤时的扫描耗时")
+    parser.add_argument("path", type=Path, help="待扫描的源码目录，建议使用较大的 PHP 项目")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="重复次数，取最快一次")
+    parser.add_argument("--include-dependencies", action="store_true", help="包含 vendor 等依赖目录")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    inventory = walk_project(args.path, args.include_dependencies)
+    contexts = [AnalysisContext.from_file(path) for path in inventory.files_with_suffix(BENCHMARK_EXTENSIONS)]
+    size = sum(len(context.content) for context in contexts)
+    print(f"文件 {len(contexts)} 个，共 {size / 1024 / 1024:.1f} MiB")
+
+    baseline, expected = run_engine(GenericRuleEngine(prefilter=False), contexts, args.repeat)
+    engine = GenericRuleEngine()
+    prefiltered, actual = run_engine(engine, contexts, args.repeat)
+    print(f"无预过滤: {baseline:.3f}s")
+    print(f"字面量预过滤: {prefiltered:.3f}s（{baseline / prefiltered:.1f}x）" if prefiltered else "字面量预过滤: 0s")
+
+    unfiltered = [rule.id for rules in engine.rule_index.values() for rule in rules if not rule.literals]
+    if unfiltered:
+        print(f"无法提取字面量、每个文件都要执行的规则: {', '.join(unfiltered)}")
+    if actual != expected:
+        print("错误：启用预过滤后扫描结果不一致", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
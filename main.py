@@ -1,4 +1,4 @@
-from pinesawfly.app import main
+from pinesawfly.cli import main
 
 
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from pathlib import Path
+
+from tree_sitter import Language, Parser, Tree
+
+import tree_sitter_go
+import tree_sitter_java
+import tree_sitter_lua
+import tree_sitter_php
+import tree_sitter_python
+
+from modules.file_module import FileModule
+from modules.line_index import LineIndex
+
+SUPPORTED_AST_LANGUAGES = {
+    ".php": "php",
+    ".py": "python",
+    ".java": "java",
+    ".lua": "lua",
+    ".go": "go",
+}
+
+_thread_parsers = threading.local()
+
+
+@lru_cache(maxsize=None)
+def tree_language(language: str) -> Language:
+    factories = {
+        "php": tree_sitter_php.language_php,
+        "php_only": tree_sitter_php.language_php_only,
+        "python": tree_sitter_python.language,
+        "java": tree_sitter_java.language,
+        "lua": tree_sitter_lua.language,
+        "go": tree_sitter_go.language,
+    }
+    return Language(factories[language]())
+
+
+def parser_for(language: str) -> Parser:
+    parsers = getattr(_thread_parsers, "parsers", None)
+    if parsers is None:
+        parsers = _thread_parsers.parsers = {}
+    parser = parsers.get(language)
+    if parser is None:
+        parser = parsers[language] = Parser(tree_language(language))
+    return parser
+
+
+@dataclass(frozen=True)
+class AnalysisContext:
+    path: str
+    raw: bytes
+    content: str
+    encoding: str
+
+    @classmethod
+    def from_file(cls, file_path: str | os.PathLike[str]) -> "AnalysisContext":
+        raw, content, encoding = FileModule.read_decoded(file_path)
+        return cls(str(file_path), raw, content, encoding)
+
+    @classmethod
+    def from_bytes(cls, raw: bytes, file_path: str | os.PathLike[str]) -> "AnalysisContext":
+        content, encoding = FileModule.decode_bytes(raw)
+        return cls(str(file_path), raw, content, encoding)
+
+    @classmethod
+    def from_text(cls, content: str, file_path: str | os.PathLike[str] = "") -> "AnalysisContext":
+        return cls(str(file_path), content.encode("utf-8", errors="replace"), content, "utf-8")
+
+    @cached_property
+    def language(self) -> str | None:
+        return SUPPORTED_AST_LANGUAGES.get(Path(self.path).suffix.lower())
+
+    @cached_property
+    def source(self) -> bytes:
+        if self.encoding == "utf-8" and b"\r" not in self.raw:
+            return self.raw
+        return self.content.encode("utf-8", errors="replace")
+
+    @cached_property
+    def lines(self) -> LineIndex:
+        return LineIndex(self.content)
+
+    def ensure_lines(self) -> LineIndex:
+        return self.lines
+
+    @cached_property
+    def tree(self) -> Tree | None:
+        if not self.language:
+            return None
+        return parser_for(self.language).parse(self.source)
+
+    def ensure_tree(self) -> Tree | None:
+        return self.tree
+
+    def char_offset(self, byte_offset: int) -> int:
+        if len(self.source) == len(self.content):
+            return byte_offset
+        return len(self.source[:byte_offset].decode("utf-8", errors="replace"))
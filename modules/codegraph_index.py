@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CODEGRAPH_TIMEOUT_SECONDS = 45
+CODEGRAPH_DATABASE = Path(".codegraph") / "codegraph.db"
+
+_active: dict[Path, "CodegraphIndex"] = {}
+_active_lock = threading.Lock()
+
+
+class CodegraphIndex:
+    def __init__(self, project_path: str | Path, timeout: float = CODEGRAPH_TIMEOUT_SECONDS) -> None:
+        self.project = Path(project_path)
+        self.timeout = timeout
+        self.elapsed: float | None = None
+        self.returncode: int | None = None
+        self._process: subprocess.Popen[bytes] | None = None
+        self._thread: threading.Thread | None = None
+        self._started_at = 0.0
+        self._cancelled = False
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    @classmethod
+    def ensure(cls, project_path: str | Path, timeout: float = CODEGRAPH_TIMEOUT_SECONDS) -> "CodegraphIndex":
+        project = Path(project_path)
+        with _active_lock:
+            index = _active.get(project)
+            if index is None or not index.running:
+                index = _active[project] = cls(project, timeout).start()
+            return index
+
+    def start(self) -> "CodegraphIndex":
+        self._started_at = time.perf_counter()
+        try:
+            self._process = subprocess.Popen(
+                ["codegraph", "init", "-i"],
+                cwd=str(self.project),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                start_new_session=os.name != "nt",
+            )
+        except OSError:
+            logger.debug("codegraph init skipped for %s", self.project, exc_info=True)
+            return self
+        self._thread = threading.Thread(target=self._collect, name="codegraph-index", daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: float | None = None) -> bool:
+        if self._thread:
+            self._thread.join(timeout)
+        return self.returncode == 0
+
+    def database(self, timeout: float | None = None) -> Path | None:
+        self.wait(timeout)
+        path = self.project / CODEGRAPH_DATABASE
+        return path if path.is_file() else None
+
+    def cancel(self) -> None:
+        if self._process and self._process.poll() is None:
+            self._cancelled = True
+            self._kill()
+
+    def _kill(self) -> None:
+        if os.name != "nt":
+            try:
+                os.killpg(self._process.pid, signal.SIGKILL)
+                return
+            except OSError:
+                pass
+        self._process.kill()
+
+    def _collect(self) -> None:
+        process = self._process
+        try:
+            _stdout, stderr = process.communicate(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            self._kill()
+            _stdout, stderr = process.communicate()
+            logger.warning("codegraph 索引超过 %s 秒，已终止: %s", self.timeout, self.project)
+        self.returncode = process.returncode
+        self.elapsed = time.perf_counter() - self._started_at
+        if self._cancelled:
+            logger.info("codegraph 索引已取消: %s", self.project)
+        elif process.returncode:
+            message = (stderr or b"").decode("utf-8", "replace").strip().splitlines()
+            logger.info("codegraph 索引失败 (%s): %s", process.returncode, message[-1] if message else self.project)
+        else:
+            logger.info("codegraph 索引完成，用时 %.2f 秒", self.elapsed)
+
+
+def cancel_running_indexes() -> None:
+    with _active_lock:
+        indexes = list(_active.values())
+        _active.clear()
+    for index in indexes:
+        index.cancel()
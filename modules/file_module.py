@@ -1,31 +1,132 @@
 from __future__ import annotations
 
+import codecs
 import logging
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from typing import Generic, Hashable, TypeVar
 
 logger = logging.getLogger(__name__)
 
+ENCODINGS = ("utf-8", "gbk", "latin1")
+BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+ENCODING_CACHE_SIZE = 4096
+CONTENT_CACHE_SIZE = 64
+
+FileKey = tuple[str, int, int]
+T = TypeVar("T")
+
+
+class LRUCache(Generic[T]):
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._items: OrderedDict[Hashable, T] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> T | None:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: T) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_encodings: LRUCache[str] = LRUCache(ENCODING_CACHE_SIZE)
+_contents: LRUCache[tuple[str, str]] = LRUCache(CONTENT_CACHE_SIZE)
+
 
 class FileModule:
     @staticmethod
     def read_file_with_encoding(file_path: str | os.PathLike[str]) -> str:
-        path = Path(file_path)
-        for encoding in ("utf-8", "gbk", "gb2312", "latin1"):
-            try:
-                return path.read_text(encoding=encoding)
-            except UnicodeDecodeError:
-                continue
-            except OSError as exc:
-                logger.error("Failed to read %s with %s: %s", path, encoding, exc)
-                continue
+        key = FileModule.file_key(file_path)
+        cached = _contents.get(key) if key else None
+        if cached is None:
+            _raw, content, encoding = FileModule.read_decoded(file_path, key)
+            cached = (content, encoding)
+            if key:
+                _contents.put(key, cached)
+        return cached[0]
+
+    @staticmethod
+    def read_decoded(file_path: str | os.PathLike[str], key: FileKey | None = None) -> tuple[bytes, str, str]:
+        key = key or FileModule.file_key(file_path)
+        raw = FileModule.read_file_bytes(file_path)
+        content, encoding = FileModule.decode_bytes(raw, _encodings.get(key) if key else None)
+        if key:
+            _encodings.put(key, encoding)
+        return raw, content, encoding
 
+    @staticmethod
+    def file_encoding(file_path: str | os.PathLike[str]) -> str:
+        key = FileModule.file_key(file_path)
+        encoding = _encodings.get(key) if key else None
+        if encoding is None:
+            _raw, _content, encoding = FileModule.read_decoded(file_path, key)
+        return encoding
+
+    @staticmethod
+    def file_key(file_path: str | os.PathLike[str]) -> FileKey | None:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def read_file_bytes(file_path: str | os.PathLike[str]) -> bytes:
+        path = Path(file_path)
         try:
-            return path.read_bytes().decode("utf-8", errors="ignore")
+            return path.read_bytes()
         except OSError as exc:
-            logger.error("Failed to force-decode %s: %s", path, exc)
+            logger.error("Failed to read %s: %s", path, exc)
             raise OSError(f"Unable to read file {path}") from exc
 
+    @staticmethod
+    def decode_bytes(raw: bytes, encoding_hint: str | None = None) -> tuple[str, str]:
+        for bom, encoding in BOM_ENCODINGS:
+            if raw.startswith(bom):
+                return _normalize_newlines(raw.decode(encoding, errors="replace")), encoding
+        if raw.isascii():
+            return _normalize_newlines(raw.decode("ascii")), "utf-8"
+        encodings = ENCODINGS if encoding_hint in (None, ENCODINGS[0]) else (encoding_hint, *ENCODINGS)
+        for encoding in encodings:
+            try:
+                content = raw.decode(encoding)
+            except (UnicodeDecodeError, LookupError):
+                continue
+            return _normalize_newlines(content), encoding
+        return raw.decode("utf-8", errors="ignore"), "utf-8"
+
+    @staticmethod
+    def clear_cache() -> None:
+        _encodings.clear()
+        _contents.clear()
+
     @staticmethod
     def get_file_extension(file_path: str | os.PathLike[str]) -> str:
         return os.path.splitext(str(file_path))[1].lower()
+
+
+def _normalize_newlines(content: str) -> str:
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
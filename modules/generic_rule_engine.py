@@ -1,21 +1,118 @@
 from __future__ import annotations
 
+import codecs
 import json
 import logging
+import mmap
+import os
 import re
+import time
+from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
+from tree_sitter import Node, Query, QueryCursor, QueryError
 
 from core.exception_handler import safe_operation
+from modules.analysis_context import SUPPORTED_AST_LANGUAGES, AnalysisContext, tree_language
 from modules.file_module import FileModule
+from modules.line_index import LineIndex
+from modules.rule_budget import MAX_RULE_OVERRUNS, RULE_TIME_BUDGET_SECONDS, RuleDeadline, RuleOverrun, RuleTimeout
+from modules.rule_literals import LiteralScan, byte_compatible, fold, required_literals
+from modules.rule_profile import RuleProfile
+from modules.scan_control import ScanControl
+from modules.span_index import OUTSIDE_PHP, IgnoredSpans, Span
 
 logger = logging.getLogger(__name__)
 
+PHP_OPEN_TAG = re.compile(r"<\?(?:php|=)?", re.IGNORECASE)
+PHP_LEXICAL_TOKEN = re.compile(
+    r"(?=['\"`#/<])(?:"
+    r"'[^'\\]*(?:\\.[^'\\]*)*(?:'|\\?\Z)"
+    r'|"[^"\\]*(?:\\.[^"\\]*)*(?:"|\\?\Z)'
+    r"|`[^`\\]*(?:\\.[^`\\]*)*(?:`|\\?\Z)"
+    r"|(?://|\#)[^\n]*"
+    r"|/\*[^*]*(?:\*+[^*/][^*]*)*(?:\*+/|\**\Z)"
+    r"|<<<[ \t]*([\"']?)([^\W\d]\w*)\1\r?\n(?:.*?(?<=\n)[ \t]*\2(?!\w)|.*\Z)"
+    r")",
+    re.DOTALL,
+)
+PHP_COMMENT_STARTS = frozenset("#/")
+PHP_OPEN_TAG_BYTES = re.compile(rb"<\?(?:php|=)?", re.IGNORECASE)
+PHP_LEXICAL_TOKEN_BYTES = re.compile(
+    PHP_LEXICAL_TOKEN.pattern
+    .replace(r"[^\W\d]\w*", r"[A-Za-z_\x80-\xff][A-Za-z0-9_\x80-\xff]*")
+    .replace(r"(?!\w)", r"(?![A-Za-z0-9_\x80-\xff])")
+    .encode("ascii"),
+    re.DOTALL,
+)
+PHP_COMMENT_START_BYTES = frozenset(b"#/")
+NON_ASCII_BYTES = re.compile(rb"[\x80-\xff]")
+LONE_CR_BYTES = re.compile(rb"\r(?!\n)")
+WIDE_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+RULE_LANGUAGES = {
+    ".php": "php",
+    ".py": "python",
+    ".java": "java",
+}
+QUERY_MATCH_CAPTURE = "match"
+SHARED_CONTEXT_COST_ID = "(context)"
+SHARED_CONTEXT_COST_TYPE = "CONTEXT"
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    id: str
+    name: str
+    severity: str
+    description: str
+    type: str
+    pattern: str
+    regex: re.Pattern[str] | None
+    byte_regex: re.Pattern[bytes] | None
+    byte_compatible: bool
+    byte_literals: re.Pattern[bytes] | None
+    query: Query | None
+    skip_contexts: frozenset[str]
+    scan_full_file: bool
+    literals: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class RuleQuery:
+    query: Query
+    rules: tuple[CompiledRule, ...]
+
+
+def compile_rule_query(language: str, pattern: str) -> Query:
+    if language not in set(SUPPORTED_AST_LANGUAGES.values()):
+        raise QueryError(f"语言 {language} 不支持语法树查询")
+    return Query(tree_language(language), pattern)
+
 
 class GenericRuleEngine:
-    def __init__(self, rules_dir: str | None = None):
+    def __init__(
+        self,
+        rules_dir: str | None = None,
+        prefilter: bool = True,
+        rule_budget: float = RULE_TIME_BUDGET_SECONDS,
+        include_disabled: bool = False,
+        control: ScanControl | None = None,
+    ):
         self.rules_dir = Path(rules_dir) if rules_dir else Path(__file__).resolve().parent.parent / "rules"
+        self.prefilter = prefilter
+        self.rule_budget = rule_budget
+        self.include_disabled = include_disabled
+        self.control = control
+        self.profile = RuleProfile()
+        self.overruns: list[RuleOverrun] = []
+        self.suspended_rules: set[str] = set()
+        self._overrun_counts: Counter[str] = Counter()
         self.rules: dict[str, list[dict[str, Any]]] = {}
+        self.rule_index: Mapping[str, tuple[CompiledRule, ...]] = MappingProxyType({})
+        self.query_index: Mapping[str, RuleQuery] = MappingProxyType({})
         self._load_all_rules()
 
     def _load_all_rules(self) -> None:
@@ -26,11 +123,87 @@ class GenericRuleEngine:
         for file_path in self.rules_dir.glob("*_rules.json"):
             language = file_path.name.replace("_rules.json", "")
             self.rules[language] = self._load_rules_from_file(file_path)
+        self.rule_index = MappingProxyType({
+            language: tuple(compiled for rule in rules if (compiled := self._compile_rule(rule, language)))
+            for language, rules in self.rules.items()
+        })
+        self.query_index = MappingProxyType({
+            language: query
+            for language, rules in self.rule_index.items()
+            if (query := self._compile_language_query(language, rules))
+        })
+
+    def _compile_rule(self, rule: dict[str, Any], language: str) -> CompiledRule | None:
+        regex = query = None
+        flags = self._regex_flags(rule["flags"])
+        if rule["type"] == "REGEX":
+            try:
+                regex = re.compile(rule["pattern"], flags)
+            except re.error as exc:
+                logger.error("规则 %s 的正则表达式错误，已停用: %s", rule["id"], exc)
+                return None
+        elif rule["type"] == "AST_QUERY":
+            try:
+                query = compile_rule_query(language, rule["pattern"])
+            except QueryError as exc:
+                logger.error("规则 %s 的语法树查询错误，已停用: %s", rule["id"], exc)
+                return None
+        else:
+            logger.error("规则 %s 的类型 %s 不受支持，已停用", rule["id"], rule["type"])
+            return None
+        requires = rule["requires"]
+        if isinstance(requires, str):
+            requires = [requires]
+        if requires:
+            literals = tuple(fold(str(literal)) for literal in requires if literal)
+        else:
+            literals = required_literals(rule["pattern"], flags) if regex else ()
+        return CompiledRule(
+            id=rule["id"],
+            name=rule["name"],
+            severity=rule["severity"],
+            description=rule["description"],
+            type=rule["type"],
+            pattern=rule["pattern"],
+            regex=regex,
+            byte_regex=self._compile_byte_regex(rule["pattern"], flags) if regex else None,
+            byte_compatible=bool(regex) and byte_compatible(rule["pattern"], flags),
+            byte_literals=self._compile_byte_literals(literals),
+            query=query,
+            skip_contexts=frozenset(rule["skipContexts"] or []) | {OUTSIDE_PHP},
+            scan_full_file=rule["scanFullFile"],
+            literals=literals,
+        )
+
+    def _compile_byte_regex(self, pattern: str, flags: int) -> re.Pattern[bytes] | None:
+        if not pattern.isascii():
+            return None
+        try:
+            return re.compile(pattern.encode("ascii"), flags)
+        except re.error:
+            return None
+
+    def _compile_byte_literals(self, literals: tuple[str, ...]) -> re.Pattern[bytes] | None:
+        if not literals or not all(literal.isascii() for literal in literals):
+            return None
+        return re.compile(b"|".join(re.escape(literal.encode("ascii")) for literal in literals), re.IGNORECASE)
+
+    def _compile_language_query(self, language: str, rules: tuple[CompiledRule, ...]) -> RuleQuery | None:
+        query_rules = [rule for rule in rules if rule.query]
+        if not query_rules:
+            return None
+        pattern_rules = tuple(rule for rule in query_rules for _ in range(rule.query.pattern_count))
+        source = "\n".join(rule.pattern for rule in query_rules)
+        return RuleQuery(query=compile_rule_query(language, source), rules=pattern_rules)
 
     def _load_rules_from_file(self, rules_file: Path) -> list[dict[str, Any]]:
         try:
             data = json.loads(rules_file.read_text(encoding="utf-8"))
-            rules = [self._normalize_rule(rule) for rule in data.get("rules", []) if rule.get("enabled", True)]
+            rules = [
+                self._normalize_rule(rule)
+                for rule in data.get("rules", [])
+                if self.include_disabled or rule.get("enabled", True)
+            ]
             logger.info("从 %s 加载了 %s 条规则", rules_file, len(rules))
             return rules
         except OSError as exc:
@@ -50,6 +223,7 @@ class GenericRuleEngine:
             "flags": rule.get("flags", []),
             "skipContexts": rule.get("skipContexts", []),
             "scanFullFile": bool(rule.get("scanFullFile", False)),
+            "requires": rule.get("requires", []),
         }
 
     def get_rules_by_language(self, language: str) -> list[dict[str, Any]]:
@@ -58,144 +232,323 @@ class GenericRuleEngine:
     def get_all_rules(self) -> dict[str, list[dict[str, Any]]]:
         return self.rules
 
+    def take_overruns(self) -> list[RuleOverrun]:
+        overruns, self.overruns = self.overruns, []
+        return overruns
+
+    def take_profile(self) -> RuleProfile:
+        profile, self.profile = self.profile, RuleProfile()
+        return profile
+
     @safe_operation
-    def scan_file(self, file_path: str) -> list[dict[str, Any]]:
-        language = {
-            ".php": "php",
-            ".py": "python",
-            ".java": "java",
-        }.get(Path(file_path).suffix.lower())
-
-        if not language or language not in self.rules:
-            logger.info("不支持的语言或无对应规则: %s", Path(file_path).suffix.lower())
+    def scan_file(self, file_path: str, context: AnalysisContext | None = None) -> list[dict[str, Any]]:
+        language = self._rule_language(file_path)
+        if not language:
             return []
 
-        content = FileModule.read_file_with_encoding(file_path)
-        results: list[dict[str, Any]] = []
-        ignored_spans = self._ignored_spans(content, language)
-        for rule in self.rules[language]:
-            try:
-                results.extend(self._match_rule(content, rule, file_path, ignored_spans))
-            except Exception as exc:
-                logger.error("应用规则 %s 时出错: %s", rule["id"], exc)
+        context = context or AnalysisContext.from_file(file_path)
+        rules = self._active_rules(language)
+        if self.prefilter:
+            literals = LiteralScan(context.content)
+            rules = [rule for rule in rules if not rule.literals or literals.any_present(rule.literals)]
+        ignored_spans = IgnoredSpans(lambda: self._ignored_spans(context.content, language))
 
+        def prepare(regex_rules: list[CompiledRule]) -> None:
+            context.ensure_lines()
+            ignored_spans.prepare(self._skip_contexts(regex_rules))
+
+        results = self._apply_rules(
+            language,
+            rules,
+            file_path,
+            prepare,
+            lambda rule, deadline: self._match_rule(context, rule, file_path, ignored_spans, deadline),
+            lambda: context,
+        )
         logger.info("通用规则引擎在文件 %s 中发现 %s 个问题", file_path, len(results))
         return results
 
-    def _match_rule(
+    @safe_operation
+    def scan_mapped_file(self, file_path: str) -> list[dict[str, Any]]:
+        language = self._rule_language(file_path)
+        if not language:
+            return []
+
+        with open(file_path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                return self.scan_file(file_path, AnalysisContext.from_bytes(b"", file_path))
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if buffer[:4].startswith(WIDE_BOMS) or LONE_CR_BYTES.search(buffer):
+                    return self.scan_file(file_path, AnalysisContext.from_bytes(buffer[:], file_path))
+                results = self._scan_buffer(file_path, language, buffer)
+        logger.info("通用规则引擎在文件 %s 中发现 %s 个问题（内存映射）", file_path, len(results))
+        return results
+
+    def _scan_buffer(self, file_path: str, language: str, buffer: mmap.mmap) -> list[dict[str, Any]]:
+        decoded: list[AnalysisContext] = []
+        lines: list[LineIndex] = []
+        non_ascii: list[bool] = []
+
+        def context() -> AnalysisContext:
+            if not decoded:
+                decoded.append(AnalysisContext.from_bytes(buffer[:], file_path))
+            return decoded[0]
+
+        def has_non_ascii() -> bool:
+            if not non_ascii:
+                non_ascii.append(NON_ASCII_BYTES.search(buffer) is not None)
+            return non_ascii[0]
+
+        def line_index() -> LineIndex:
+            if not lines:
+                lines.append(LineIndex(buffer))
+            return lines[0]
+
+        rules = self._active_rules(language)
+        if self.prefilter:
+            rules = [rule for rule in rules if not rule.byte_literals or rule.byte_literals.search(buffer)]
+        byte_spans = IgnoredSpans(lambda: self._ignored_spans(buffer, language))
+        text_spans = IgnoredSpans(lambda: self._ignored_spans(context().content, language))
+
+        def needs_decoding(rule: CompiledRule) -> bool:
+            return rule.byte_regex is None or (not rule.byte_compatible and has_non_ascii())
+
+        def prepare(regex_rules: list[CompiledRule]) -> None:
+            decoded_rules = [rule for rule in regex_rules if needs_decoding(rule)]
+            byte_rules = [rule for rule in regex_rules if not needs_decoding(rule)]
+            if decoded_rules:
+                context().ensure_lines()
+                text_spans.prepare(self._skip_contexts(decoded_rules))
+            if byte_rules:
+                line_index()
+                byte_spans.prepare(self._skip_contexts(byte_rules))
+
+        def match(rule: CompiledRule, deadline: RuleDeadline) -> tuple[list[dict[str, Any]], int]:
+            if needs_decoding(rule):
+                return self._match_rule(context(), rule, file_path, text_spans, deadline)
+            return self._match_buffer(buffer, line_index, rule, file_path, byte_spans, deadline)
+
+        return self._apply_rules(language, rules, file_path, prepare, match, context)
+
+    def _rule_language(self, file_path: str) -> str | None:
+        language = RULE_LANGUAGES.get(Path(file_path).suffix.lower())
+        if not language or language not in self.rule_index:
+            logger.info("不支持的语言或无对应规则: %s", Path(file_path).suffix.lower())
+            return None
+        return language
+
+    def _active_rules(self, language: str) -> list[CompiledRule] | tuple[CompiledRule, ...]:
+        rules = self.rule_index[language]
+        if self.control:
+            self.suspended_rules.update(rule_id for rule_id, count in self.control.overrun_counts().items() if count >= MAX_RULE_OVERRUNS)
+        if self.suspended_rules:
+            return [rule for rule in rules if rule.id not in self.suspended_rules]
+        return rules
+
+    def _apply_rules(
         self,
-        content: str,
-        rule: dict[str, Any],
+        language: str,
+        rules: list[CompiledRule] | tuple[CompiledRule, ...],
         file_path: str,
-        ignored_spans: list[tuple[int, int, str]],
+        prepare: Callable[[list[CompiledRule]], None],
+        match: Callable[[CompiledRule, RuleDeadline], tuple[list[dict[str, Any]], int]],
+        context: Callable[[], AnalysisContext],
     ) -> list[dict[str, Any]]:
-        if rule.get("type", "REGEX") != "REGEX":
-            return []
-
-        try:
-            regex = re.compile(rule.get("pattern", ""), self._regex_flags(rule.get("flags", [])))
-        except re.error as exc:
-            logger.error("规则 %s 的正则表达式错误: %s", rule["id"], exc)
-            return []
+        results: list[dict[str, Any]] = []
+        query_rules: set[str] = set()
+        regex_rules = [rule for rule in rules if not rule.query]
+        if regex_rules:
+            started_at = time.perf_counter()
+            prepare(regex_rules)
+            self.profile.record(language, SHARED_CONTEXT_COST_ID, SHARED_CONTEXT_COST_TYPE, time.perf_counter() - started_at, 0, 0)
+        for rule in rules:
+            if rule.query:
+                query_rules.add(rule.id)
+                continue
+            deadline = RuleDeadline(self.rule_budget)
+            rule_results: list[dict[str, Any]] = []
+            skipped = 0
+            try:
+                with deadline:
+                    rule_results, skipped = match(rule, deadline)
+                results.extend(rule_results)
+            except RuleTimeout:
+                rule_results = []
+                self._record_overrun(rule.id, file_path, deadline.elapsed)
+            except Exception as exc:
+                logger.error("应用规则 %s 时出错: %s", rule.id, exc)
+            self.profile.record(language, rule.id, rule.type, deadline.elapsed, len(rule_results), skipped)
+        if query_rules:
+            deadline = RuleDeadline(self.rule_budget)
+            query_results: list[dict[str, Any]] = []
+            try:
+                with deadline:
+                    query_results = self._match_query(context(), self.query_index[language], query_rules, file_path)
+                    deadline.check()
+                results.extend(query_results)
+            except RuleTimeout:
+                query_results = []
+                for rule_id in sorted(query_rules):
+                    self._record_overrun(rule_id, file_path, deadline.elapsed)
+            except Exception as exc:
+                logger.error("应用语法树查询规则时出错: %s", exc)
+            self._record_query_profile(language, query_rules, deadline.elapsed, query_results)
+        return results
 
+    def _match_rule(
+        self,
+        context: AnalysisContext,
+        rule: CompiledRule,
+        file_path: str,
+        ignored_spans: IgnoredSpans,
+        deadline: RuleDeadline,
+    ) -> tuple[list[dict[str, Any]], int]:
         results = []
-        for match in regex.finditer(content):
+        skipped = 0
+        for match in rule.regex.finditer(context.content):
+            deadline.check()
             if self._should_skip_match(match.start(), rule, ignored_spans):
+                skipped += 1
                 continue
             results.append({
-                "rule_id": rule["id"],
-                "rule_name": rule["name"],
-                "severity": rule["severity"],
+                "rule_id": rule.id,
+                "rule_name": rule.name,
+                "severity": rule.severity,
                 "file": file_path,
-                "line": content[:match.start()].count("\n") + 1,
-                "description": rule["description"],
+                "line": context.lines.line_at(match.start()),
+                "description": rule.description,
                 "match": match.group(0),
             })
+        return results, skipped
+
+    def _match_buffer(
+        self,
+        buffer: mmap.mmap,
+        line_index: Callable[[], LineIndex],
+        rule: CompiledRule,
+        file_path: str,
+        ignored_spans: IgnoredSpans,
+        deadline: RuleDeadline,
+    ) -> tuple[list[dict[str, Any]], int]:
+        results = []
+        skipped = 0
+        for match in rule.byte_regex.finditer(buffer):
+            deadline.check()
+            if self._should_skip_match(match.start(), rule, ignored_spans):
+                skipped += 1
+                continue
+            matched_text, _encoding = FileModule.decode_bytes(match.group(0))
+            results.append({
+                "rule_id": rule.id,
+                "rule_name": rule.name,
+                "severity": rule.severity,
+                "file": file_path,
+                "line": line_index().line_at(match.start()),
+                "description": rule.description,
+                "match": matched_text,
+            })
+        return results, skipped
+
+    def _record_query_profile(self, language: str, rule_ids: set[str], seconds: float, results: list[dict[str, Any]]) -> None:
+        matches = Counter(result["rule_id"] for result in results)
+        share = seconds / len(rule_ids)
+        for rule_id in rule_ids:
+            self.profile.record(language, rule_id, "AST_QUERY", share, matches[rule_id], 0)
+
+    def _record_overrun(self, rule_id: str, file_path: str, elapsed: float) -> None:
+        self._overrun_counts[rule_id] += 1
+        count = self._overrun_counts[rule_id]
+        if self.control:
+            self.control.record_overrun(rule_id)
+            count = max(count, self.control.overrun_counts()[rule_id])
+        suspended = count >= MAX_RULE_OVERRUNS
+        if suspended:
+            self.suspended_rules.add(rule_id)
+        overrun = RuleOverrun(rule_id, file_path, elapsed, suspended)
+        self.overruns.append(overrun)
+        logger.warning("%s", overrun.describe())
+
+    def _match_query(
+        self,
+        context: AnalysisContext,
+        rule_query: RuleQuery,
+        rule_ids: set[str],
+        file_path: str,
+    ) -> list[dict[str, Any]]:
+        if context.tree is None:
+            return []
+        results = []
+        for pattern_index, captures in QueryCursor(rule_query.query).matches(context.tree.root_node):
+            rule = rule_query.rules[pattern_index]
+            if rule.id not in rule_ids:
+                continue
+            node = self._query_match_node(captures)
+            if node is None:
+                continue
+            results.append({
+                "rule_id": rule.id,
+                "rule_name": rule.name,
+                "severity": rule.severity,
+                "file": file_path,
+                "line": context.lines.line_at(context.char_offset(node.start_byte)),
+                "description": rule.description,
+                "match": context.source[node.start_byte:node.end_byte].decode("utf-8", errors="replace"),
+            })
+        results.sort(key=lambda result: result["line"])
         return results
 
-    def _ignored_spans(self, content: str, language: str) -> list[tuple[int, int, str]]:
+    def _query_match_node(self, captures: dict[str, list[Node]]) -> Node | None:
+        nodes = captures.get(QUERY_MATCH_CAPTURE) or [node for group in captures.values() for node in group]
+        return min(nodes, key=lambda node: (node.start_byte, -node.end_byte), default=None)
+
+    def _ignored_spans(self, content: str | mmap.mmap, language: str) -> list[Span]:
         if language != "php":
             return []
         return self._php_ignored_spans(content)
 
-    def _should_skip_match(self, start: int, rule: dict[str, Any], ignored_spans: list[tuple[int, int, str]]) -> bool:
-        if rule.get("scanFullFile"):
-            return False
-        if any(span_start <= start < span_end and context == "outside_php" for span_start, span_end, context in ignored_spans):
-            return True
-        if not rule.get("skipContexts"):
+    def _skip_contexts(self, rules: list[CompiledRule]) -> set[frozenset[str]]:
+        return {rule.skip_contexts for rule in rules if not rule.scan_full_file}
+
+    def _should_skip_match(self, start: int, rule: CompiledRule, ignored_spans: IgnoredSpans) -> bool:
+        if rule.scan_full_file:
             return False
-        contexts = set(rule.get("skipContexts") or [])
-        return any(span_start <= start < span_end and context in contexts for span_start, span_end, context in ignored_spans)
+        return ignored_spans.covers(start, rule.skip_contexts)
 
-    def _php_ignored_spans(self, content: str) -> list[tuple[int, int, str]]:
+    def _php_ignored_spans(self, content: str | mmap.mmap) -> list[Span]:
         code_spans = self._php_code_spans(content)
         if not code_spans:
-            return [(0, len(content), "outside_php")]
+            return [(0, len(content), OUTSIDE_PHP)]
 
-        ignored: list[tuple[int, int, str]] = []
+        ignored: list[Span] = []
         cursor = 0
         for start, end in code_spans:
             if cursor < start:
-                ignored.append((cursor, start, "outside_php"))
+                ignored.append((cursor, start, OUTSIDE_PHP))
             ignored.extend(self._php_string_comment_spans(content, start, end))
             cursor = end
         if cursor < len(content):
-            ignored.append((cursor, len(content), "outside_php"))
+            ignored.append((cursor, len(content), OUTSIDE_PHP))
         return ignored
 
-    def _php_code_spans(self, content: str) -> list[tuple[int, int]]:
-        tag_pattern = re.compile(r"<\?(?:php|=)?", re.IGNORECASE)
+    def _php_code_spans(self, content: str | mmap.mmap) -> list[tuple[int, int]]:
         spans: list[tuple[int, int]] = []
-        for match in tag_pattern.finditer(content):
+        open_tag, close_tag = (PHP_OPEN_TAG, "?>") if isinstance(content, str) else (PHP_OPEN_TAG_BYTES, b"?>")
+        for match in open_tag.finditer(content):
             start = match.end()
-            close = content.find("?>", start)
+            close = content.find(close_tag, start)
             end = len(content) if close == -1 else close
             spans.append((start, end))
         return spans
 
-    def _php_string_comment_spans(self, content: str, start: int, end: int) -> list[tuple[int, int, str]]:
-        spans: list[tuple[int, int, str]] = []
-        i = start
-        while i < end:
-            char = content[i]
-            next_char = content[i + 1] if i + 1 < end else ""
-            if char in {"'", '"', "`"}:
-                span_start = i
-                quote = char
-                i += 1
-                while i < end:
-                    if content[i] == "\\":
-                        i += 2
-                        continue
-                    if content[i] == quote:
-                        i += 1
-                        break
-                    i += 1
-                spans.append((span_start, min(i, end), "string"))
-                continue
-            if char == "/" and next_char == "/":
-                span_start = i
-                i = content.find("\n", i + 2)
-                if i == -1 or i > end:
-                    i = end
-                spans.append((span_start, i, "comment"))
-                continue
-            if char == "#":
-                span_start = i
-                i = content.find("\n", i + 1)
-                if i == -1 or i > end:
-                    i = end
-                spans.append((span_start, i, "comment"))
-                continue
-            if char == "/" and next_char == "*":
-                span_start = i
-                block_end = content.find("*/", i + 2)
-                i = end if block_end == -1 or block_end > end else block_end + 2
-                spans.append((span_start, i, "comment"))
-                continue
-            i += 1
-        return spans
+    def _php_string_comment_spans(self, content: str | mmap.mmap, start: int, end: int) -> list[Span]:
+        if isinstance(content, str):
+            token, comment_starts = PHP_LEXICAL_TOKEN, PHP_COMMENT_STARTS
+        else:
+            token, comment_starts = PHP_LEXICAL_TOKEN_BYTES, PHP_COMMENT_START_BYTES
+        return [
+            (match.start(), match.end(), "comment" if content[match.start()] in comment_starts else "string")
+            for match in token.finditer(content, start, end)
+        ]
 
     def _regex_flags(self, flags: Any) -> int:
         if isinstance(flags, str):
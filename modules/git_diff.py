@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+
+class GitError(RuntimeError):
+    def __init__(self, message: str, returncode: int | None = None) -> None:
+        super().__init__(message)
+        self.returncode = returncode
+
+
+@dataclass(frozen=True)
+class FileChange:
+    status: str
+    path: str
+    old_path: str | None = None
+
+    @property
+    def deleted(self) -> bool:
+        return self.status == "D"
+
+
+class GitRepository:
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def resolve(self, revision: str) -> str:
+        try:
+            return self._git("rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}").decode().strip()
+        except GitError as exc:
+            raise GitError(f"无法解析版本: {revision}", exc.returncode) from exc
+
+    def changed_files(self, base: str, head: str) -> list[FileChange]:
+        output = self._git("diff", "--name-status", "-z", "-M", "--relative", "--no-ext-diff", base, head)
+        fields = output.decode("utf-8", "surrogateescape").split("\0")
+        changes: list[FileChange] = []
+        index = 0
+        while index < len(fields) and fields[index]:
+            status = fields[index][0]
+            if status in {"R", "C"}:
+                changes.append(FileChange(status, fields[index + 2], fields[index + 1]))
+                index += 3
+            else:
+                changes.append(FileChange(status, fields[index + 1]))
+                index += 2
+        return changes
+
+    def grep_files(self, revision: str, pattern: str, pathspecs: list[str]) -> list[str]:
+        try:
+            output = self._git("grep", "-l", "-z", "-I", "-E", pattern, revision, "--", *pathspecs)
+        except GitError as exc:
+            if exc.returncode == 1:
+                return []
+            raise
+        prefix = f"{revision}:"
+        names = output.decode("utf-8", "surrogateescape").split("\0")
+        return [name[len(prefix):] if name.startswith(prefix) else name for name in names if name]
+
+    def read_blobs(self, revision: str, paths: list[str]) -> dict[str, bytes]:
+        requested = [path for path in paths if "\n" not in path]
+        if not requested:
+            return {}
+        payload = "".join(f"{revision}:./{path}\n" for path in requested).encode("utf-8", "surrogateescape")
+        output = self._git("cat-file", "--batch", input=payload)
+        blobs: dict[str, bytes] = {}
+        position = 0
+        for path in requested:
+            header_end = output.index(b"\n", position)
+            header = output[position:header_end].split()
+            position = header_end + 1
+            if len(header) != 3 or header[1] != b"blob":
+                continue
+            size = int(header[2])
+            blobs[path] = output[position:position + size]
+            position += size + 1
+        return blobs
+
+    def _git(self, *args: str, input: bytes | None = None) -> bytes:
+        try:
+            completed = subprocess.run(
+                ["git", *args],
+                cwd=str(self.path),
+                input=input,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=False,
+            )
+        except OSError as exc:
+            raise GitError(f"无法执行 git: {exc}") from exc
+        if completed.returncode:
+            message = completed.stderr.decode("utf-8", "replace").strip() or f"git {args[0]} 失败"
+            raise GitError(message, completed.returncode)
+        return completed.stdout
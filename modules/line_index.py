@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import mmap
+from bisect import bisect_right
+
+
+class LineIndex:
+    __slots__ = ("starts", "length")
+
+    def __init__(self, text: str | bytes | mmap.mmap) -> None:
+        newline = "\n" if isinstance(text, str) else b"\n"
+        starts = [0]
+        index = text.find(newline)
+        while index != -1:
+            starts.append(index + 1)
+            index = text.find(newline, index + 1)
+        self.starts = starts
+        self.length = len(text)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def line_at(self, offset: int) -> int:
+        return bisect_right(self.starts, offset)
+
+    def column_at(self, offset: int) -> int:
+        return offset - self.starts[self.line_at(offset) - 1] + 1
+
+    def position(self, offset: int) -> tuple[int, int]:
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+    def line_start(self, line: int) -> int:
+        return self.starts[max(1, min(line, len(self.starts))) - 1]
+
+    def line_end(self, line: int) -> int:
+        if line < len(self.starts):
+            return self.starts[max(1, line)] - 1
+        return self.length
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+ALWAYS_IGNORED_DIRS = {
+    ".git",
+    ".venv",
+    ".codegraph",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+}
+DEPENDENCY_DIRS = {"vendor", "node_modules", "bower_components", "thinkphp"}
+
+
+@dataclass(frozen=True)
+class ProjectInventory:
+    root: Path
+    files: tuple[Path, ...]
+    directories: tuple[Path, ...]
+    include_dependencies: bool = False
+    relative_files: frozenset[str] = field(init=False, repr=False, compare=False)
+    relative_dirs: frozenset[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "relative_files", frozenset(path.relative_to(self.root).as_posix() for path in self.files))
+        object.__setattr__(self, "relative_dirs", frozenset(path.relative_to(self.root).as_posix() for path in self.directories))
+
+    def files_with_suffix(self, suffixes: Iterable[str]) -> list[Path]:
+        suffixes = {suffix.lower() for suffix in suffixes}
+        return [path for path in self.files if path.suffix.lower() in suffixes]
+
+    def has_file(self, relative_path: str) -> bool:
+        return relative_path in self.relative_files
+
+    def has_dir(self, relative_path: str) -> bool:
+        return relative_path in self.relative_dirs
+
+    def any_match(self, pattern: str) -> bool:
+        regex = _glob_regex(pattern)
+        return any(regex.match(path) for path in (*self.relative_dirs, *self.relative_files))
+
+    def with_changes(
+        self,
+        added_files: Iterable[Path] = (),
+        removed_paths: Iterable[Path] = (),
+        added_dirs: Iterable[Path] = (),
+    ) -> "ProjectInventory":
+        removed = set(removed_paths)
+        if removed:
+            def kept(path: Path) -> bool:
+                return path not in removed and not any(parent in removed for parent in path.parents)
+        else:
+            def kept(path: Path) -> bool:
+                return True
+        files = {path for path in self.files if kept(path)} | set(added_files)
+        directories = {path for path in self.directories if kept(path)} | set(added_dirs)
+        return ProjectInventory(
+            root=self.root,
+            files=tuple(sorted(files)),
+            directories=tuple(sorted(directories)),
+            include_dependencies=self.include_dependencies,
+        )
+
+
+class ProjectWalker:
+    def __init__(self, include_dependencies: bool = False) -> None:
+        self.include_dependencies = include_dependencies
+        self._dependency_dirs: dict[Path, bool] = {}
+
+    def walk(self, project_path: str | os.PathLike[str]) -> ProjectInventory:
+        root = Path(project_path)
+        files: list[Path] = []
+        directories: list[Path] = []
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = list(iterator)
+            except OSError as exc:
+                logger.debug("无法读取目录 %s: %s", directory, exc)
+                continue
+            sibling_files = {entry.name for entry in entries if _entry_is_file(entry)}
+            for entry in entries:
+                path = Path(entry.path)
+                if _entry_is_dir(entry):
+                    if entry.name in ALWAYS_IGNORED_DIRS:
+                        continue
+                    directories.append(path)
+                    if not self.include_dependencies and self._is_dependency_dir(path, sibling_files):
+                        continue
+                    pending.append(path)
+                elif entry.name in sibling_files:
+                    files.append(path)
+        return ProjectInventory(
+            root=root,
+            files=tuple(sorted(files)),
+            directories=tuple(sorted(directories)),
+            include_dependencies=self.include_dependencies,
+        )
+
+    def is_ignored(self, path: Path, root: Path | None = None) -> bool:
+        if root is not None:
+            path = path.relative_to(root) if path.is_absolute() else path
+        if any(part in ALWAYS_IGNORED_DIRS for part in path.parts):
+            return True
+        if self.include_dependencies:
+            return False
+        if root is None:
+            return any(self._is_dependency_dir(parent) for parent in (path, *path.parents))
+        return any(self._is_dependency_dir(root / parent) for parent in (path, *path.parents) if parent.parts)
+
+    def _is_dependency_dir(self, path: Path, sibling_files: set[str] | None = None) -> bool:
+        if path.name not in DEPENDENCY_DIRS:
+            return False
+        cached = self._dependency_dirs.get(path)
+        if cached is None:
+            cached = _is_dependency_dir(path, sibling_files)
+            self._dependency_dirs[path] = cached
+        return cached
+
+
+def walk_project(project_path: str | os.PathLike[str], include_dependencies: bool = False) -> ProjectInventory:
+    return ProjectWalker(include_dependencies).walk(project_path)
+
+
+def is_ignored_path(path: Path, include_dependencies: bool = False) -> bool:
+    return ProjectWalker(include_dependencies).is_ignored(path)
+
+
+def _is_dependency_dir(path: Path, sibling_files: set[str] | None = None) -> bool:
+    if path.name not in DEPENDENCY_DIRS:
+        return False
+
+    def parent_has(name: str) -> bool:
+        if sibling_files is not None:
+            return name in sibling_files
+        return (path.parent / name).is_file()
+
+    if path.name == "vendor":
+        return (path / "autoload.php").exists() or (path / "composer").is_dir() or parent_has("composer.json")
+    if path.name == "node_modules":
+        return parent_has("package.json")
+    if path.name == "bower_components":
+        return parent_has("bower.json")
+    if path.name == "thinkphp":
+        return (path / "base.php").is_file() or (path / "library" / "think").is_dir()
+    return False
+
+
+def _entry_is_dir(entry: os.DirEntry[str]) -> bool:
+    try:
+        return entry.is_dir(follow_symlinks=False)
+    except OSError:
+        return False
+
+
+def _entry_is_file(entry: os.DirEntry[str]) -> bool:
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+
+@lru_cache(maxsize=64)
+def _glob_regex(pattern: str) -> re.Pattern[str]:
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return re.compile(glob.translate(pattern, recursive=True, include_hidden=True), flags)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import signal
+import threading
+import time
+from dataclasses import dataclass
+
+RULE_TIME_BUDGET_SECONDS = 2.0
+MAX_RULE_OVERRUNS = 3
+
+
+class RuleTimeout(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class RuleOverrun:
+    rule_id: str
+    file_path: str
+    elapsed: float
+    suspended: bool
+
+    def describe(self) -> str:
+        state = "，已在本次扫描中停用" if self.suspended else ""
+        return f"规则 {self.rule_id} 在 {self.file_path} 上超时（{self.elapsed:.1f}s）{state}"
+
+
+@dataclass(frozen=True)
+class AnalysisTruncation:
+    analyzer: str
+    file_path: str
+    reason: str
+    visited_nodes: int
+    node_budget: int
+    elapsed: float
+
+    def describe(self) -> str:
+        return (
+            f"{self.analyzer}在 {self.file_path} 上{self.reason}，已分析 {self.visited_nodes}/{self.node_budget} 个节点"
+            f"（{self.elapsed:.1f}s），保留已发现的结果"
+        )
+
+
+def _raise_timeout(_signum: int, _frame: object) -> None:
+    raise RuleTimeout()
+
+
+class RuleDeadline:
+    __slots__ = ("seconds", "started_at", "expires_at", "_armed", "_previous_handler")
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.started_at = 0.0
+        self.expires_at = 0.0
+        self._armed = False
+        self._previous_handler = None
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def __enter__(self) -> "RuleDeadline":
+        self.started_at = time.perf_counter()
+        self.expires_at = self.started_at + self.seconds
+        if self.seconds > 0 and _can_interrupt():
+            self._previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+            self._armed = True
+            signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        if self._armed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous_handler or signal.SIG_DFL)
+            self._armed = False
+
+    def check(self) -> None:
+        if self.seconds > 0 and time.perf_counter() > self.expires_at:
+            raise RuleTimeout()
+
+
+def _can_interrupt() -> bool:
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+def needs_interrupt_process() -> bool:
+    return hasattr(signal, "setitimer") and threading.current_thread() is not threading.main_thread()
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import re
+from itertools import product
+from typing import Iterable
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+
+    _ZERO_WIDTH = {sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT}
+    _WORD_BOUNDARIES = {sre_constants.AT_BOUNDARY, sre_constants.AT_NON_BOUNDARY}
+except (ImportError, AttributeError):
+    sre_constants = sre_parse = None
+    _ZERO_WIDTH = _WORD_BOUNDARIES = set()
+
+MIN_LITERAL_LENGTH = 3
+MAX_LITERAL_SET_SIZE = 32
+MAX_EXACT_REPEAT = 2
+
+_PARSE_ERRORS = (re.error, RecursionError, AttributeError, TypeError, ValueError)
+_CASE_FOLDED_TO_NON_ASCII = frozenset(map(ord, "iksIKS"))
+
+
+def fold(text: str) -> str:
+    folded = text.casefold()
+    if not folded.isascii():
+        folded = folded.replace("\u0307", "").replace("\u0131", "i")
+    return folded
+
+
+def required_literals(pattern: str, flags: int = 0) -> tuple[str, ...]:
+    if sre_parse is None:
+        return ()
+    try:
+        literals = _required(list(sre_parse.parse(pattern, flags)))
+    except _PARSE_ERRORS:
+        return ()
+    if not literals or min(map(len, literals)) < MIN_LITERAL_LENGTH:
+        return ()
+    folded = {fold(literal) for literal in literals}
+    return tuple(sorted(literal for literal in folded if not any(other != literal and other in literal for other in folded)))
+
+
+def _required(items: list) -> set[str] | None:
+    best: set[str] | None = None
+    run: set[str] = {""}
+
+    def consider(candidate: set[str] | None) -> None:
+        nonlocal best
+        if not candidate or "" in candidate:
+            return
+        if best is None or _score(candidate) > _score(best):
+            best = candidate
+
+    for op, value in items:
+        exact = _exact(op, value)
+        if exact is not None:
+            joined = _concat(run, exact)
+            if joined is not None:
+                run = joined
+                continue
+            consider(run)
+            run = exact
+            continue
+        consider(run)
+        run = {""}
+        consider(_required_item(op, value))
+    consider(run)
+    return best
+
+
+def _required_item(op, value) -> set[str] | None:
+    if op is sre_constants.SUBPATTERN:
+        return _required(list(value[-1]))
+    if op in {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT}:
+        low, _high, body = value
+        return _required(list(body)) if low >= 1 else None
+    if op is sre_constants.ATOMIC_GROUP:
+        return _required(list(value))
+    if op is sre_constants.BRANCH:
+        union: set[str] = set()
+        for branch in value[1]:
+            required = _required(list(branch))
+            if not required:
+                return None
+            union |= required
+        return union if len(union) <= MAX_LITERAL_SET_SIZE else None
+    return None
+
+
+def _exact(op, value) -> set[str] | None:
+    if op is sre_constants.LITERAL:
+        return {chr(value)}
+    if op in _ZERO_WIDTH:
+        return {""}
+    if op is sre_constants.IN:
+        if len(value) > 4 or any(item_op is not sre_constants.LITERAL for item_op, _item in value):
+            return None
+        return {chr(item) for _item_op, item in value}
+    if op is sre_constants.SUBPATTERN:
+        return _exact_sequence(list(value[-1]))
+    if op is sre_constants.BRANCH:
+        union: set[str] = set()
+        for branch in value[1]:
+            exact = _exact_sequence(list(branch))
+            if exact is None:
+                return None
+            union |= exact
+        return union if len(union) <= MAX_LITERAL_SET_SIZE else None
+    if op in {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT}:
+        low, high, body = value
+        if high > MAX_EXACT_REPEAT:
+            return None
+        exact = _exact_sequence(list(body))
+        if exact is None:
+            return None
+        strings: set[str] = set()
+        for count in range(low, high + 1):
+            repeated = _concat_all([exact] * count)
+            if repeated is None:
+                return None
+            strings |= repeated
+        return strings if len(strings) <= MAX_LITERAL_SET_SIZE else None
+    return None
+
+
+def _exact_sequence(items: list) -> set[str] | None:
+    return _concat_all(_exact(op, value) for op, value in items)
+
+
+def _concat_all(parts: Iterable[set[str] | None]) -> set[str] | None:
+    strings: set[str] | None = {""}
+    for part in parts:
+        if part is None:
+            return None
+        strings = _concat(strings, part)
+        if strings is None:
+            return None
+    return strings
+
+
+def _concat(left: set[str], right: set[str]) -> set[str] | None:
+    if len(left) * len(right) > MAX_LITERAL_SET_SIZE:
+        return None
+    return {a + b for a, b in product(left, right)}
+
+
+def _score(literals: set[str]) -> tuple[int, int]:
+    return min(map(len, literals)), -len(literals)
+
+
+class LiteralScan:
+    def __init__(self, text: str) -> None:
+        self.text = fold(text)
+        self._present: dict[str, bool] = {}
+
+    def any_present(self, literals: tuple[str, ...]) -> bool:
+        for literal in literals:
+            present = self._present.get(literal)
+            if present is None:
+                present = self._present[literal] = literal in self.text
+            if present:
+                return True
+        return False
+
+
+def byte_compatible(pattern: str, flags: int = 0) -> bool:
+    if sre_parse is None:
+        return False
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+        flags = parsed.state.flags
+        unicode = not flags & re.ASCII
+        return _byte_compatible(list(parsed), unicode, unicode and bool(flags & re.IGNORECASE))
+    except _PARSE_ERRORS:
+        return False
+
+
+def _byte_compatible(items: list, unicode: bool, ignore_case: bool) -> bool:
+    return all(_byte_compatible_item(op, value, unicode, ignore_case) for op, value in items)
+
+
+def _byte_compatible_item(op, value, unicode: bool, ignore_case: bool) -> bool:
+    if _matches_non_ascii(op, value) or _unicode_sensitive(op, value, unicode, ignore_case):
+        return False
+    if op in {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT}:
+        _low, high, body = value
+        body = list(body)
+        if high == sre_constants.MAXREPEAT and len(body) == 1 and _matches_non_ascii(*body[0]):
+            return not _unicode_sensitive(*body[0], unicode, ignore_case)
+        return _byte_compatible(body, unicode, ignore_case)
+    if op is sre_constants.SUBPATTERN:
+        _group, add_flags, del_flags, body = value
+        if unicode:
+            ignore_case = bool(add_flags & re.IGNORECASE) or (ignore_case and not del_flags & re.IGNORECASE)
+        return _byte_compatible(list(body), unicode, ignore_case)
+    if op in {sre_constants.ASSERT, sre_constants.ASSERT_NOT}:
+        return _byte_compatible(list(value[1]), unicode, ignore_case)
+    if op is sre_constants.ATOMIC_GROUP:
+        return _byte_compatible(list(value), unicode, ignore_case)
+    if op is sre_constants.BRANCH:
+        return all(_byte_compatible(list(branch), unicode, ignore_case) for branch in value[1])
+    if op is sre_constants.GROUPREF_EXISTS:
+        return all(branch is None or _byte_compatible(list(branch), unicode, ignore_case) for branch in value[1:])
+    return True
+
+
+def _matches_non_ascii(op, value) -> bool:
+    if op in {sre_constants.ANY, sre_constants.NOT_LITERAL}:
+        return True
+    if op is sre_constants.IN:
+        return any(item_op is sre_constants.NEGATE for item_op, _item in value)
+    return False
+
+
+def _unicode_sensitive(op, value, unicode: bool, ignore_case: bool) -> bool:
+    if op is sre_constants.AT:
+        return unicode and value in _WORD_BOUNDARIES
+    if op in {sre_constants.LITERAL, sre_constants.NOT_LITERAL}:
+        return ignore_case and value in _CASE_FOLDED_TO_NON_ASCII
+    if op is not sre_constants.IN:
+        return False
+    for item_op, item in value:
+        if item_op is sre_constants.CATEGORY and unicode:
+            return True
+        if item_op is sre_constants.LITERAL and ignore_case and item in _CASE_FOLDED_TO_NON_ASCII:
+            return True
+        if item_op is sre_constants.RANGE and ignore_case and any(item[0] <= code <= item[1] for code in _CASE_FOLDED_TO_NON_ASCII):
+            return True
+    return False
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+RULE_COST_SORT_KEYS = {"seconds", "files", "matches", "skipped", "averageMs", "id"}
+
+
+@dataclass
+class RuleCost:
+    language: str
+    rule_id: str
+    rule_type: str
+    seconds: float = 0.0
+    files: int = 0
+    matches: int = 0
+    skipped: int = 0
+
+    def to_row(self) -> dict[str, object]:
+        return {
+            "key": f"{self.language}:{self.rule_id}",
+            "language": self.language,
+            "id": self.rule_id,
+            "type": self.rule_type,
+            "seconds": self.seconds,
+            "files": self.files,
+            "matches": self.matches,
+            "skipped": self.skipped,
+            "averageMs": self.seconds * 1000 / self.files if self.files else 0.0,
+        }
+
+
+@dataclass
+class RuleProfile:
+    costs: dict[tuple[str, str], RuleCost] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.costs)
+
+    def record(self, language: str, rule_id: str, rule_type: str, seconds: float, matches: int, skipped: int) -> None:
+        cost = self.costs.get((language, rule_id))
+        if cost is None:
+            cost = self.costs[(language, rule_id)] = RuleCost(language, rule_id, rule_type)
+        cost.seconds += seconds
+        cost.files += 1
+        cost.matches += matches
+        cost.skipped += skipped
+
+    def merge(self, other: "RuleProfile") -> None:
+        for key, other_cost in other.costs.items():
+            cost = self.costs.get(key)
+            if cost is None:
+                cost = self.costs[key] = RuleCost(other_cost.language, other_cost.rule_id, other_cost.rule_type)
+            cost.seconds += other_cost.seconds
+            cost.files += other_cost.files
+            cost.matches += other_cost.matches
+            cost.skipped += other_cost.skipped
+
+    def ranked(self) -> list[RuleCost]:
+        return sorted(self.costs.values(), key=lambda cost: (-cost.seconds, cost.language, cost.rule_id))
+
+    def to_rows(self) -> list[dict[str, object]]:
+        return [cost.to_row() for cost in self.ranked()]
+
+
+def sort_cost_rows(rows: list[dict[str, object]], key: str, descending: bool) -> list[dict[str, object]]:
+    if key not in RULE_COST_SORT_KEYS:
+        key = "seconds"
+    return sorted(rows, key=lambda row: (row[key], row["key"]), reverse=descending)
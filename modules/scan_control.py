@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+from collections import Counter
+
+PAUSE_POLL_SECONDS = 0.2
+SHARED_OVERRUN_BYTES = 64 * 1024
+
+
+class ScanCancelled(BaseException):
+    pass
+
+
+class ScanControl:
+    def __init__(self) -> None:
+        context = multiprocessing.get_context("spawn")
+        self._cancel = context.Event()
+        self._running = context.Event()
+        self._running.set()
+        self._overruns = context.Array("c", SHARED_OVERRUN_BYTES)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        self._running.set()
+
+    def pause(self) -> None:
+        if not self._cancel.is_set():
+            self._running.clear()
+
+    def resume(self) -> None:
+        self._running.set()
+
+    def checkpoint(self) -> float:
+        paused_seconds = 0.0
+        if not self._running.is_set():
+            started_at = time.perf_counter()
+            while not self._running.wait(PAUSE_POLL_SECONDS):
+                if self._cancel.is_set():
+                    break
+            paused_seconds = time.perf_counter() - started_at
+        if self._cancel.is_set():
+            raise ScanCancelled("扫描已取消")
+        return paused_seconds
+
+    def record_overrun(self, rule_id: str) -> None:
+        entry = rule_id.encode("utf-8", "replace") + b"\n"
+        with self._overruns.get_lock():
+            used = len(self._overruns.value)
+            if used + len(entry) < SHARED_OVERRUN_BYTES:
+                self._overruns[used:used + len(entry)] = entry
+
+    def overrun_counts(self) -> Counter[str]:
+        with self._overruns.get_lock():
+            data = self._overruns.value
+        return Counter(data.decode("utf-8", "replace").splitlines())
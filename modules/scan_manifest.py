@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    override = os.environ.get("PINESAWFLY_CACHE_DIR")
+    if override:
+        return Path(override)
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+        return Path(base) / "PineSawFly" / "cache"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pinesawfly"
+
+
+def manifest_path(project_path: str | os.PathLike[str], cache_dir: Path | None = None, kind: str = "scan-manifests") -> Path:
+    key = hashlib.sha256(os.path.abspath(project_path).encode("utf-8", "replace")).hexdigest()
+    return (cache_dir or default_cache_dir()) / kind / f"{key}.json"
+
+
+def fingerprint(*parts: object) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def source_fingerprint(paths: Iterable[Path]) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            logger.debug("unable to read %s for fingerprint", path, exc_info=True)
+    return digest.hexdigest()[:16]
+
+
+class ScanManifest:
+    def __init__(self, project_path: str | os.PathLike[str], ruleset_version: str, plugin_version: str, path: Path | None = None) -> None:
+        self.root = Path(project_path)
+        self.path = path or manifest_path(self.root)
+        self.ruleset_version = ruleset_version
+        self.plugin_version = plugin_version
+        self.reused = 0
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._seen: set[str] = set()
+
+    def load(self) -> "ScanManifest":
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return self
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("扫描清单 %s 无法读取，将执行完整扫描: %s", self.path, exc)
+            return self
+        if isinstance(data, dict) and data.get("version") == MANIFEST_VERSION and isinstance(data.get("files"), dict):
+            self._entries = data["files"]
+        return self
+
+    def cached_findings(self, file_path: str) -> list[dict[str, Any]] | None:
+        key = self._key(file_path)
+        self._seen.add(key)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        entry = self._entries.get(key)
+        current = bool(entry and entry.get("rules") == self.ruleset_version and entry.get("plugins") == self.plugin_version)
+        if current and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime_ns:
+            self.reused += 1
+            return entry.get("findings", [])
+        content_hash = self._content_hash(file_path)
+        if current and content_hash and entry.get("sha256") == content_hash:
+            entry["size"] = stat.st_size
+            entry["mtime"] = stat.st_mtime_ns
+            self.reused += 1
+            return entry.get("findings", [])
+        self._pending[key] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "sha256": content_hash}
+        return None
+
+    def record(self, file_path: str, findings: Any) -> None:
+        key = self._key(file_path)
+        entry = self._pending.pop(key, None)
+        if entry is None and key in self._seen:
+            entry = self._entries.get(key)
+            if not (entry and entry.get("rules") == self.ruleset_version and entry.get("plugins") == self.plugin_version):
+                return
+        if entry is None or not entry.get("sha256"):
+            return
+        entry.update({"rules": self.ruleset_version, "plugins": self.plugin_version, "findings": findings})
+        self._entries[key] = entry
+
+    def save(self) -> None:
+        entries = {key: entry for key, entry in self._entries.items() if key in self._seen}
+        payload = {"version": MANIFEST_VERSION, "projectPath": str(self.root), "files": entries}
+        temp_path = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(temp_path, self.path)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("扫描清单 %s 保存失败: %s", self.path, exc)
+
+    def _key(self, file_path: str) -> str:
+        try:
+            return Path(file_path).relative_to(self.root).as_posix()
+        except ValueError:
+            return Path(file_path).as_posix()
+
+    def _content_hash(self, file_path: str) -> str:
+        try:
+            return hashlib.sha256(Path(file_path).read_bytes()).hexdigest()
+        except OSError:
+            return ""
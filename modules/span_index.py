@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Callable, Iterable
+
+OUTSIDE_PHP = "outside_php"
+
+Span = tuple[int, int, str]
+
+
+class IgnoredSpans:
+    __slots__ = ("_load", "_spans", "_lookups")
+
+    def __init__(self, load: Callable[[], list[Span]]) -> None:
+        self._load = load
+        self._spans: list[Span] | None = None
+        self._lookups: dict[frozenset[str], tuple[list[int], list[int]]] = {}
+
+    @property
+    def spans(self) -> list[Span]:
+        if self._spans is None:
+            self._spans = self._load()
+        return self._spans
+
+    def prepare(self, contexts: Iterable[frozenset[str]]) -> None:
+        for rule_contexts in contexts:
+            if rule_contexts and rule_contexts not in self._lookups:
+                self._lookups[rule_contexts] = self._merge(rule_contexts)
+
+    def covers(self, offset: int, contexts: frozenset[str]) -> bool:
+        if not contexts:
+            return False
+        lookup = self._lookups.get(contexts)
+        if lookup is None:
+            lookup = self._lookups[contexts] = self._merge(contexts)
+        starts, ends = lookup
+        index = bisect_right(starts, offset) - 1
+        return index >= 0 and offset < ends[index]
+
+    def _merge(self, contexts: frozenset[str]) -> tuple[list[int], list[int]]:
+        starts: list[int] = []
+        ends: list[int] = []
+        for start, end, context in sorted(span for span in self.spans if span[2] in contexts and span[0] < span[1]):
+            if ends and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        return starts, ends
@@ -56,6 +56,8 @@ def main() -> int:
     rule_manager = RuleManager(project_root / "rules")
     engine.rootContext().setContextProperty("styleManager", style_manager)
     engine.rootContext().setContextProperty("auditBridge", audit_bridge)
+    app.aboutToQuit.connect(audit_bridge.shutdown)
+    audit_bridge.ruleCostsChanged.connect(rule_manager.setRuleCosts)
     engine.rootContext().setContextProperty("ruleManager", rule_manager)
     material_icons_path = project_root / "assets" / "fonts" / "MaterialIcons-Regular.ttf"
     engine.rootContext().setContextProperty(
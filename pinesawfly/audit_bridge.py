@@ -6,18 +6,38 @@ import logging
 import os
 import re
 import base64
+from bisect import insort
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from PySide6.QtCore import QObject, Property, QLineF, QRectF, QSettings, QSizeF, Qt, QThread, QUrl, Signal, Slot
+from PySide6.QtCore import (
+    QFileSystemWatcher,
+    QObject,
+    Property,
+    QLineF,
+    QRectF,
+    QSettings,
+    QSizeF,
+    Qt,
+    QThread,
+    QTimer,
+    QUrl,
+    Signal,
+    Slot,
+)
 from PySide6.QtGui import QColor, QFont, QPageSize, QPainter, QPdfWriter, QTextDocument
 from PySide6.QtSvg import QSvgRenderer
 
+from modules.analysis_context import AnalysisContext
+from modules.codegraph_index import cancel_running_indexes
 from modules.file_module import FileModule
+from modules.project_walker import ProjectInventory, ProjectWalker, walk_project
 from pinesawfly.ai_analysis_service import AI_PROVIDER_PRESETS, AiAnalysisService
-from pinesawfly.scan_worker import SUPPORTED_EXTENSIONS, ScanWorker, is_ignored_path
-from pinesawfly.syntax_highlighter import highlight_code
+from pinesawfly.findings_model import FindingsModel
+from pinesawfly.scan_pipeline import PLUGIN_LANGUAGE_EXTENSIONS, SCAN_EXTENSIONS, SUPPORTED_EXTENSIONS
+from pinesawfly.scan_worker import RescanWorker, ScanWorker
+from pinesawfly.syntax_highlighter import highlight_code, highlight_context
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +70,10 @@ REPORT_SYMBOLS = [
     "{{/ findings }}",
 ]
 FINDING_LOOP_PATTERN = re.compile(r"{{#\s*findings\s*}}(.*?){{/\s*findings\s*}}", re.DOTALL)
+WATCH_EXTENSIONS = SCAN_EXTENSIONS.union(*PLUGIN_LANGUAGE_EXTENSIONS.values())
+WATCH_DEBOUNCE_MS = 500
+
+
 def normalize_path(path_or_url: str) -> str:
     if path_or_url.startswith("file:"):
         return QUrl(path_or_url).toLocalFile()
@@ -63,11 +87,15 @@ class AuditBridge(QObject):
     currentContentChanged = Signal()
     currentHighlightedContentChanged = Signal()
     currentLineChanged = Signal()
-    findingsChanged = Signal()
     statusChanged = Signal()
     scanningChanged = Signal()
+    scanProgressChanged = Signal()
+    scanStateChanged = Signal()
     reportSettingsChanged = Signal()
     pluginSettingsChanged = Signal()
+    watchModeChanged = Signal()
+    ruleCostsChanged = Signal(list)
+    _rescanRequested = Signal(object, list, object)
 
     def __init__(self) -> None:
         super().__init__()
@@ -78,12 +106,17 @@ class AuditBridge(QObject):
         self._project_path = os.getcwd()
         self._files: list[dict[str, object]] = []
         self._findings: list[dict[str, object]] = []
+        self._findings_model = FindingsModel(self)
         self._current_file = ""
         self._current_line = 0
         self._current_content = "请选择左侧文件以查看代码。"
         self._current_highlighted_content = self._highlight_code(self._current_content, "")
         self._status = "就绪"
         self._scanning = False
+        self._scan_files_done = 0
+        self._scan_files_total = 0
+        self._scan_paused = False
+        self._scan_partial = False
         self._report_title = self._settings.value("report/title", "Pinesawfly审计报告", str)
         self._report_author = self._settings.value("report/author", "", str)
         self._report_unit = self._settings.value("report/unit", "", str)
@@ -96,9 +129,27 @@ class AuditBridge(QObject):
         self._report_include_code_snippet = self._settings.value("report/includeCodeSnippet", True, bool)
         self._ai_plugin_enabled = self._settings.value("plugins/aiAnalysis/enabled", False, bool)
         self._include_dependency_scan = self._settings.value("plugins/phpAnalysis/includeDependencies", False, bool)
+        self._scan_workers = self._settings.value("scan/workers", 0, int)
+        self._incremental_scan = self._settings.value("scan/incremental", True, bool)
+        self._watch_mode = self._settings.value("scan/watch", False, bool)
         self._ai_service = AiAnalysisService(self._settings, self._app_root, lambda: self._project_path, self._render_ai_prompt)
         self._thread: QThread | None = None
         self._worker: ScanWorker | None = None
+        self._inventory: ProjectInventory | None = None
+        self._has_scan_results = False
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_watched_file_changed)
+        self._watcher.directoryChanged.connect(self._on_watched_directory_changed)
+        self._watch_timer = QTimer(self)
+        self._watch_timer.setSingleShot(True)
+        self._watch_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self._watch_timer.timeout.connect(self._apply_watch_changes)
+        self._watch_changed_files: set[str] = set()
+        self._watch_changed_dirs: set[str] = set()
+        self._watch_thread: QThread | None = None
+        self._rescan_worker: RescanWorker | None = None
+        self._rescanning = False
+        self._watch_resync = True
         self._ai_service.cleanup_cache()
         self.setProjectPath(self._project_path)
 
@@ -112,6 +163,18 @@ class AuditBridge(QObject):
             self._scanning = value
             self.scanningChanged.emit()
 
+    def _set_scan_progress(self, done: int, total: int) -> None:
+        if (done, total) != (self._scan_files_done, self._scan_files_total):
+            self._scan_files_done = done
+            self._scan_files_total = total
+            self.scanProgressChanged.emit()
+
+    def _set_scan_state(self, paused: bool, partial: bool) -> None:
+        if (paused, partial) != (self._scan_paused, self._scan_partial):
+            self._scan_paused = paused
+            self._scan_partial = partial
+            self.scanStateChanged.emit()
+
     def _set_current_line(self, value: int) -> None:
         value = max(0, int(value or 0))
         if value != self._current_line:
@@ -126,25 +189,194 @@ class AuditBridge(QObject):
             return
         self._project_path = os.path.abspath(path)
         self._ai_service.cleanup_cache()
-        self._files = self._collect_files(self._project_path)
+        self._inventory = walk_project(self._project_path)
+        self._files = self._collect_files(self._inventory)
+        self._has_scan_results = False
         self.projectPathChanged.emit()
         self.filesChanged.emit()
         self._set_status(f"已打开项目: {self._project_path}")
+        self._start_watch()
+
+    def _collect_files(self, inventory: ProjectInventory) -> list[dict[str, object]]:
+        return [self._file_entry(inventory.root, item) for item in inventory.files_with_suffix(SUPPORTED_EXTENSIONS)]
+
+    def _file_entry(self, root: Path, item: Path) -> dict[str, object]:
+        return {
+            "name": item.name,
+            "relativePath": str(item.relative_to(root)),
+            "absolutePath": str(item),
+            "extension": item.suffix.lower().lstrip(".") or "file",
+        }
+
+    def _update_files(self, root: Path, added: list[Path], removed: set[Path]) -> None:
+        def is_removed(path: Path) -> bool:
+            return path in removed or any(parent in removed for parent in path.parents)
+
+        files = [item for item in self._files if not is_removed(Path(str(item["absolutePath"])))]
+        known = {str(item["absolutePath"]) for item in files}
+        for path in added:
+            if path.suffix.lower() in SUPPORTED_EXTENSIONS and str(path) not in known:
+                insort(files, self._file_entry(root, path), key=lambda item: Path(str(item["absolutePath"])))
+        self._files = files
+        self.filesChanged.emit()
 
-    def _collect_files(self, project_path: str) -> list[dict[str, object]]:
-        root = Path(project_path)
-        files: list[dict[str, object]] = []
-        for item in sorted(root.rglob("*")):
-            if is_ignored_path(item):
+    def _start_watch(self) -> None:
+        self._stop_watch()
+        if not self._watch_mode or self._inventory is None:
+            return
+        self._watch_thread = QThread()
+        self._watch_resync = True
+        self._rescan_worker = RescanWorker(self._project_path)
+        self._rescan_worker.moveToThread(self._watch_thread)
+        self._rescanRequested.connect(self._rescan_worker.rescan)
+        self._rescan_worker.rescanned.connect(self._on_watch_rescanned)
+        self._rescan_worker.failed.connect(self._on_watch_failed)
+        self._watch_thread.start()
+        self._sync_watch_paths()
+
+    def _stop_watch(self) -> None:
+        self._watch_timer.stop()
+        self._watch_changed_files.clear()
+        self._watch_changed_dirs.clear()
+        self._rescanning = False
+        watched = [*self._watcher.files(), *self._watcher.directories()]
+        if watched:
+            self._watcher.removePaths(watched)
+        if self._rescan_worker:
+            self._rescan_worker.cancel()
+            self._rescanRequested.disconnect(self._rescan_worker.rescan)
+        if self._watch_thread:
+            self._watch_thread.quit()
+            self._watch_thread.wait()
+        if self._rescan_worker:
+            self._rescan_worker.close()
+        self._rescan_worker = None
+        self._watch_thread = None
+
+    def _sync_watch_paths(self) -> None:
+        if not self._rescan_worker or self._inventory is None:
+            return
+        root = self._inventory.root
+        walker = ProjectWalker(self._inventory.include_dependencies)
+        wanted = {str(root)}
+        wanted.update(str(path) for path in self._inventory.directories if not walker.is_ignored(path, root))
+        wanted.update(str(path) for path in self._inventory.files_with_suffix(WATCH_EXTENSIONS))
+        watched = {*self._watcher.files(), *self._watcher.directories()}
+        stale = watched - wanted
+        if stale:
+            self._watcher.removePaths(list(stale))
+        missing = wanted - watched
+        if missing:
+            failed = self._watcher.addPaths(sorted(missing))
+            if failed:
+                logger.warning("无法监视 %s 个路径（可能超出系统文件监视数量上限）", len(failed))
+
+    @Slot(str)
+    def _on_watched_file_changed(self, path: str) -> None:
+        self._watch_changed_files.add(path)
+        self._watch_timer.start()
+
+    @Slot(str)
+    def _on_watched_directory_changed(self, path: str) -> None:
+        self._watch_changed_dirs.add(path)
+        self._watch_timer.start()
+
+    def _resume_watch(self) -> None:
+        if self._rescan_worker and (self._watch_changed_files or self._watch_changed_dirs):
+            self._watch_timer.start()
+
+    @Slot()
+    def _apply_watch_changes(self) -> None:
+        if self._scanning or self._rescanning or self._inventory is None or not self._rescan_worker:
+            return
+        inventory = self._inventory
+        root = inventory.root
+        walker = ProjectWalker(inventory.include_dependencies)
+        changed_files = {Path(path) for path in self._watch_changed_files}
+        changed_dirs = {Path(path) for path in self._watch_changed_dirs}
+        self._watch_changed_files.clear()
+        self._watch_changed_dirs.clear()
+        known_files = set(inventory.files)
+        known_dirs = set(inventory.directories)
+        added_files: list[Path] = []
+        added_dirs: list[Path] = []
+        removed: set[Path] = set()
+        for directory in sorted(changed_dirs):
+            if directory != root and directory not in known_dirs:
                 continue
-            if item.is_file() and item.suffix.lower() in SUPPORTED_EXTENSIONS:
-                files.append({
-                    "name": item.name,
-                    "relativePath": str(item.relative_to(root)),
-                    "absolutePath": str(item),
-                    "extension": item.suffix.lower().lstrip(".") or "file",
-                })
-        return files
+            if not directory.is_dir():
+                removed.add(directory)
+                continue
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = {Path(entry.path): entry.is_dir(follow_symlinks=False) for entry in iterator}
+            except OSError:
+                continue
+            children = {path for path in (*known_files, *known_dirs) if path.parent == directory}
+            removed.update(children - entries.keys())
+            for path, is_dir in entries.items():
+                if path in children or walker.is_ignored(path, root):
+                    continue
+                if not is_dir:
+                    added_files.append(path)
+                    continue
+                added_dirs.append(path)
+                subtree = walker.walk(path)
+                added_files.extend(subtree.files)
+                added_dirs.extend(subtree.directories)
+        for path in changed_files:
+            if path.is_file():
+                if path not in known_files and not walker.is_ignored(path, root):
+                    added_files.append(path)
+            else:
+                removed.add(path)
+        if added_files or added_dirs or removed:
+            self._inventory = inventory.with_changes(added_files, removed, added_dirs)
+            self._update_files(root, added_files, removed)
+        previous = {str(path) for path in inventory.files_with_suffix(WATCH_EXTENSIONS)}
+        current = {str(path) for path in self._inventory.files_with_suffix(WATCH_EXTENSIONS)}
+        targets = sorted((previous ^ current) | ({str(path) for path in changed_files} & (previous | current)))
+        self._sync_watch_paths()
+        if self._current_file and Path(self._current_file) in changed_files and os.path.isfile(self._current_file):
+            line = self._current_line
+            self.openFile(self._current_file)
+            self._set_current_line(line)
+        if not targets or not self._has_scan_results:
+            return
+        cross_paths = None
+        if self._watch_resync:
+            cross_paths = sorted({str(finding.get("absolutePath")) for finding in self._findings if finding.get("crossFile")})
+            self._watch_resync = False
+        self._rescanning = True
+        self._set_status(f"检测到 {len(targets)} 个文件变更，正在重新扫描...")
+        self._rescanRequested.emit(self._inventory, targets, cross_paths)
+
+    @Slot(object)
+    def _on_watch_rescanned(self, results: dict[str, list[dict[str, object]]]) -> None:
+        self._rescanning = False
+        if self._scanning:
+            return
+        pending = {path: list(rows) for path, rows in results.items()}
+        findings: list[dict[str, object]] = []
+        for finding in self._findings:
+            path = finding.get("absolutePath")
+            if path in results:
+                findings.extend(pending.pop(path, []))
+            else:
+                findings.append(finding)
+        for path, rows in sorted(pending.items(), key=lambda item: Path(item[0])):
+            index = next((index for index, finding in enumerate(findings) if Path(str(finding.get("absolutePath"))) > Path(path)), len(findings))
+            findings[index:index] = rows
+        self._ai_service.restore_cache(findings)
+        self._set_findings(findings)
+        self._set_status(f"已重新扫描 {len(results)} 个文件，当前共 {len(findings)} 个问题")
+        self._resume_watch()
+
+    @Slot(str)
+    def _on_watch_failed(self, message: str) -> None:
+        self._rescanning = False
+        self._set_status(f"重新扫描失败: {message}")
+        self._resume_watch()
 
     @Slot(str)
     def openFile(self, path_or_url: str) -> None:
@@ -152,8 +384,9 @@ class AuditBridge(QObject):
         if not os.path.isabs(path):
             path = os.path.join(self._project_path, path)
         try:
-            self._current_content = FileModule.read_file_with_encoding(path)
-            self._current_highlighted_content = self._highlight_code(self._current_content, path)
+            context = AnalysisContext.from_file(path)
+            self._current_content = context.content
+            self._current_highlighted_content = highlight_context(context)
             self._current_file = path
             self._set_current_line(0)
             self.currentContentChanged.emit()
@@ -176,19 +409,51 @@ class AuditBridge(QObject):
             return
         self._set_scanning(True)
         self._set_status("正在扫描...")
-        self._findings = []
-        self.findingsChanged.emit()
+        self._set_findings([])
+        self._set_scan_progress(0, 0)
+        self._set_scan_state(False, False)
         self._thread = QThread()
-        self._worker = ScanWorker(self._project_path, self._include_dependency_scan)
+        self._worker = ScanWorker(self._project_path, self._include_dependency_scan, self._scan_workers, self._incremental_scan)
         self._worker.moveToThread(self._thread)
         self._thread.started.connect(self._worker.run)
+        self._worker.inventoryReady.connect(self._on_scan_inventory_ready)
+        self._worker.findingsBatch.connect(self._on_scan_findings_batch)
+        self._worker.progress.connect(self._on_scan_progress)
+        self._worker.ruleCosts.connect(self.ruleCostsChanged)
         self._worker.finished.connect(self._on_scan_finished)
+        self._worker.cancelled.connect(self._on_scan_cancelled)
         self._worker.failed.connect(self._on_scan_failed)
         self._worker.finished.connect(self._thread.quit)
+        self._worker.cancelled.connect(self._thread.quit)
         self._worker.failed.connect(self._thread.quit)
         self._thread.finished.connect(self._thread.deleteLater)
         self._thread.finished.connect(self._cleanup_worker)
         self._thread.start()
+        self.scanStateChanged.emit()
+
+    @Slot()
+    def cancelScan(self) -> None:
+        if not self._worker or not self._scanning:
+            return
+        self._worker.cancel()
+        self._set_scan_state(False, self._scan_partial)
+        self._set_status("正在取消扫描...")
+
+    @Slot()
+    def pauseScan(self) -> None:
+        if not self._worker or not self._scanning or self._scan_paused:
+            return
+        self._worker.pause()
+        self._set_scan_state(True, self._scan_partial)
+        self._set_status(f"扫描已暂停 ({self._scan_files_done}/{self._scan_files_total})")
+
+    @Slot()
+    def resumeScan(self) -> None:
+        if not self._worker or not self._scan_paused:
+            return
+        self._worker.resume()
+        self._set_scan_state(False, self._scan_partial)
+        self._set_status("正在扫描...")
 
     @Slot()
     def startAiAnalysis(self) -> None:
@@ -214,7 +479,7 @@ class AuditBridge(QObject):
             for index, finding in enumerate(self._findings, 1):
                 if isinstance(finding, dict) and index in self._ai_service.analysis_by_finding:
                     finding["aiAnalysis"] = self._ai_service.analysis_by_finding.get(index, "")
-            self.findingsChanged.emit()
+            self._findings_model.refresh()
             count = sum(1 for value in self._ai_service.analysis_by_finding.values() if value.strip())
             if count:
                 self._ai_service.save_cache(self._findings)
@@ -343,22 +608,60 @@ class AuditBridge(QObject):
 
     @Slot(list, int, str)
     def _on_scan_finished(self, findings: list, _count: int, message: str) -> None:
-        self._findings = findings
-        if self._ai_service.restore_cache(self._findings):
+        self._has_scan_results = True
+        if self._ai_service.restore_cache(findings):
             self._set_status("已加载本地 AI 分析缓存")
-        self.findingsChanged.emit()
+        self._set_findings(findings)
+        self._watch_resync = True
         self._set_status(message)
         self._set_scanning(False)
+        self._resume_watch()
+
+    @Slot(list, int, str)
+    def _on_scan_cancelled(self, findings: list, _count: int, message: str) -> None:
+        self._ai_service.restore_cache(findings)
+        self._set_findings(findings)
+        self._has_scan_results = True
+        self._set_scan_state(False, True)
+        self._watch_resync = True
+        self._set_status(message)
+        self._set_scanning(False)
+        self._resume_watch()
+
+    @Slot(object)
+    def _on_scan_inventory_ready(self, inventory: ProjectInventory) -> None:
+        if inventory.include_dependencies or str(inventory.root) != self._project_path:
+            return
+        self._inventory = inventory
+        self._files = self._collect_files(inventory)
+        self.filesChanged.emit()
+        self._sync_watch_paths()
+
+    @Slot(list)
+    def _on_scan_findings_batch(self, findings: list) -> None:
+        if not self._scanning:
+            return
+        self._findings_model.append(findings)
+
+    @Slot(int, int, str)
+    def _on_scan_progress(self, done: int, total: int, current_path: str) -> None:
+        if not self._scanning:
+            return
+        self._set_scan_progress(done, total)
+        if current_path and not self._scan_paused:
+            self._set_status(f"正在扫描 ({done}/{total}): {current_path}")
 
     @Slot(str)
     def _on_scan_failed(self, message: str) -> None:
         self._set_status(f"扫描失败: {message}")
         self._set_scanning(False)
+        self._resume_watch()
 
     @Slot()
     def _cleanup_worker(self) -> None:
         self._worker = None
         self._thread = None
+        self.scanStateChanged.emit()
 
     def get_files(self) -> list[dict[str, object]]:
         return self._files
@@ -378,8 +681,12 @@ class AuditBridge(QObject):
     def get_current_line(self) -> int:
         return self._current_line
 
-    def get_findings(self) -> list[dict[str, object]]:
-        return self._findings
+    def get_findings(self) -> FindingsModel:
+        return self._findings_model
+
+    def _set_findings(self, findings: list[dict[str, object]]) -> None:
+        self._findings = findings
+        self._findings_model.reset(findings)
 
     def get_status(self) -> str:
         return self._status
@@ -387,6 +694,21 @@ class AuditBridge(QObject):
     def get_scanning(self) -> bool:
         return self._scanning
 
+    def get_scan_files_done(self) -> int:
+        return self._scan_files_done
+
+    def get_scan_files_total(self) -> int:
+        return self._scan_files_total
+
+    def get_scan_paused(self) -> bool:
+        return self._scan_paused
+
+    def get_scan_partial(self) -> bool:
+        return self._scan_partial
+
+    def get_scan_cancellable(self) -> bool:
+        return self._worker is not None and self._scanning
+
     def get_report_title(self) -> str:
         return self._report_title
 
@@ -453,6 +775,24 @@ class AuditBridge(QObject):
     def set_include_dependency_scan(self, value: bool) -> None:
         self.setIncludeDependencyScan(value)
 
+    def get_scan_workers(self) -> int:
+        return self._scan_workers
+
+    def set_scan_workers(self, value: int) -> None:
+        self.setScanWorkers(value)
+
+    def get_incremental_scan(self) -> bool:
+        return self._incremental_scan
+
+    def set_incremental_scan(self, value: bool) -> None:
+        self.setIncrementalScan(value)
+
+    def get_watch_mode(self) -> bool:
+        return self._watch_mode
+
+    def set_watch_mode(self, value: bool) -> None:
+        self.setWatchMode(value)
+
     def get_ai_api_configs(self) -> list[dict[str, object]]:
         return self._ai_service.public_configs()
 
@@ -466,6 +806,36 @@ class AuditBridge(QObject):
             self._settings.setValue("plugins/phpAnalysis/includeDependencies", value)
             self.pluginSettingsChanged.emit()
 
+    @Slot(int)
+    def setScanWorkers(self, value: int) -> None:
+        value = max(0, int(value or 0))
+        if value != self._scan_workers:
+            self._scan_workers = value
+            self._settings.setValue("scan/workers", value)
+            self.pluginSettingsChanged.emit()
+
+    @Slot(bool)
+    def setIncrementalScan(self, value: bool) -> None:
+        if value != self._incremental_scan:
+            self._incremental_scan = value
+            self._settings.setValue("scan/incremental", value)
+            self.pluginSettingsChanged.emit()
+
+    @Slot(bool)
+    def setWatchMode(self, value: bool) -> None:
+        if value == self._watch_mode:
+            return
+        self._watch_mode = value
+        self._settings.setValue("scan/watch", value)
+        self._start_watch()
+        self.watchModeChanged.emit()
+        self._set_status("已开启监视模式，文件变更后将自动重新扫描" if value else "已关闭监视模式")
+
+    @Slot()
+    def shutdown(self) -> None:
+        self._stop_watch()
+        cancel_running_indexes()
+
     @Slot(bool)
     def setAiPluginEnabled(self, value: bool) -> None:
         if value != self._ai_plugin_enabled:
@@ -695,7 +1065,7 @@ class AuditBridge(QObject):
         for finding in self._findings:
             severity = str(finding.get("severity", "未知"))
             severity_count[severity] = severity_count.get(severity, 0) + 1
-        return {"total": len(self._findings), "severityCount": severity_count}
+        return {"total": len(self._findings), "severityCount": severity_count, "partial": self._scan_partial}
 
     def _template_values(self, html_mode: bool, report_format: str = "HTML") -> dict[str, str]:
         payload = self._report_payload()
@@ -814,7 +1184,10 @@ class AuditBridge(QObject):
         high = self._count_severity(severity_count, {"high", "高危", "高"})
         medium = self._count_severity(severity_count, {"medium", "中危", "中"})
         low = self._count_severity(severity_count, {"low", "低危", "低"})
-        return f"共发现{total}个安全缺陷，其中严重漏洞{critical}个、高危{high}个、中危{medium}个、低危{low}个。"
+        overview = f"共发现{total}个安全缺陷，其中严重漏洞{critical}个、高危{high}个、中危{medium}个、低危{low}个。"
+        if self._scan_partial:
+            overview += "本次扫描被中途取消，结果不完整。"
+        return overview
 
     def _count_severity(self, severity_count: dict[str, object], names: set[str]) -> int:
         total = 0
@@ -1142,9 +1515,14 @@ class AuditBridge(QObject):
     currentContent = Property(str, get_current_content, notify=currentContentChanged)
     currentHighlightedContent = Property(str, get_current_highlighted_content, notify=currentHighlightedContentChanged)
     currentLine = Property(int, get_current_line, notify=currentLineChanged)
-    findings = Property("QVariantList", get_findings, notify=findingsChanged)
+    findings = Property(QObject, get_findings, constant=True)
     status = Property(str, get_status, notify=statusChanged)
     scanning = Property(bool, get_scanning, notify=scanningChanged)
+    scanFilesDone = Property(int, get_scan_files_done, notify=scanProgressChanged)
+    scanFilesTotal = Property(int, get_scan_files_total, notify=scanProgressChanged)
+    scanPaused = Property(bool, get_scan_paused, notify=scanStateChanged)
+    scanPartial = Property(bool, get_scan_partial, notify=scanStateChanged)
+    scanCancellable = Property(bool, get_scan_cancellable, notify=scanStateChanged)
     reportTitle = Property(str, get_report_title, set_report_title, notify=reportSettingsChanged)
     reportAuthor = Property(str, get_report_author, set_report_author, notify=reportSettingsChanged)
     reportUnit = Property(str, get_report_unit, set_report_unit, notify=reportSettingsChanged)
@@ -1157,5 +1535,8 @@ class AuditBridge(QObject):
     reportIncludeCodeSnippet = Property(bool, get_report_include_code_snippet, set_report_include_code_snippet, notify=reportSettingsChanged)
     aiPluginEnabled = Property(bool, get_ai_plugin_enabled, set_ai_plugin_enabled, notify=pluginSettingsChanged)
     includeDependencyScan = Property(bool, get_include_dependency_scan, set_include_dependency_scan, notify=pluginSettingsChanged)
+    scanWorkers = Property(int, get_scan_workers, set_scan_workers, notify=pluginSettingsChanged)
+    incrementalScan = Property(bool, get_incremental_scan, set_incremental_scan, notify=pluginSettingsChanged)
+    watchMode = Property(bool, get_watch_mode, set_watch_mode, notify=watchModeChanged)
     aiApiConfigs = Property("QVariantList", get_ai_api_configs, notify=pluginSettingsChanged)
     aiProviderPresets = Property("QVariantList", get_ai_provider_presets, constant=True)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import unicodedata
+from pathlib import Path
+
+from modules.analysis_context import AnalysisContext
+from modules.generic_rule_engine import GenericRuleEngine
+from modules.git_diff import GitError
+from modules.project_walker import walk_project
+from modules.rule_profile import RuleCost
+from modules.scan_control import ScanCancelled
+from pinesawfly.diff_scan import DiffScanPipeline
+from pinesawfly.scan_pipeline import SCAN_EXTENSIONS, ScanPipeline
+
+logger = logging.getLogger(__name__)
+
+EXIT_CLEAN = 0
+EXIT_FAILED = 1
+EXIT_CANCELLED = 130
+SEVERITY_EXIT_CODES = {
+    "Low": 3,
+    "Medium": 4,
+    "High": 5,
+    "Critical": 6,
+}
+CLI_COMMANDS = {"scan", "bench-rules", "-h", "--help"}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pinesawfly", description="PineSawFly 代码安全审计工具，不带子命令时启动图形界面。")
+    commands = parser.add_subparsers(dest="command", required=True)
+    scan = commands.add_parser(
+        "scan",
+        help="无界面扫描项目，以 JSON Lines 输出问题",
+        description="无界面扫描项目，每行向标准输出写入一个问题（JSON）。",
+        epilog=(
+            "退出码：0 无问题，1 扫描失败，2 参数错误，3/4/5/6 最高等级为 Low/Medium/High/Critical，130 已取消。"
+            "差异扫描时只按新增问题计算退出码。"
+        ),
+    )
+    scan.add_argument("path", help="项目目录")
+    scan.add_argument("-j", "--workers", type=int, default=0, help="扫描进程数，0 表示按 CPU 数自动选择")
+    scan.add_argument("--include-dependencies", action="store_true", help="同时扫描 vendor、node_modules 等依赖目录")
+    scan.add_argument(
+        "--incremental",
+        action=argparse.BooleanOptionalAction,
+        help="复用未变更文件的扫描结果（默认开启）",
+    )
+    scan.add_argument("--cache-dir", type=Path, help="增量扫描清单的缓存目录")
+    scan.add_argument("--mmap", action="store_true", help="对 1 MiB 以上的文件使用内存映射按字节匹配规则，只解码命中片段")
+    scan.add_argument("--base", help="差异扫描的基准版本（git 提交、分支或标签），只扫描 base 与 head 之间变更的文件")
+    scan.add_argument("--head", help="差异扫描的目标版本，默认 HEAD，需与 --base 一起使用")
+    scan.add_argument("-v", "--verbose", action="store_true", help="在标准错误输出扫描日志")
+
+    bench = commands.add_parser(
+        "bench-rules",
+        help="对目录逐条运行 rules/*.json 中的全部规则，按耗时排序输出",
+        description="对目录逐条运行 rules/*.json 中的全部规则（包括已禁用的规则），按耗时从高到低输出每条规则的耗时、命中数和被上下文过滤的匹配数。",
+    )
+    bench.add_argument("path", help="项目目录")
+    bench.add_argument("-n", "--repeat", type=int, default=1, help="重复扫描次数，耗时取平均")
+    bench.add_argument("--rules-dir", type=Path, help="规则目录，默认使用内置 rules 目录")
+    bench.add_argument("--include-dependencies", action="store_true", help="同时扫描 vendor、node_modules 等依赖目录")
+    bench.add_argument(
+        "--prefilter",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="按必需字面量跳过不可能命中的规则（默认开启，与正式扫描一致）",
+    )
+    bench.add_argument("-v", "--verbose", action="store_true", help="在标准错误输出扫描日志")
+    return parser
+
+
+def severity_exit_code(findings: list[dict[str, object]]) -> int:
+    return max((SEVERITY_EXIT_CODES.get(str(finding.get("severity")), EXIT_CLEAN) for finding in findings), default=EXIT_CLEAN)
+
+
+def run_scan(args: argparse.Namespace) -> int:
+    project_path = os.path.abspath(args.path)
+
+    def write_findings(findings: list[dict[str, object]]) -> None:
+        for finding in findings:
+            sys.stdout.write(json.dumps(finding, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+    if args.base:
+        pipeline = DiffScanPipeline(project_path, args.base, args.head or "HEAD", args.include_dependencies, on_batch=write_findings)
+    else:
+        pipeline = ScanPipeline(
+            project_path,
+            args.include_dependencies,
+            args.workers,
+            args.incremental is not False,
+            args.cache_dir,
+            args.mmap,
+            on_batch=write_findings,
+        )
+    previous_handler = signal.signal(signal.SIGINT, lambda _signum, _frame: pipeline.control.cancel())
+    try:
+        findings = pipeline.run()
+    except ScanCancelled:
+        findings = []
+        pipeline.partial = True
+    except GitError as exc:
+        print(f"差异扫描失败: {exc}", file=sys.stderr)
+        return EXIT_FAILED
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("scan failed")
+        print(f"扫描失败: {exc}", file=sys.stderr)
+        return EXIT_FAILED
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+    if pipeline.codegraph and pipeline.codegraph.running:
+        print("问题已全部输出，等待后台 codegraph 索引完成...", file=sys.stderr)
+        pipeline.codegraph.wait()
+        if pipeline.codegraph.elapsed is not None:
+            pipeline.timings["codegraph"] = pipeline.codegraph.elapsed
+    if pipeline.timings:
+        print(f"耗时：{pipeline.format_timings()}", file=sys.stderr)
+    if pipeline.overruns:
+        print(f"规则超时 {len(pipeline.overruns)} 处，已跳过对应文件上的规则：{pipeline.format_overruns()}", file=sys.stderr)
+    if pipeline.truncations:
+        print(f"污点分析预算耗尽 {len(pipeline.truncations)} 个文件，仅保留部分结果：{pipeline.format_truncations()}", file=sys.stderr)
+    if pipeline.partial:
+        print(f"扫描已取消，保留已完成部分的 {len(findings)} 个问题", file=sys.stderr)
+        return EXIT_CANCELLED
+    if isinstance(pipeline, DiffScanPipeline):
+        counts = pipeline.status_counts
+        print(
+            f"差异扫描完成：新增 {counts['new']} 个问题，修复 {counts['fixed']} 个，未变 {counts['unchanged']} 个"
+            f"（{len(pipeline.changes)} 个变更文件，{len(pipeline.dependents)} 个 include 依赖文件）",
+            file=sys.stderr,
+        )
+        return severity_exit_code([finding for finding in findings if finding.get("diffStatus") == "new"])
+    message = f"扫描完成，发现 {len(findings)} 个问题"
+    if pipeline.reused_files:
+        message += f"（复用 {pipeline.reused_files} 个未变更文件的结果）"
+    print(message, file=sys.stderr)
+    return severity_exit_code(findings)
+
+
+def run_rule_bench(args: argparse.Namespace) -> int:
+    engine = GenericRuleEngine(str(args.rules_dir) if args.rules_dir else None, args.prefilter, include_disabled=True)
+    inventory = walk_project(os.path.abspath(args.path), args.include_dependencies)
+    contexts = []
+    for file_path in inventory.files_with_suffix(SCAN_EXTENSIONS):
+        try:
+            context = AnalysisContext.from_file(file_path)
+        except OSError as exc:
+            logger.debug("无法读取 %s: %s", file_path, exc)
+            continue
+        if context.language in engine.query_index:
+            context.ensure_tree()
+        contexts.append(context)
+
+    for _ in range(args.repeat):
+        for context in contexts:
+            engine.scan_file(context.path, context)
+    profile = engine.take_profile()
+    for language, rules in engine.rule_index.items():
+        for rule in rules:
+            profile.costs.setdefault((language, rule.id), RuleCost(language, rule.id, rule.type))
+
+    print(f"{len(contexts)} 个文件，{len(profile.costs)} 条规则，重复 {args.repeat} 次，耗时为单次平均")
+    headers = [("排名", -4), ("规则", 32), ("语言", 8), ("类型", 10), ("耗时(ms)", -10), ("平均(µs/文件)", -14), ("文件", -6), ("命中", -6), ("跳过", -6)]
+    print(" ".join(_pad_display(title, width) for title, width in headers))
+    for rank, cost in enumerate(profile.ranked(), 1):
+        seconds = cost.seconds / args.repeat
+        files = cost.files // args.repeat
+        average = cost.seconds * 1_000_000 / cost.files if cost.files else 0.0
+        print(
+            f"{rank:>4} {cost.rule_id:<32} {cost.language:<8} {cost.rule_type:<10} {seconds * 1000:>10.2f} {average:>14.1f}"
+            f" {files:>6} {cost.matches // args.repeat:>6} {cost.skipped // args.repeat:>6}"
+        )
+    for overrun in engine.take_overruns():
+        print(overrun.describe(), file=sys.stderr)
+    return EXIT_CLEAN
+
+
+def _pad_display(text: str, width: int) -> str:
+    padding = " " * max(0, abs(width) - sum(2 if unicodedata.east_asian_width(char) in "WF" else 1 for char in text))
+    return padding + text if width < 0 else text + padding
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in CLI_COMMANDS:
+        from pinesawfly.app import main as run_app
+
+        return run_app()
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.path):
+        parser.error(f"项目目录不存在: {args.path}")
+    if args.command == "scan" and args.workers < 0:
+        parser.error("扫描进程数不能为负数")
+    if args.command == "scan" and args.head and not args.base:
+        parser.error("--head 需要与 --base 一起使用")
+    if args.command == "scan" and args.base:
+        unsupported = [
+            flag
+            for flag, given in (("-j/--workers", args.workers), ("--mmap", args.mmap), ("--incremental", args.incremental), ("--cache-dir", args.cache_dir))
+            if given
+        ]
+        if unsupported:
+            parser.error(f"差异扫描不支持 {'、'.join(unsupported)}")
+    if args.command == "bench-rules" and args.repeat < 1:
+        parser.error("重复次数必须大于 0")
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(levelname)s:%(name)s:%(message)s",
+        stream=sys.stderr,
+        force=True,
+    )
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8")
+    if args.command == "bench-rules":
+        return run_rule_bench(args)
+    return run_scan(args)
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import logging
+import posixpath
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+from modules.analysis_context import AnalysisContext
+from modules.file_module import FileModule
+from modules.git_diff import FileChange, GitRepository
+from modules.project_walker import ProjectInventory, ProjectWalker, walk_project
+from modules.scan_control import ScanCancelled
+from pinesawfly.scan_pipeline import PLUGIN_LANGUAGE_EXTENSIONS, SCAN_EXTENSIONS, FileScanner, ScanPipeline
+
+logger = logging.getLogger(__name__)
+
+INCLUDE_GREP = r"(include|require)(_once)?"
+INCLUDE_PATTERN = re.compile(
+    r"\b(?:include|require)(?:_once)?\b\s*\(?\s*"
+    r"(?P<prefix>(?:__DIR__|dirname\s*\(\s*__FILE__\s*\))\s*\.\s*)?"
+    r"(?P<quote>['\"])(?P<target>[^'\"\n]+)(?P=quote)",
+    re.IGNORECASE,
+)
+
+
+class DiffScanPipeline(ScanPipeline):
+    index_codegraph = False
+
+    def __init__(
+        self,
+        project_path: str,
+        base: str,
+        head: str = "HEAD",
+        include_dependencies: bool = False,
+        on_inventory: Callable[[ProjectInventory], None] | None = None,
+        on_batch: Callable[[list[dict[str, object]]], None] | None = None,
+        on_progress: Callable[[int, int, str], None] | None = None,
+    ) -> None:
+        super().__init__(
+            project_path,
+            include_dependencies,
+            workers=1,
+            incremental=False,
+            on_inventory=on_inventory,
+            on_batch=on_batch,
+            on_progress=on_progress,
+        )
+        self.base = base
+        self.head = head
+        self.changes: list[FileChange] = []
+        self.dependents: list[str] = []
+        self.status_counts: Counter[str] = Counter()
+
+    def _run_passes(self, project: Path) -> list[dict[str, object]]:
+        started_at = time.perf_counter()
+        repository = GitRepository(project)
+        base = repository.resolve(self.base)
+        head = repository.resolve(self.head)
+        walker = ProjectWalker(self.include_dependencies)
+        extensions = SCAN_EXTENSIONS.union(*PLUGIN_LANGUAGE_EXTENSIONS.values())
+        changes = [change for change in repository.changed_files(base, head) if not walker.is_ignored(Path(change.path), project)]
+        changed_paths = {change.path for change in changes} | {change.old_path for change in changes if change.old_path}
+        self.changes = [change for change in changes if Path(change.path).suffix.lower() in extensions]
+        scanned_paths = {change.path for change in self.changes}
+        self.dependents = sorted(self._include_dependents(repository, project, head, changed_paths, walker) - scanned_paths)
+        targets: list[tuple[str | None, str | None]] = [
+            (None if change.deleted else change.path, None if change.status == "A" else change.old_path or change.path)
+            for change in self.changes
+        ]
+        targets.extend((path, path) for path in self.dependents)
+        head_blobs = repository.read_blobs(head, [head_path for head_path, _base_path in targets if head_path])
+        base_blobs = repository.read_blobs(base, [base_path for _head_path, base_path in targets if base_path])
+        self.timings["git"] = time.perf_counter() - started_at
+        logger.info("差异扫描 %s..%s: %s 个变更文件，%s 个 include 依赖文件", self.base, self.head, len(self.changes), len(self.dependents))
+
+        started_at = time.perf_counter()
+        inventory = walk_project(project, self.include_dependencies)
+        self._notify(self.on_inventory, inventory)
+        scanner = FileScanner(self.project_path, inventory, self.control)
+        self.timings["setup"] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        local_rows: dict[str, tuple[list[dict[str, object]], list[dict[str, object]]]] = {}
+        rows_by_path: dict[str, list[dict[str, object]]] = {}
+        head_revision: tuple[dict[str, Any], dict[str, bytes]] = ({}, {})
+        base_revision: tuple[dict[str, Any], dict[str, bytes]] = ({}, {})
+        self.status_counts = Counter()
+        self._notify(self.on_progress, 0, len(targets), "")
+        try:
+            for index, (head_path, base_path) in enumerate(targets, 1):
+                path = head_path or base_path
+                head_raw = head_blobs.get(head_path) if head_path else None
+                base_raw = base_blobs.get(base_path) if base_path else None
+                head_rows = self._scan_blob(scanner, project, path, head_raw, head_revision)
+                if base_raw is not None and base_raw == head_raw:
+                    base_rows = head_rows
+                    self._share_blob(project, path, head_revision, base_revision)
+                else:
+                    base_rows = self._scan_blob(scanner, project, path, base_raw, base_revision)
+                rows = self._tag_rows(base_rows, head_rows)
+                local_rows[str(project / path)] = (base_rows, head_rows)
+                rows_by_path[str(project / path)] = rows
+                if rows:
+                    self._notify(self.on_batch, rows)
+                self._notify(self.on_progress, index, len(targets), str(project / path))
+        except ScanCancelled:
+            logger.info("差异扫描已取消: %s", project)
+            self.partial = True
+        self.timings["analyze"] = time.perf_counter() - started_at
+        self.rule_profile.merge(scanner.take_rule_profile())
+        if not self.partial:
+            self._run_revision_project_pass(project, scanner, head_revision, base_revision, local_rows, rows_by_path)
+        results = [row for rows in rows_by_path.values() for row in rows]
+        self.status_counts.update(str(row["diffStatus"]) for row in results)
+        return results
+
+    def _scan_blob(
+        self,
+        scanner: FileScanner,
+        project: Path,
+        relative_path: str,
+        raw: bytes | None,
+        revision: tuple[dict[str, Any], dict[str, bytes]],
+    ) -> list[dict[str, object]]:
+        if raw is None:
+            return []
+        file_path = project / relative_path
+        context = AnalysisContext.from_bytes(raw, file_path)
+        vulns = scanner.scan(str(file_path), context)
+        self.overruns.extend(scanner.take_overruns())
+        self.truncations.extend(scanner.take_truncations())
+        units, sources = revision
+        unit = scanner.take_project_unit()
+        if unit is not None:
+            units[str(file_path)] = unit
+            sources[str(file_path)] = raw
+        return self._dedupe_results([self._normalize_vuln(project, file_path, vuln) for vuln in vulns])
+
+    def _share_blob(
+        self,
+        project: Path,
+        relative_path: str,
+        head_revision: tuple[dict[str, Any], dict[str, bytes]],
+        base_revision: tuple[dict[str, Any], dict[str, bytes]],
+    ) -> None:
+        file_path = str(project / relative_path)
+        for head_entries, base_entries in zip(head_revision, base_revision):
+            if file_path in head_entries:
+                base_entries[file_path] = head_entries[file_path]
+
+    def _run_revision_project_pass(
+        self,
+        project: Path,
+        scanner: FileScanner,
+        head_revision: tuple[dict[str, Any], dict[str, bytes]],
+        base_revision: tuple[dict[str, Any], dict[str, bytes]],
+        local_rows: dict[str, tuple[list[dict[str, object]], list[dict[str, object]]]],
+        rows_by_path: dict[str, list[dict[str, object]]],
+    ) -> None:
+        started_at = time.perf_counter()
+        try:
+            head_findings = self._solve_revision(scanner, *head_revision)
+            base_findings = self._solve_revision(scanner, *base_revision)
+        except ScanCancelled:
+            logger.info("差异扫描跨文件污点分析已取消: %s", project)
+            self.partial = True
+            return
+        finally:
+            self.timings["project"] = time.perf_counter() - started_at
+        reported = {truncation.file_path for truncation in self.truncations}
+        self.truncations.extend(truncation for truncation in scanner.take_truncations() if truncation.file_path not in reported)
+        added: list[dict[str, object]] = []
+        for file_path in sorted(head_findings.keys() | base_findings.keys(), key=Path):
+            base_rows, head_rows = local_rows.get(file_path, ([], []))
+            rows = self._tag_rows(
+                self._dedupe_results([*base_rows, *self._cross_file_rows(project, file_path, base_findings.get(file_path, []))]),
+                self._dedupe_results([*head_rows, *self._cross_file_rows(project, file_path, head_findings.get(file_path, []))]),
+            )
+            emitted = {(self._result_fingerprint(row), row["diffStatus"]) for row in rows_by_path.get(file_path, [])}
+            added.extend(row for row in rows if (self._result_fingerprint(row), row["diffStatus"]) not in emitted)
+            rows_by_path[file_path] = rows
+        if added:
+            self._notify(self.on_batch, added)
+
+    def _solve_revision(self, scanner: FileScanner, units: dict[str, Any], sources: dict[str, bytes]) -> dict[str, list[dict]]:
+        def run(tasks: list[tuple[str, Any]]) -> list[tuple[str, Any, list[dict], list]]:
+            return [
+                (file_path, *analyzed)
+                for file_path, external in tasks
+                if (analyzed := scanner.analyze_project_file(file_path, external, AnalysisContext.from_bytes(sources[file_path], file_path)))
+            ]
+
+        return scanner.solve_project(sorted(units), units, run)
+
+    def _tag_rows(self, base_rows: list[dict[str, object]], head_rows: list[dict[str, object]]) -> list[dict[str, object]]:
+        base_keys = Counter(self._diff_key(row) for row in base_rows)
+        head_keys = Counter(self._diff_key(row) for row in head_rows)
+        rows: list[dict[str, object]] = []
+        for row in head_rows:
+            key = self._diff_key(row)
+            status = "unchanged" if base_keys[key] > 0 else "new"
+            base_keys[key] -= 1
+            rows.append({**row, "diffStatus": status})
+        for row in base_rows:
+            key = self._diff_key(row)
+            if head_keys[key] <= 0:
+                rows.append({**row, "diffStatus": "fixed"})
+            head_keys[key] -= 1
+        return rows
+
+    def _diff_key(self, row: dict[str, object]) -> tuple[object, ...]:
+        match = self._normalize_match_text(str(row.get("match") or row.get("description") or ""))
+        return row.get("file"), row.get("ruleId"), match
+
+    def _include_dependents(self, repository: GitRepository, project: Path, head: str, changed_paths: set[str], walker: ProjectWalker) -> set[str]:
+        if not changed_paths:
+            return set()
+        candidates = [path for path in repository.grep_files(head, INCLUDE_GREP, ["*.php"]) if not walker.is_ignored(Path(path), project)]
+        dependents: set[str] = set()
+        for path, raw in repository.read_blobs(head, candidates).items():
+            content, _encoding = FileModule.decode_bytes(raw)
+            for match in INCLUDE_PATTERN.finditer(content):
+                if self._include_candidates(path, match.group("target"), bool(match.group("prefix"))) & changed_paths:
+                    dependents.add(path)
+                    break
+        return dependents
+
+    def _include_candidates(self, path: str, target: str, relative_to_file: bool) -> set[str]:
+        directory = posixpath.dirname(path)
+        target = target.replace("\\", "/")
+        if relative_to_file:
+            return {posixpath.normpath(posixpath.join(directory, target.lstrip("/")))}
+        return {posixpath.normpath(posixpath.join(directory, target)), posixpath.normpath(target)}
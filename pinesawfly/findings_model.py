@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any
+
+from PySide6.QtCore import QAbstractListModel, QByteArray, QModelIndex, QObject, QPersistentModelIndex, Qt
+
+FINDING_ROLES = (
+    "severity",
+    "ruleId",
+    "ruleName",
+    "file",
+    "line",
+    "description",
+    "match",
+    "absolutePath",
+    "crossFile",
+    "aiAnalysis",
+)
+
+
+class FindingsModel(QAbstractListModel):
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._findings: list[dict[str, object]] = []
+        self._roles = {Qt.ItemDataRole.UserRole + offset: name for offset, name in enumerate(FINDING_ROLES, 1)}
+
+    @property
+    def findings(self) -> list[dict[str, object]]:
+        return self._findings
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._findings)
+
+    def roleNames(self) -> dict[int, QByteArray]:
+        return {role: QByteArray(name.encode("ascii")) for role, name in self._roles.items()}
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._findings):
+            return None
+        name = self._roles.get(role)
+        if name is None:
+            return None
+        return self._findings[index.row()].get(name)
+
+    def reset(self, findings: list[dict[str, object]]) -> None:
+        self.beginResetModel()
+        self._findings = findings
+        self.endResetModel()
+
+    def append(self, findings: list[dict[str, object]]) -> None:
+        if not findings:
+            return
+        start = len(self._findings)
+        self.beginInsertRows(QModelIndex(), start, start + len(findings) - 1)
+        self._findings.extend(findings)
+        self.endInsertRows()
+
+    def refresh(self) -> None:
+        if self._findings:
+            self.dataChanged.emit(self.index(0), self.index(len(self._findings) - 1))
@@ -5,17 +5,25 @@ import re
 from pathlib import Path
 
 from PySide6.QtCore import QObject, Property, Signal, Slot
+from tree_sitter import QueryError
+
+from modules.generic_rule_engine import compile_rule_query
+from modules.rule_profile import RULE_COST_SORT_KEYS, sort_cost_rows
 
 
 class RuleManager(QObject):
     rulesChanged = Signal()
     statusChanged = Signal()
+    ruleCostsChanged = Signal()
 
     def __init__(self, rules_dir: str | Path) -> None:
         super().__init__()
         self._rules_dir = Path(rules_dir)
         self._rules: list[dict[str, object]] = []
         self._status = "规则已加载"
+        self._rule_costs: list[dict[str, object]] = []
+        self._cost_sort_key = "seconds"
+        self._cost_sort_descending = True
         self.reload()
 
     @Slot()
@@ -35,10 +43,7 @@ class RuleManager(QObject):
             self._set_status("语言、规则ID、名称和正则不能为空")
             return False
 
-        try:
-            re.compile(pattern)
-        except re.error as exc:
-            self._set_status(f"正则无效: {exc}")
+        if not self._validate_pattern(language, "REGEX", pattern):
             return False
 
         file_path = self._file_for_language(language)
@@ -100,11 +105,6 @@ class RuleManager(QObject):
         if not language or not rule_id or not name.strip() or not pattern.strip():
             self._set_status("语言、规则ID、名称和正则不能为空")
             return False
-        try:
-            re.compile(pattern)
-        except re.error as exc:
-            self._set_status(f"正则无效: {exc}")
-            return False
 
         old_file = self._file_for_language(old_language)
         old_rules = self._read_rule_file(old_file)
@@ -118,6 +118,9 @@ class RuleManager(QObject):
         if target_rule is None:
             self._set_status(f"未找到规则 {old_rule_id}")
             return False
+        rule_type = str(target_rule.get("type", "REGEX"))
+        if not self._validate_pattern(language, rule_type, pattern):
+            return False
 
         new_file = self._file_for_language(language)
         new_rules = next_old_rules if new_file == old_file else self._read_rule_file(new_file)
@@ -125,11 +128,13 @@ class RuleManager(QObject):
             self._set_status(f"规则ID已存在: {rule_id}")
             return False
 
+        if target_rule.get("pattern") != pattern:
+            target_rule.pop("requires", None)
         target_rule.update(
             {
                 "id": rule_id,
                 "name": name.strip(),
-                "type": "REGEX",
+                "type": rule_type,
                 "pattern": pattern,
                 "severity": severity.strip() or "Medium",
                 "description": description.strip(),
@@ -169,6 +174,38 @@ class RuleManager(QObject):
         self.reload()
         return True
 
+    @Slot(list)
+    def setRuleCosts(self, rows: list) -> None:
+        self._rule_costs = sort_cost_rows(list(rows), self._cost_sort_key, self._cost_sort_descending)
+        self.ruleCostsChanged.emit()
+
+    @Slot(str)
+    def sortRuleCosts(self, key: str) -> None:
+        if key not in RULE_COST_SORT_KEYS:
+            return
+        if key == self._cost_sort_key:
+            self._cost_sort_descending = not self._cost_sort_descending
+        else:
+            self._cost_sort_key = key
+            self._cost_sort_descending = key != "id"
+        self._rule_costs = sort_cost_rows(self._rule_costs, self._cost_sort_key, self._cost_sort_descending)
+        self.ruleCostsChanged.emit()
+
+    def _validate_pattern(self, language: str, rule_type: str, pattern: str) -> bool:
+        if rule_type == "AST_QUERY":
+            try:
+                compile_rule_query(language, pattern)
+            except QueryError as exc:
+                self._set_status(f"语法树查询无效: {exc}")
+                return False
+            return True
+        try:
+            re.compile(pattern)
+        except re.error as exc:
+            self._set_status(f"正则无效: {exc}")
+            return False
+        return True
+
     def _read_rule_file(self, file_path: Path) -> list[dict[str, object]]:
         if not file_path.exists():
             return []
@@ -237,5 +274,17 @@ class RuleManager(QObject):
     def get_status(self) -> str:
         return self._status
 
+    def get_rule_costs(self) -> list[dict[str, object]]:
+        return self._rule_costs
+
+    def get_cost_sort_key(self) -> str:
+        return self._cost_sort_key
+
+    def get_cost_sort_descending(self) -> bool:
+        return self._cost_sort_descending
+
     rules = Property("QVariantList", get_rules, notify=rulesChanged)
     status = Property(str, get_status, notify=statusChanged)
+    ruleCosts = Property("QVariantList", get_rule_costs, notify=ruleCostsChanged)
+    costSortKey = Property(str, get_cost_sort_key, notify=ruleCostsChanged)
+    costSortDescending = Property(bool, get_cost_sort_descending, notify=ruleCostsChanged)
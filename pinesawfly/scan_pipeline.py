@@ -0,0 +1,606 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import re
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+from modules.analysis_context import AnalysisContext
+from modules.codegraph_index import CodegraphIndex
+from modules.generic_rule_engine import GenericRuleEngine
+from modules.project_walker import ProjectInventory, walk_project
+from modules.rule_budget import AnalysisTruncation, RuleOverrun, needs_interrupt_process
+from modules.rule_profile import RuleProfile
+from modules.scan_control import ScanCancelled, ScanControl
+from modules.scan_manifest import ScanManifest, fingerprint, manifest_path, source_fingerprint
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {".php", ".py", ".java", ".lua", ".go", ".js", ".ts", ".html", ".css"}
+SCAN_EXTENSIONS = {".php", ".py", ".java"}
+PLUGIN_LANGUAGE_EXTENSIONS = {
+    "php_plugin": {".php"},
+}
+SCAN_CHUNK_SIZE = 32
+MMAP_SCAN_MIN_BYTES = 1024 * 1024
+SCAN_PROGRESS_INTERVAL_SECONDS = 0.25
+
+
+class FileScanner:
+    def __init__(
+        self,
+        project_path: str,
+        inventory: ProjectInventory | None = None,
+        control: ScanControl | None = None,
+        mmap_scan: bool = False,
+    ) -> None:
+        self.project = Path(project_path)
+        self.inventory = inventory
+        self.control = control
+        self.mmap_scan = mmap_scan
+        self.rule_engine = GenericRuleEngine(control=control)
+        self.plugins = self._load_language_plugins()
+
+    def _load_language_plugins(self) -> list[tuple[object, set[str]]]:
+        plugins: list[tuple[object, set[str]]] = []
+        try:
+            from core.plugin_loader import PluginLoader
+
+            app_root = Path(__file__).resolve().parent.parent
+            plugin_loader = PluginLoader(str(app_root / "plugins"))
+            plugin_loader.load_all_plugins()
+            for plugin_name, extensions in PLUGIN_LANGUAGE_EXTENSIONS.items():
+                plugin_module = plugin_loader.get_plugin(plugin_name)
+                if not plugin_module:
+                    continue
+                plugin = plugin_module.PluginInterface()
+                if plugin.initialize(str(self.project), self.inventory, self.control):
+                    plugins.append((plugin, extensions))
+        except Exception:
+            logger.exception("plugin scan failed")
+        return plugins
+
+    @property
+    def ruleset_version(self) -> str:
+        engine_sources = [Path(sys.modules[GenericRuleEngine.__module__].__file__)]
+        if self.mmap_scan:
+            return fingerprint(self.rule_engine.get_all_rules(), source_fingerprint(engine_sources), "mmap")
+        return fingerprint(self.rule_engine.get_all_rules(), source_fingerprint(engine_sources))
+
+    @property
+    def plugin_version(self) -> str:
+        versions = []
+        for plugin, _extensions in self.plugins:
+            module_file = getattr(sys.modules.get(type(plugin).__module__), "__file__", None)
+            sources = Path(module_file).parent.rglob("*.py") if module_file else []
+            versions.append((plugin.name, getattr(plugin, "cache_version", plugin.version), source_fingerprint(sources)))
+        return fingerprint(versions)
+
+    def scan(self, file_path: str, context: AnalysisContext | None = None) -> list[dict]:
+        if self.control:
+            self.control.checkpoint()
+        suffix = Path(file_path).suffix.lower()
+        snapshot = context is not None
+        vulns: list[dict] = []
+        if suffix in SCAN_EXTENSIONS:
+            if context is None and self.mmap_scan and os.path.getsize(file_path) >= MMAP_SCAN_MIN_BYTES:
+                vulns.extend(self.rule_engine.scan_mapped_file(file_path))
+            else:
+                context = context or AnalysisContext.from_file(file_path)
+                vulns.extend(self.rule_engine.scan_file(file_path, context))
+        for plugin, extensions in self.plugins:
+            if suffix in extensions:
+                context = context or AnalysisContext.from_file(file_path)
+                vulns.extend(plugin.scan(file_path, {"context": context, "snapshot": snapshot}))
+        return vulns
+
+    def take_overruns(self) -> list[RuleOverrun]:
+        return self.rule_engine.take_overruns()
+
+    def take_truncations(self) -> list[AnalysisTruncation]:
+        truncations: list[AnalysisTruncation] = []
+        for plugin, _extensions in self.plugins:
+            take_truncations = getattr(plugin, "take_truncations", None)
+            if take_truncations:
+                truncations.extend(take_truncations())
+        return truncations
+
+    def take_rule_profile(self) -> RuleProfile:
+        return self.rule_engine.take_profile()
+
+    def take_project_unit(self) -> Any:
+        for plugin, _extensions in self.plugins:
+            take_project_unit = getattr(plugin, "take_project_unit", None)
+            unit = take_project_unit() if take_project_unit else None
+            if unit is not None:
+                return unit
+        return None
+
+    def analyze_project_file(
+        self,
+        file_path: str,
+        external: Mapping[str, Any],
+        context: AnalysisContext | None = None,
+    ) -> tuple[Any, list[dict], list[AnalysisTruncation]] | None:
+        if self.control:
+            self.control.checkpoint()
+        suffix = Path(file_path).suffix.lower()
+        for plugin, extensions in self.plugins:
+            analyze_project_file = getattr(plugin, "analyze_project_file", None)
+            if analyze_project_file and suffix in extensions:
+                return analyze_project_file(file_path, external, context)
+        return None
+
+    def solve_project(
+        self,
+        files: list[str],
+        units: Mapping[str, Any],
+        run: Callable,
+        cache_path: Path | None = None,
+        truncated: set[str] | None = None,
+    ) -> dict[str, list[dict]]:
+        for plugin, _extensions in self.plugins:
+            solve_project = getattr(plugin, "solve_project", None)
+            if solve_project:
+                return solve_project(files, units, run, cache_path, self.plugin_version, truncated or set())
+        return {}
+
+
+_process_scanner: FileScanner | None = None
+
+
+def _init_scan_process(project_path: str, inventory: ProjectInventory, control: ScanControl, mmap_scan: bool, log_level: int) -> None:
+    global _process_scanner
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(level=log_level, format="%(levelname)s:%(name)s:%(message)s", force=True)
+    _process_scanner = FileScanner(project_path, inventory, control, mmap_scan)
+
+
+def _scan_file_chunk(file_paths: list[str]) -> tuple[list[tuple[list[dict], list[RuleOverrun], list[AnalysisTruncation], Any]], RuleProfile]:
+    results = [
+        (
+            _process_scanner.scan(file_path),
+            _process_scanner.take_overruns(),
+            _process_scanner.take_truncations(),
+            _process_scanner.take_project_unit(),
+        )
+        for file_path in file_paths
+    ]
+    return results, _process_scanner.take_rule_profile()
+
+
+def _rescan_file(scanner: FileScanner, file_path: str) -> tuple[list[dict], list[RuleOverrun], list[AnalysisTruncation], Any]:
+    try:
+        vulns = scanner.scan(file_path) if os.path.isfile(file_path) else []
+    except OSError as exc:
+        logger.debug("无法重新扫描 %s: %s", file_path, exc)
+        vulns = []
+    return vulns, scanner.take_overruns(), scanner.take_truncations(), scanner.take_project_unit()
+
+
+def _rescan_file_chunk(file_paths: list[str]) -> list[tuple[list[dict], list[RuleOverrun], list[AnalysisTruncation], Any]]:
+    return [_rescan_file(_process_scanner, file_path) for file_path in file_paths]
+
+
+def _analyze_project_chunk(tasks: list[tuple[str, Mapping[str, Any]]]) -> list[tuple[str, Any, list[dict], list[AnalysisTruncation]]]:
+    results = []
+    for file_path, external in tasks:
+        analyzed = _process_scanner.analyze_project_file(file_path, external)
+        if analyzed is not None:
+            results.append((file_path, *analyzed))
+    return results
+
+
+class ScanPipeline:
+    index_codegraph = True
+
+    def __init__(
+        self,
+        project_path: str,
+        include_dependencies: bool = False,
+        workers: int = 0,
+        incremental: bool = True,
+        cache_dir: Path | None = None,
+        mmap_scan: bool = False,
+        on_inventory: Callable[[ProjectInventory], None] | None = None,
+        on_batch: Callable[[list[dict[str, object]]], None] | None = None,
+        on_progress: Callable[[int, int, str], None] | None = None,
+    ) -> None:
+        self.project_path = project_path
+        self.include_dependencies = include_dependencies
+        self.workers = workers
+        self.incremental = incremental
+        self.cache_dir = cache_dir
+        self.mmap_scan = mmap_scan
+        self.on_inventory = on_inventory
+        self.on_batch = on_batch
+        self.on_progress = on_progress
+        self.reused_files = 0
+        self.partial = False
+        self.control = ScanControl()
+        self.codegraph: CodegraphIndex | None = None
+        self.timings: dict[str, float] = {}
+        self.overruns: list[RuleOverrun] = []
+        self.truncations: list[AnalysisTruncation] = []
+        self.rule_profile = RuleProfile()
+        self._scanner: FileScanner | None = None
+        self._executor: ProcessPoolExecutor | None = None
+        self._cross_rows: dict[str, list[dict[str, object]]] | None = None
+        self._cross_paths: set[str] = set()
+
+    def _notify(self, callback: Callable[..., None] | None, *args: object) -> None:
+        if callback:
+            callback(*args)
+
+    def run(self) -> list[dict[str, object]]:
+        project = Path(self.project_path)
+        self.timings = {}
+        self.overruns = []
+        self.truncations = []
+        self.rule_profile = RuleProfile()
+        self.codegraph = CodegraphIndex.ensure(project) if self.index_codegraph else None
+        try:
+            results = self._run_passes(project)
+        except BaseException:
+            if self.codegraph:
+                self.codegraph.cancel()
+            raise
+        if self.codegraph:
+            if self.partial:
+                self.codegraph.cancel()
+            elif self.codegraph.running:
+                logger.info("codegraph 索引仍在后台进行: %s", project)
+            if self.codegraph.elapsed is not None:
+                self.timings["codegraph"] = self.codegraph.elapsed
+        logger.info("扫描耗时: %s", self.format_timings())
+        return results
+
+    def rescan(
+        self,
+        inventory: ProjectInventory,
+        file_paths: list[str],
+        cross_paths: list[str] | None = None,
+    ) -> dict[str, list[dict[str, object]]]:
+        project = Path(self.project_path)
+        self.overruns = []
+        self.truncations = []
+        self.partial = False
+        if cross_paths is not None:
+            self._cross_rows = None
+            self._cross_paths = set(cross_paths)
+        if self._scanner is None or self._scanner.inventory is not inventory:
+            self.close()
+            self._scanner = FileScanner(self.project_path, inventory, self.control, self.mmap_scan)
+            if needs_interrupt_process():
+                self._executor = self._process_pool(inventory, 1)
+        units: dict[str, Any] = {}
+        truncated: set[str] = set()
+        results = self._rescan_files(project, file_paths, units, truncated)
+        if not any(file_path.lower().endswith(".php") for file_path in file_paths):
+            return results
+        files = [file_path for file_path in self._collect_scan_files(inventory) if os.path.isfile(file_path)]
+        cache_path = manifest_path(project, self.cache_dir, "taint-summaries")
+        project_results = self._run_project_pass(project, files, units, truncated, self._scanner, inventory, cache_path, self._executor)
+        if self.partial:
+            raise ScanCancelled("扫描已取消")
+        previous = self._cross_rows
+        if previous is None:
+            affected = self._cross_paths | project_results.keys()
+        else:
+            affected = {file_path for file_path in previous.keys() | project_results.keys() if previous.get(file_path) != project_results.get(file_path)}
+        self._cross_rows = project_results
+        stale = sorted(file_path for file_path in affected - results.keys() if os.path.isfile(file_path))
+        results.update(self._rescan_files(project, stale, {}, set()))
+        self._merge_cross_file_rows(results, {file_path: rows for file_path, rows in project_results.items() if file_path in results})
+        return results
+
+    def _rescan_files(
+        self,
+        project: Path,
+        file_paths: list[str],
+        units: dict[str, Any],
+        truncated: set[str],
+    ) -> dict[str, list[dict[str, object]]]:
+        if not file_paths:
+            return {}
+        if self._executor:
+            scanned = self._executor.submit(_rescan_file_chunk, file_paths).result()
+        else:
+            scanned = [_rescan_file(self._scanner, file_path) for file_path in file_paths]
+        results: dict[str, list[dict[str, object]]] = {}
+        for file_path, (vulns, overruns, truncations, unit) in zip(file_paths, scanned):
+            if unit is not None:
+                units[file_path] = unit
+            if truncations:
+                truncated.add(file_path)
+            self.overruns.extend(overruns)
+            self.truncations.extend(truncations)
+            results[file_path] = self._dedupe_results([self._normalize_vuln(project, Path(file_path), vuln) for vuln in vulns])
+        return results
+
+    def close(self) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        self._scanner = None
+
+    def format_timings(self) -> str:
+        labels = {"walk": "遍历", "git": "git 差异", "setup": "准备", "analyze": "分析", "project": "跨文件污点", "codegraph": "codegraph 索引"}
+        return "，".join(f"{labels.get(name, name)} {seconds:.2f}s" for name, seconds in self.timings.items())
+
+    def format_overruns(self, limit: int = 0) -> str:
+        overruns = self.overruns[:limit] if limit else self.overruns
+        lines = [f"{overrun.rule_id} @ {self._relative_path(overrun.file_path)}" for overrun in overruns]
+        if len(overruns) < len(self.overruns):
+            lines.append(f"等 {len(self.overruns)} 处")
+        return "，".join(lines)
+
+    def format_truncations(self, limit: int = 0) -> str:
+        truncations = self.truncations[:limit] if limit else self.truncations
+        lines = [f"{self._relative_path(truncation.file_path)}（{truncation.visited_nodes} 节点）" for truncation in truncations]
+        if len(truncations) < len(self.truncations):
+            lines.append(f"等 {len(self.truncations)} 个文件")
+        return "，".join(lines)
+
+    def _relative_path(self, file_path: str) -> str:
+        try:
+            return Path(file_path).relative_to(self.project_path).as_posix()
+        except ValueError:
+            return file_path
+
+    def _run_passes(self, project: Path) -> list[dict[str, object]]:
+        rows_by_path: dict[str, list[dict[str, object]]] = {}
+        started_at = time.perf_counter()
+        self.control.checkpoint()
+        inventory = walk_project(project, self.include_dependencies)
+        self._notify(self.on_inventory, inventory)
+        files = self._collect_scan_files(inventory)
+        self.timings["walk"] = time.perf_counter() - started_at
+        started_at = time.perf_counter()
+        scanner = FileScanner(self.project_path, inventory, self.control, self.mmap_scan)
+        manifest = None
+        if self.incremental:
+            cache_path = manifest_path(project, self.cache_dir)
+            manifest = ScanManifest(project, scanner.ruleset_version, scanner.plugin_version, cache_path).load()
+        cached_vulns: dict[str, list[dict]] = {}
+        units: dict[str, Any] = {}
+        truncated: set[str] = set()
+        pending: list[str] = []
+        for file_path in files:
+            self.control.checkpoint()
+            cached = manifest.cached_findings(file_path) if manifest else None
+            if cached is None:
+                pending.append(file_path)
+            else:
+                cached_vulns[file_path] = cached
+        self.timings["setup"] = time.perf_counter() - started_at
+        started_at = time.perf_counter()
+        scanned = self._scan_files(pending, scanner, inventory)
+        batch: list[dict[str, object]] = []
+        last_emit = time.perf_counter()
+        self._notify(self.on_progress, 0, len(files), "")
+        try:
+            for index, file_path in enumerate(files, 1):
+                vulns = cached_vulns.get(file_path)
+                if vulns is None:
+                    vulns, overruns, truncations, unit = next(scanned)
+                    self.overruns.extend(overruns)
+                    self.truncations.extend(truncations)
+                    if unit is not None:
+                        units[file_path] = unit
+                    if truncations:
+                        truncated.add(file_path)
+                    if manifest and not overruns and not truncations:
+                        manifest.record(file_path, vulns)
+                rows = self._dedupe_results([self._normalize_vuln(project, Path(file_path), vuln) for vuln in vulns])
+                rows_by_path[file_path] = rows
+                batch.extend(rows)
+                if index == len(files) or time.perf_counter() - last_emit >= SCAN_PROGRESS_INTERVAL_SECONDS:
+                    if batch:
+                        self._notify(self.on_batch, batch)
+                        batch = []
+                    self._notify(self.on_progress, index, len(files), file_path)
+                    last_emit = time.perf_counter()
+        except ScanCancelled:
+            logger.info("扫描已取消: %s", project)
+            self.partial = True
+            if batch:
+                self._notify(self.on_batch, batch)
+        finally:
+            scanned.close()
+            self.timings["analyze"] = time.perf_counter() - started_at
+        if manifest:
+            manifest.save()
+            self.reused_files = manifest.reused
+        if not self.partial:
+            cache_path = manifest_path(project, self.cache_dir, "taint-summaries") if self.incremental else None
+            project_results = self._run_project_pass(project, files, units, truncated, scanner, inventory, cache_path)
+            added = self._merge_cross_file_rows(rows_by_path, project_results)
+            if added:
+                self._notify(self.on_batch, added)
+        return [row for file_path in files for row in rows_by_path.get(file_path, [])]
+
+    def _run_project_pass(
+        self,
+        project: Path,
+        files: list[str],
+        units: dict[str, Any],
+        truncated: set[str],
+        scanner: FileScanner,
+        inventory: ProjectInventory,
+        cache_path: Path | None,
+        executor: ProcessPoolExecutor | None = None,
+    ) -> dict[str, list[dict[str, object]]]:
+        started_at = time.perf_counter()
+        owned: ProcessPoolExecutor | None = None
+
+        def run(tasks: list[tuple[str, Mapping[str, Any]]]) -> Iterable[tuple[str, Any, list[dict], list[AnalysisTruncation]]]:
+            nonlocal executor, owned
+            if executor is None:
+                workers = self._worker_count(len(tasks))
+                if workers <= 1:
+                    return [(file_path, *analyzed) for file_path, external in tasks if (analyzed := scanner.analyze_project_file(file_path, external))]
+                executor = owned = self._process_pool(inventory, workers)
+            chunks = [tasks[index:index + SCAN_CHUNK_SIZE] for index in range(0, len(tasks), SCAN_CHUNK_SIZE)]
+            return [result for chunk_results in executor.map(_analyze_project_chunk, chunks) for result in chunk_results]
+
+        try:
+            findings = scanner.solve_project(files, units, run, cache_path, truncated)
+        except ScanCancelled:
+            logger.info("跨文件污点分析已取消: %s", project)
+            self.partial = True
+            findings = {}
+        finally:
+            if owned:
+                owned.shutdown(wait=True, cancel_futures=True)
+            self.timings["project"] = time.perf_counter() - started_at
+        self.truncations.extend(truncation for truncation in scanner.take_truncations() if truncation.file_path not in truncated)
+        return {file_path: self._cross_file_rows(project, file_path, vulns) for file_path, vulns in findings.items()}
+
+    def _cross_file_rows(self, project: Path, file_path: str, vulns: list[dict]) -> list[dict[str, object]]:
+        return self._dedupe_results([{**self._normalize_vuln(project, Path(file_path), vuln), "crossFile": True} for vuln in vulns])
+
+    def _merge_cross_file_rows(
+        self,
+        rows_by_path: dict[str, list[dict[str, object]]],
+        project_results: Mapping[str, list[dict[str, object]]],
+    ) -> list[dict[str, object]]:
+        added: list[dict[str, object]] = []
+        for file_path, cross_rows in project_results.items():
+            rows = rows_by_path.get(file_path, [])
+            known = {self._result_fingerprint(row) for row in rows}
+            added.extend(row for row in cross_rows if self._result_fingerprint(row) not in known)
+            rows_by_path[file_path] = self._dedupe_results([*rows, *cross_rows])
+        return added
+
+    def _collect_scan_files(self, inventory: ProjectInventory) -> list[str]:
+        extensions = SCAN_EXTENSIONS.union(*PLUGIN_LANGUAGE_EXTENSIONS.values())
+        return [str(file_path) for file_path in inventory.files_with_suffix(extensions)]
+
+    def _scan_files(self, files: list[str], scanner: FileScanner, inventory: ProjectInventory):
+        workers = self._worker_count(len(files))
+        if workers <= 1 and not needs_interrupt_process():
+            try:
+                for file_path in files:
+                    yield scanner.scan(file_path), scanner.take_overruns(), scanner.take_truncations(), scanner.take_project_unit()
+            finally:
+                self.rule_profile.merge(scanner.take_rule_profile())
+            return
+        chunks = [files[index:index + SCAN_CHUNK_SIZE] for index in range(0, len(files), SCAN_CHUNK_SIZE)]
+        logger.info("使用 %s 个进程并行扫描 %s 个文件", workers, len(files))
+        executor = self._process_pool(inventory, workers)
+        try:
+            for chunk_results, profile in executor.map(_scan_file_chunk, chunks):
+                self.rule_profile.merge(profile)
+                yield from chunk_results
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _process_pool(self, inventory: ProjectInventory, workers: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_scan_process,
+            initargs=(self.project_path, inventory, self.control, self.mmap_scan, logging.getLogger().getEffectiveLevel()),
+        )
+
+    def _worker_count(self, file_count: int) -> int:
+        workers = self.workers if self.workers > 0 else os.cpu_count() or 1
+        chunk_count = (file_count + SCAN_CHUNK_SIZE - 1) // SCAN_CHUNK_SIZE
+        return max(1, min(workers, chunk_count))
+
+    def _dedupe_results(self, results: list[dict[str, object]]) -> list[dict[str, object]]:
+        unique_by_key: dict[tuple[object, ...], dict[str, object]] = {}
+        for result in results:
+            key = self._result_fingerprint(result)
+            existing = unique_by_key.get(key)
+            if not existing:
+                unique_by_key[key] = result
+                continue
+            survivor = result if self._result_rank(result) > self._result_rank(existing) else existing
+            if (result.get("crossFile") or existing.get("crossFile")) and not survivor.get("crossFile"):
+                survivor = {**survivor, "crossFile": True}
+            unique_by_key[key] = survivor
+        return list(unique_by_key.values())
+
+    def _result_fingerprint(self, result: dict[str, object]) -> tuple[object, ...]:
+        family = self._result_family(result)
+        if family in {"SQL", "COMMAND", "CODE_EXEC", "FILE", "DESERIALIZE", "CALLBACK"}:
+            return (
+                result.get("absolutePath"),
+                result.get("line"),
+                family,
+            )
+        match = self._normalize_match_text(str(result.get("match") or ""))
+        if not match:
+            match = self._normalize_match_text(str(result.get("description") or ""))
+        return (
+            result.get("absolutePath"),
+            result.get("line"),
+            family,
+            match,
+        )
+
+    def _normalize_match_text(self, value: str) -> str:
+        value = re.sub(r"\s+", " ", value).strip()
+        return value[:240]
+
+    def _result_rank(self, result: dict[str, object]) -> tuple[int, int]:
+        severity_rank = {
+            "Critical": 4,
+            "High": 3,
+            "Medium": 2,
+            "Low": 1,
+            "Info": 0,
+        }.get(str(result.get("severity") or ""), 0)
+        result_type = str(result.get("type") or "")
+        type_rank = {
+            "TaintAnalysis": 4,
+            "RouteAuthAnalysis": 3,
+            "ASTAnalysis": 2,
+            "StaticAnalysis": 1,
+        }.get(result_type, 0)
+        rule_id = str(result.get("ruleId") or "")
+        if rule_id.endswith("_TAINT") or "_TAINT" in rule_id:
+            type_rank = max(type_rank, 4)
+        return severity_rank, type_rank
+
+    def _result_family(self, result: dict[str, object]) -> str:
+        rule_id = str(result.get("ruleId") or "").upper()
+        rule_name = str(result.get("ruleName") or "").upper()
+        text = f"{rule_id} {rule_name}"
+        families = {
+            "SQL": ("SQL", "MYSQL", "PDO", "QUERY"),
+            "CODE_EXEC": ("CODE_EXEC", "EVAL", "ASSERT", "PREG_REPLACE", "代码执行"),
+            "COMMAND": ("COMMAND", "EXEC", "SYSTEM", "SHELL", "命令"),
+            "FILE": ("FILE", "INCLUDE", "READ", "UPLOAD", "文件"),
+            "DESERIALIZE": ("UNSERIALIZE", "DESERIAL", "反序列化"),
+            "CALLBACK": ("CALLBACK", "CALL_USER_FUNC", "动态函数"),
+            "XSS": ("XSS", "CROSS_SITE", "跨站"),
+            "SSRF": ("SSRF", "CURL", "URL"),
+            "AUTH": ("AUTH", "ACCESS", "鉴权", "访问控制"),
+        }
+        for family, markers in families.items():
+            if any(marker in text for marker in markers):
+                return family
+        return rule_id or "UNKNOWN"
+
+    def _normalize_vuln(self, project: Path, file_path: Path, vuln: dict) -> dict[str, object]:
+        return {
+            "type": vuln.get("type", ""),
+            "ruleId": vuln.get("rule_id", "未知"),
+            "ruleName": vuln.get("rule_name", "未知规则"),
+            "severity": vuln.get("severity", "未知"),
+            "file": str(file_path.relative_to(project)),
+            "line": int(vuln.get("line") or 0),
+            "description": vuln.get("description", ""),
+            "match": vuln.get("match", ""),
+            "details": vuln.get("details", {}),
+            "absolutePath": str(file_path),
+        }
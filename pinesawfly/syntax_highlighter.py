@@ -2,24 +2,11 @@
 
 import html
 import re
-from functools import lru_cache
 from pathlib import Path
 
-from tree_sitter import Language, Node, Parser
+from tree_sitter import Node, Tree
 
-import tree_sitter_go
-import tree_sitter_java
-import tree_sitter_lua
-import tree_sitter_php
-import tree_sitter_python
-
-SUPPORTED_AST_LANGUAGES = {
-    ".php": "php",
-    ".py": "python",
-    ".java": "java",
-    ".lua": "lua",
-    ".go": "go",
-}
+from modules.analysis_context import SUPPORTED_AST_LANGUAGES, AnalysisContext, parser_for
 
 PHP_BUILTINS = {
     "echo", "print", "isset", "empty", "unset", "include", "include_once", "require", "require_once",
@@ -108,6 +95,7 @@ SCOPE_STYLES = {
     "js.function": "color:#DCDCAA;",
 }
 
+PHP_TAG = re.compile(r"<\?(?:php|=)?|\?>", re.IGNORECASE)
 HTML_BLOCK = re.compile(r"(?is)<(?P<name>script|style)\b[^>]*>.*?</(?P=name)\s*>")
 HTML_TOKEN = re.compile(r"(?P<comment><!--[\s\S]*?-->)|(?P<tag></?[A-Za-z][A-Za-z0-9:-]*|/?>)|(?P<string>\"(?:\\.|[^\"])*\"|'(?:\\.|[^'])*')|(?P<attr>\b[A-Za-z_:][-A-Za-z0-9_:.]*(?=\s*=))|(?P<number>\b\d+(?:\.\d+)?\b)")
 CSS_TOKEN = re.compile(r"(?P<comment>/\*[\s\S]*?\*/)|(?P<string>\"(?:\\.|[^\"])*\"|'(?:\\.|[^'])*')|(?P<number>\b\d+(?:\.\d+)?(?:px|em|rem|vh|vw|%)?\b)|(?P<keyword>\b(?:color|background|display|position|grid|flex|margin|padding|border|width|height|font|font-family|font-size|line-height|transform|transition|animation|opacity|z-index)\b)|(?P<selector>[.#]?[A-Za-z_-][A-Za-z0-9_-]*(?=\s*\{))|(?P<operator>[{}:;,>+~])", re.IGNORECASE)
@@ -115,19 +103,22 @@ JS_TOKEN = re.compile(r"(?P<comment>//[^\n]*|/\*[\s\S]*?\*/)|(?P<string>`(?:\\.|
 
 
 def highlight_code(content: str, file_path: str) -> str:
-    extension = Path(file_path).suffix.lower()
-    language = SUPPORTED_AST_LANGUAGES.get(extension)
-    if language == "php":
-        return highlight_php_document(content)
-    if language:
-        return highlight_ast(content, language)
+    return highlight_context(AnalysisContext.from_text(content, file_path))
+
+
+def highlight_context(context: AnalysisContext) -> str:
+    extension = Path(context.path).suffix.lower()
+    if context.language == "php" and not PHP_TAG.search(context.content):
+        return highlight_ast(context.content, "php_only")
+    if context.language:
+        return highlight_tree(context.tree, context.source, context.language)
     if extension in {".html", ".htm"}:
-        return highlight_html(content)
+        return highlight_html(context.content)
     if extension == ".css":
-        return highlight_regex(content, CSS_TOKEN, css_scope)
+        return highlight_regex(context.content, CSS_TOKEN, css_scope)
     if extension in {".js", ".ts"}:
-        return highlight_regex(content, JS_TOKEN, js_scope)
-    return preserve(content)
+        return highlight_regex(context.content, JS_TOKEN, js_scope)
+    return preserve(context.content)
 
 
 def preserve(value: str) -> str:
@@ -141,47 +132,21 @@ def emit(value: str, scope: str | None = None) -> str:
     return f'<span style="{SCOPE_STYLES.get(scope, "color:#49454F;")}">{escaped}</span>'
 
 
-@lru_cache(maxsize=None)
-def parser_for(language: str) -> Parser:
-    factories = {
-        "php": tree_sitter_php.language_php,
-        "php_only": tree_sitter_php.language_php_only,
-        "python": tree_sitter_python.language,
-        "java": tree_sitter_java.language,
-        "lua": tree_sitter_lua.language,
-        "go": tree_sitter_go.language,
-    }
-    return Parser(Language(factories[language]()))
-
-
-def highlight_php_document(content: str) -> str:
-    tag_pattern = re.compile(r"<\?(?:php|=)?|\?>", re.IGNORECASE)
-    if not tag_pattern.search(content):
-        return highlight_ast(content, "php_only")
-    pieces: list[str] = []
-    position = 0
-    in_php = False
-    for match in tag_pattern.finditer(content):
-        if match.start() > position:
-            chunk = content[position:match.start()]
-            pieces.append(highlight_ast(chunk, "php_only") if in_php else highlight_html(chunk))
-        pieces.append(emit(match.group(0), "punctuation.definition.tag"))
-        in_php = not match.group(0).startswith("?>")
-        position = match.end()
-    if position < len(content):
-        pieces.append(highlight_ast(content[position:], "php_only") if in_php else highlight_html(content[position:]))
-    return "".join(pieces)
-
-
 def highlight_ast(content: str, language: str) -> str:
     source = content.encode("utf-8")
-    tree = parser_for(language).parse(source)
+    return highlight_tree(parser_for(language).parse(source), source, language)
+
+
+def highlight_tree(tree: Tree, source: bytes, language: str) -> str:
     spans: list[tuple[int, int, str]] = []
     collect_spans(tree.root_node, source, language, spans)
     return render_spans(source, spans)
 
 
 def collect_spans(node: Node, source: bytes, language: str, spans: list[tuple[int, int, str]]) -> None:
+    if language == "php" and node.type == "text":
+        spans.append((node.start_byte, node.end_byte, "html"))
+        return
     scope = scope_for_node(node, source, language)
     if scope and node.start_byte < node.end_byte and (not node.children or node.type in {"comment", "line_comment", "block_comment", "string_content", "heredoc_start", "heredoc_end", "escape_sequence"}):
         spans.append((node.start_byte, node.end_byte, scope))
@@ -199,7 +164,8 @@ def render_spans(source: bytes, spans: list[tuple[int, int, str]]) -> str:
             continue
         if start > position:
             pieces.append(preserve(source[position:start].decode("utf-8", "replace")))
-        pieces.append(emit(source[start:end].decode("utf-8", "replace"), scope))
+        text = source[start:end].decode("utf-8", "replace")
+        pieces.append(highlight_html(text) if scope == "html" else emit(text, scope))
         position = end
     if position < len(source):
         pieces.append(preserve(source[position:].decode("utf-8", "replace")))
@@ -219,7 +185,7 @@ def scope_for_node(node: Node, source: bytes, language: str) -> str | None:
         return "string"
     if is_number_node(node):
         return "constant.numeric"
-    if node.type == "php_tag":
+    if node.type in {"php_tag", "php_end_tag"}:
         return "punctuation.definition.tag"
     if text in {"->", "::"}:
         return "punctuation.accessor"
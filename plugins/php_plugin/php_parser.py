@@ -6,7 +6,7 @@ from tree_sitter import Language, Parser, Tree
 import tree_sitter_php
 
 from core.exception_handler import safe_operation
-from modules.file_module import FileModule
+from modules.analysis_context import AnalysisContext
 
 
 @dataclass(frozen=True)
@@ -14,6 +14,7 @@ class PHPAst:
     tree: Tree
     source: bytes
     content: str
+    context: AnalysisContext
 
 
 class PHPParser:
@@ -22,10 +23,12 @@ class PHPParser:
 
     @safe_operation
     def parse_file(self, file_path: str) -> PHPAst:
-        content = FileModule.read_file_with_encoding(file_path)
-        return self.parse_code(content)
+        return self.parse_context(AnalysisContext.from_file(file_path))
 
     @safe_operation
     def parse_code(self, code: str) -> PHPAst:
-        source = code.encode("utf-8", errors="replace")
-        return PHPAst(tree=self.parser.parse(source), source=source, content=code)
+        return self.parse_context(AnalysisContext.from_text(code))
+
+    def parse_context(self, context: AnalysisContext) -> PHPAst:
+        tree = context.tree if context.language == "php" else self.parser.parse(context.source)
+        return PHPAst(tree=tree, source=context.source, content=context.content, context=context)
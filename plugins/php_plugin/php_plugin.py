@@ -1,19 +1,29 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, TYPE_CHECKING
+from pathlib import Path
+from typing import Any, Callable, Collection, Iterable, Mapping, TYPE_CHECKING
 
 from core.exception_handler import safe_operation
 from core.plugin_interface import ScannerPluginInterface
+from modules.file_module import FileModule, LRUCache
 
-from .taint_analyzer import TaintAnalyzer
+from .project_taint import ProjectTaintSolver, SolveResult, SolveTask
+from .taint_analyzer import FunctionSummary, TaintAnalyzer, TaintUnit
 from .route_auth_analyzer import ProjectContext, ProjectContextBuilder, RouteAuthAnalyzer
 
 if TYPE_CHECKING:
-    from .php_parser import PHPParser
+    from modules.analysis_context import AnalysisContext
+    from modules.rule_budget import AnalysisTruncation
+    from modules.project_walker import ProjectInventory
+    from modules.scan_control import ScanControl
+
+    from .php_parser import PHPAst, PHPParser
 
 logger = logging.getLogger(__name__)
 
+PROJECT_AST_CACHE_SIZE = 64
+
 
 class PHPPlugin(ScannerPluginInterface):
     def __init__(self):
@@ -25,6 +35,10 @@ class PHPPlugin(ScannerPluginInterface):
         self.taint_analyzer: TaintAnalyzer | None = None
         self.project_context: ProjectContext | None = None
         self.route_auth_analyzer: RouteAuthAnalyzer | None = None
+        self.project_path: str | None = None
+        self.project_unit: TaintUnit | None = None
+        self.project_asts: LRUCache[PHPAst] = LRUCache(PROJECT_AST_CACHE_SIZE)
+        self.project_truncations: list[AnalysisTruncation] = []
         self.initialized = False
 
     @property
@@ -43,13 +57,26 @@ class PHPPlugin(ScannerPluginInterface):
     def supported_languages(self) -> list[str]:
         return self._supported_languages
 
-    def initialize(self, project_path: str | None = None) -> bool:
+    @property
+    def cache_version(self) -> str:
+        context = self.project_context
+        if not context:
+            return self.version
+        return f"{self.version}:{int(context.is_mvc)}:{','.join(context.framework_hints)}"
+
+    def initialize(
+        self,
+        project_path: str | None = None,
+        inventory: ProjectInventory | None = None,
+        control: ScanControl | None = None,
+    ) -> bool:
         try:
             from .php_parser import PHPParser
 
             self.parser = PHPParser()
-            self.taint_analyzer = TaintAnalyzer()
-            self.project_context = ProjectContextBuilder().build(project_path)
+            self.project_path = project_path
+            self.taint_analyzer = TaintAnalyzer(control)
+            self.project_context = ProjectContextBuilder().build(project_path, inventory)
             self.route_auth_analyzer = RouteAuthAnalyzer(self.project_context)
             self.initialized = True
             logger.info("PHP 插件 %s 初始化成功", self.name)
@@ -78,10 +105,16 @@ class PHPPlugin(ScannerPluginInterface):
             logger.error("插件未初始化")
             return []
 
+        self.project_unit = None
         try:
             logger.info("开始扫描文件: %s", file_path)
-            ast = self.parser.parse_file(file_path)
+            context = (options or {}).get("context")
+            ast = self.parser.parse_context(context) if context else self.parser.parse_file(file_path)
             results = self.taint_analyzer.analyze(ast, file_path)
+            self.project_unit = self.taint_analyzer.project_unit()
+            key = FileModule.file_key(file_path) if self.project_unit.imports and not (options or {}).get("snapshot") else None
+            if key:
+                self.project_asts.put(key, ast)
             if self.route_auth_analyzer:
                 results.extend(self.route_auth_analyzer.analyze(ast, file_path))
             logger.info("文件 %s 扫描完成，发现 %s 个问题", file_path, len(results))
@@ -90,6 +123,50 @@ class PHPPlugin(ScannerPluginInterface):
             logger.error("扫描文件 %s 时出错: %s", file_path, exc)
             return []
 
+    def take_truncations(self) -> list[AnalysisTruncation]:
+        truncations, self.project_truncations = self.project_truncations, []
+        return (self.taint_analyzer.take_truncations() if self.taint_analyzer else []) + truncations
+
+    def take_project_unit(self) -> TaintUnit | None:
+        unit, self.project_unit = self.project_unit, None
+        return unit
+
+    def analyze_project_file(
+        self,
+        file_path: str,
+        external: Mapping[str, FunctionSummary],
+        context: AnalysisContext | None = None,
+    ) -> tuple[TaintUnit, list[dict[str, Any]], list[AnalysisTruncation]] | None:
+        if not self.initialized or not self.parser or not self.taint_analyzer:
+            return None
+        key = FileModule.file_key(file_path) if not context else None
+        try:
+            if context:
+                ast = self.parser.parse_context(context)
+            else:
+                ast = (self.project_asts.get(key) if key else None) or self.parser.parse_file(file_path)
+            results = self.taint_analyzer.analyze(ast, file_path, external)
+        except Exception as exc:
+            logger.error("跨文件污点分析 %s 时出错: %s", file_path, exc)
+            self.taint_analyzer.take_truncations()
+            return None
+        return self.taint_analyzer.project_unit(), results, self.taint_analyzer.take_truncations()
+
+    def solve_project(
+        self,
+        files: list[str],
+        units: Mapping[str, TaintUnit],
+        run: Callable[[list[SolveTask]], Iterable[SolveResult]],
+        cache_path: Path | None = None,
+        version: str = "",
+        truncated: Collection[str] = (),
+    ) -> dict[str, list[dict[str, Any]]]:
+        solver = ProjectTaintSolver(self.project_path or ".", run, cache_path, version)
+        findings = solver.solve([file_path for file_path in files if file_path.lower().endswith(".php")], units, truncated)
+        self.project_truncations.extend(solver.truncations)
+        logger.info("跨文件污点分析 %s 轮，重新分析 %s 个文件，新增 %s 个问题", solver.rounds, solver.solved_files, sum(map(len, findings.values())))
+        return findings
+
     def get_rules(self) -> list[dict[str, Any]]:
         return []
 
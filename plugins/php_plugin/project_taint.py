@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Collection, Iterable, Mapping
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from modules.rule_budget import AnalysisTruncation
+from modules.scan_manifest import ScanManifest, fingerprint
+
+from .taint_analyzer import FunctionSummary, ParameterSink, TaintUnit, ValueState
+
+logger = logging.getLogger(__name__)
+
+PROJECT_TAINT_VERSION = "2"
+MAX_SOLVE_ROUNDS = 8
+
+SolveTask = tuple[str, dict[str, FunctionSummary]]
+SolveResult = tuple[str, TaintUnit, list[dict[str, Any]], list[AnalysisTruncation]]
+
+
+def state_from_json(data: Mapping[str, Any]) -> ValueState:
+    return ValueState(**{key: tuple(value) if isinstance(value, list) else value for key, value in data.items()})
+
+
+def summary_from_json(data: Mapping[str, Any]) -> FunctionSummary:
+    return FunctionSummary(
+        name=data["name"],
+        file_path=data["file_path"],
+        parameters=tuple(data["parameters"]),
+        variadic=data["variadic"],
+        sinks=tuple(ParameterSink(**{**sink, "transforms": tuple(sink["transforms"])}) for sink in data["sinks"]),
+        returns=state_from_json(data["returns"]),
+    )
+
+
+def unit_to_json(unit: TaintUnit) -> dict[str, Any]:
+    return {
+        "exports": {key: asdict(summary) for key, summary in unit.exports.items()},
+        "imports": list(unit.imports),
+        "findings": sorted(unit.findings),
+    }
+
+
+def unit_from_json(data: Mapping[str, Any]) -> TaintUnit:
+    return TaintUnit(
+        exports={key: summary_from_json(summary) for key, summary in data["exports"].items()},
+        imports=tuple(data["imports"]),
+        findings=frozenset((rule_id, line, match) for rule_id, line, match in data["findings"]),
+    )
+
+
+def has_effect(summary: FunctionSummary) -> bool:
+    return bool(summary.sinks) or summary.returns.tainted
+
+
+@dataclass
+class SolvedFile:
+    exports: Mapping[str, FunctionSummary]
+    fingerprints: dict[str, str]
+    dependencies: dict[str, str | None] | None = None
+    findings: list[dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def local(cls, unit: TaintUnit) -> SolvedFile:
+        solved = cls(exports={}, fingerprints={})
+        solved.update(unit.exports, [])
+        return solved
+
+    def update(self, exports: Mapping[str, FunctionSummary], findings: list[dict[str, Any]]) -> None:
+        self.exports = exports
+        self.fingerprints = {key: fingerprint(asdict(summary)) for key, summary in exports.items()}
+        self.findings = findings
+
+    def to_json(self, unit: TaintUnit) -> dict[str, Any]:
+        return {
+            "unit": unit_to_json(unit),
+            "exports": {key: asdict(summary) for key, summary in self.exports.items()},
+            "fingerprints": self.fingerprints,
+            "dependencies": self.dependencies,
+            "findings": self.findings,
+        }
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> SolvedFile:
+        return cls(
+            exports={key: summary_from_json(summary) for key, summary in data["exports"].items()},
+            fingerprints=dict(data["fingerprints"]),
+            dependencies=data["dependencies"],
+            findings=list(data["findings"]),
+        )
+
+
+class ProjectTaintSolver:
+    def __init__(
+        self,
+        project_path: str | Path,
+        run: Callable[[list[SolveTask]], Iterable[SolveResult]],
+        cache_path: Path | None = None,
+        version: str = "",
+    ) -> None:
+        self.project = Path(project_path)
+        self.run = run
+        self.cache_path = cache_path
+        self.version = version
+        self.rounds = 0
+        self.solved_files = 0
+        self.truncations: list[AnalysisTruncation] = []
+
+    def solve(self, files: list[str], units: Mapping[str, TaintUnit], truncated: Collection[str] = ()) -> dict[str, list[dict[str, Any]]]:
+        cache = ScanManifest(self.project, PROJECT_TAINT_VERSION, self.version, self.cache_path).load() if self.cache_path else None
+        units = dict(units)
+        incomplete = set(truncated)
+        self.truncations = []
+        solved: dict[str, SolvedFile] = {}
+        for file_path in files:
+            payload = cache.cached_findings(file_path) if cache else None
+            if payload:
+                units[file_path] = unit_from_json(payload["unit"])
+                solved[file_path] = SolvedFile.from_json(payload)
+        missing = [(file_path, {}) for file_path in files if file_path not in units]
+        if missing:
+            logger.info("为 %s 个 PHP 文件生成函数摘要", len(missing))
+            for file_path, unit, _results, truncations in self.run(missing):
+                units[file_path] = unit
+                self._record_truncations(file_path, truncations, incomplete)
+        for file_path, unit in units.items():
+            solved.setdefault(file_path, SolvedFile.local(unit))
+
+        index = self._index(solved)
+        dirty = {file_path for file_path, unit in units.items() if solved[file_path].dependencies != self._dependencies(index, unit)}
+        self.rounds = self.solved_files = 0
+        while dirty:
+            if self.rounds == MAX_SOLVE_ROUNDS:
+                logger.warning("跨文件污点分析 %s 轮后仍未收敛，剩余 %s 个文件使用上一轮结果", MAX_SOLVE_ROUNDS, len(dirty))
+                break
+            self.rounds += 1
+            tasks: list[SolveTask] = []
+            for file_path in sorted(dirty):
+                dependencies = self._dependencies(index, units[file_path])
+                solved[file_path].dependencies = dependencies
+                external = {key: index[key][0] for key, value in dependencies.items() if value is not None}
+                if external:
+                    tasks.append((file_path, external))
+                else:
+                    solved[file_path].update(units[file_path].exports, [])
+            self.solved_files += len(tasks)
+            for file_path, unit, results, truncations in self.run(tasks) if tasks else ():
+                self._record_truncations(file_path, truncations, incomplete)
+                local = units[file_path].findings
+                solved[file_path].update(
+                    unit.exports,
+                    [result for result in results if (result["rule_id"], result["line"], result["match"]) not in local],
+                )
+            updated = self._index(solved)
+            changed = {key for key in index.keys() | updated.keys() if self._dependency(index, key) != self._dependency(updated, key)}
+            index = updated
+            dirty = {file_path for file_path, unit in units.items() if changed.intersection(unit.imports)}
+
+        if cache:
+            for file_path, unit in units.items():
+                if file_path not in incomplete:
+                    cache.record(file_path, solved[file_path].to_json(unit))
+            cache.save()
+        return {file_path: state.findings for file_path, state in solved.items() if state.findings}
+
+    def _record_truncations(self, file_path: str, truncations: list[AnalysisTruncation], incomplete: set[str]) -> None:
+        if truncations:
+            incomplete.add(file_path)
+            self.truncations.extend(truncations)
+
+    def _index(self, solved: Mapping[str, SolvedFile]) -> dict[str, tuple[FunctionSummary, str]]:
+        index: dict[str, tuple[FunctionSummary, str]] = {}
+        ambiguous: set[str] = set()
+        for state in solved.values():
+            for key, summary in state.exports.items():
+                if key in index:
+                    ambiguous.add(key)
+                index[key] = summary, state.fingerprints[key]
+        for key in ambiguous:
+            del index[key]
+        return index
+
+    def _dependencies(self, index: Mapping[str, tuple[FunctionSummary, str]], unit: TaintUnit) -> dict[str, str | None]:
+        return {key: self._dependency(index, key) for key in unit.imports}
+
+    def _dependency(self, index: Mapping[str, tuple[FunctionSummary, str]], key: str) -> str | None:
+        entry = index.get(key)
+        return entry[1] if entry and has_effect(entry[0]) else None
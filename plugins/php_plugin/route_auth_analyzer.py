@@ -5,6 +5,11 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from tree_sitter import Node
+
+from modules.line_index import LineIndex
+from modules.project_walker import ProjectInventory, walk_project
+
 from .php_parser import PHPAst
 
 
@@ -18,29 +23,31 @@ class ProjectContext:
 
 
 class ProjectContextBuilder:
-    def build(self, project_path: str | Path | None) -> ProjectContext | None:
+    def build(self, project_path: str | Path | None, inventory: ProjectInventory | None = None) -> ProjectContext | None:
         if not project_path:
             return None
         root = Path(project_path)
         if not root.exists():
             return None
+        if inventory is None:
+            inventory = walk_project(root, include_dependencies=True)
 
         hints: list[str] = []
-        if any(root.glob("app/**/controller")) or any(root.glob("application/**/controller")):
+        if inventory.any_match("app/**/controller") or inventory.any_match("application/**/controller"):
             hints.append("controller")
-        if any(root.glob("app/**/config/route.php")) or (root / "route").is_dir() or any(root.glob("route/*.php")):
+        if inventory.any_match("app/**/config/route.php") or inventory.has_dir("route") or inventory.any_match("route/*.php"):
             hints.append("route-config")
-        if any(root.glob("app/**/http/middleware/*.php")) or any(root.glob("application/**/http/middleware/*.php")) or (root / "app" / "middleware.php").is_file():
+        if inventory.any_match("app/**/http/middleware/*.php") or inventory.any_match("application/**/http/middleware/*.php") or inventory.has_file("app/middleware.php"):
             hints.append("middleware")
-        if (root / "thinkphp").is_dir() and (root / "application").is_dir():
+        if inventory.has_dir("thinkphp") and inventory.has_dir("application"):
             hints.append("thinkphp5-layout")
-        if (root / "composer.json").is_file():
+        if inventory.has_file("composer.json"):
             composer = (root / "composer.json").read_text(encoding="utf-8", errors="ignore").lower()
             if any(name in composer for name in ("thinkphp", "laravel", "symfony", "yii")):
                 hints.append("composer-framework")
 
-        has_login = any(root.glob("app/**/http/middleware/*Login*Middleware.php"))
-        has_auth = any(root.glob("app/**/http/middleware/*Auth*Middleware.php"))
+        has_login = inventory.any_match("app/**/http/middleware/*Login*Middleware.php")
+        has_auth = inventory.any_match("app/**/http/middleware/*Auth*Middleware.php")
         return ProjectContext(
             root=root,
             is_mvc=len(hints) >= 2 or (has_login and has_auth),
@@ -74,13 +81,13 @@ class RouteAuthAnalyzer:
             return []
 
         results: list[dict[str, Any]] = []
-        for method, start, body in self._public_methods(content):
+        for method, start, body in self._public_methods(ast):
             if method in not_need_login:
-                risk = self._risky_method_result(file_path, content, method, start, body, unauthenticated=True)
+                risk = self._risky_method_result(file_path, ast.context.lines, method, start, body, unauthenticated=True)
                 if risk:
                     results.append(risk)
             elif method in not_need_auth:
-                risk = self._risky_method_result(file_path, content, method, start, body, unauthenticated=False)
+                risk = self._risky_method_result(file_path, ast.context.lines, method, start, body, unauthenticated=False)
                 if risk:
                     results.append(risk)
         return results
@@ -88,7 +95,7 @@ class RouteAuthAnalyzer:
     def _risky_method_result(
         self,
         file_path: str,
-        content: str,
+        lines: LineIndex,
         method: str,
         start: int,
         body: str,
@@ -100,7 +107,7 @@ class RouteAuthAnalyzer:
         request_source = self.REQUEST_SOURCE.search(body)
         if not request_source:
             return None
-        line = content[: start + sink.start()].count("\n") + 1
+        line = lines.line_at(start + sink.start())
         scope = "免登录" if unauthenticated else "免权限"
         return {
             "type": "RouteAuthAnalysis",
@@ -124,25 +131,31 @@ class RouteAuthAnalyzer:
             return set()
         return set(re.findall(r"['\"]([A-Za-z_][A-Za-z0-9_]*)['\"]", match.group("body")))
 
-    def _public_methods(self, content: str) -> list[tuple[str, int, str]]:
+    def _public_methods(self, ast: PHPAst) -> list[tuple[str, int, str]]:
         methods: list[tuple[str, int, str]] = []
-        for match in re.finditer(r"\bpublic\s+function\s+([A-Za-z_][A-Za-z0-9_]*)\s*\([^)]*\)\s*\{", content):
-            body_start = match.end()
-            body_end = self._matching_brace(content, body_start - 1)
-            if body_end > body_start:
-                methods.append((match.group(1), body_start, content[body_start:body_end]))
+        pending = [ast.tree.root_node]
+        while pending:
+            node = pending.pop()
+            if node.type == "method_declaration":
+                method = self._public_method(ast, node)
+                if method:
+                    methods.append(method)
+            pending.extend(reversed(node.children))
         return methods
 
-    def _matching_brace(self, content: str, open_brace: int) -> int:
-        depth = 0
-        i = open_brace
-        while i < len(content):
-            char = content[i]
-            if char == "{":
-                depth += 1
-            elif char == "}":
-                depth -= 1
-                if depth == 0:
-                    return i
-            i += 1
-        return len(content)
+    def _public_method(self, ast: PHPAst, node: Node) -> tuple[str, int, str] | None:
+        name = node.child_by_field_name("name")
+        body = node.child_by_field_name("body")
+        if not name or not body or body.type != "compound_statement":
+            return None
+        children = node.children
+        keyword = next((index for index, child in enumerate(children) if child.type == "function"), 0)
+        modifier = children[keyword - 1] if keyword else None
+        if not modifier or modifier.type != "visibility_modifier" or ast.source[modifier.start_byte:modifier.end_byte].lower() != b"public":
+            return None
+        body_start = ast.context.char_offset(body.start_byte + 1)
+        body_end = ast.context.char_offset(body.end_byte - 1)
+        if body_end <= body_start:
+            return None
+        method_name = ast.source[name.start_byte:name.end_byte].decode("utf-8", "replace")
+        return method_name, body_start, ast.content[body_start:body_end]
@@ -2,58 +2,169 @@ from __future__ import annotations
 
 import base64
 import binascii
+import bisect
 import logging
+import os
 import re
 import time
-from dataclasses import dataclass, field
-from typing import Any
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import Any, Callable, Iterable, TypeVar
 
 from tree_sitter import Node
 
 from core.exception_handler import safe_operation
+from modules.line_index import LineIndex
+from modules.rule_budget import AnalysisTruncation
+from modules.scan_control import ScanControl
 from .php_parser import PHPAst
 
 logger = logging.getLogger(__name__)
 MAX_ANALYSIS_SECONDS = 2.5
 MAX_ANALYSIS_NODES = 30000
+ANALYSIS_NODES_PER_BYTE = 1.0
+MAX_ANALYSIS_BUDGET_SCALE = 8
+CONTROL_CHECK_INTERVAL = 256
 MAX_STATE_ITEMS = 40
 MAX_LITERAL_VALUES = 12
+FUNCTION_NAME_PATTERN = re.compile(rb"\bfunction\s*&?\s*([A-Za-z_\x80-\xff][A-Za-z0-9_\x80-\xff]*)\s*\(", re.IGNORECASE)
+FUNCTION_TYPES = {"function_definition", "method_declaration"}
+CLASS_LIKE_TYPES = {"class_declaration", "trait_declaration", "interface_declaration", "enum_declaration"}
 
+Item = TypeVar("Item")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ValueState:
     tainted: bool = False
     suspicious_callable: bool = False
     sql_template: bool = False
     upload_file_entry: bool = False
-    sources: list[str] = field(default_factory=list)
-    transforms: list[str] = field(default_factory=list)
-    literal_values: list[str] = field(default_factory=list)
-
-    def merge(self, other: "ValueState") -> "ValueState":
+    sources: tuple[str, ...] = ()
+    transforms: tuple[str, ...] = ()
+    literal_values: tuple[str, ...] = ()
+    parameters: tuple[int, ...] = ()
+
+    @property
+    def controlled(self) -> bool:
+        return self.tainted or bool(self.parameters)
+
+    def merge(self, other: ValueState) -> ValueState:
+        if other is EMPTY or other is self:
+            return self
+        if self is EMPTY:
+            return other
+        sources = merge_limited(self.sources, other.sources, MAX_STATE_ITEMS)
+        transforms = merge_limited(self.transforms, other.transforms, MAX_STATE_ITEMS)
+        literal_values = merge_limited(self.literal_values, other.literal_values, MAX_LITERAL_VALUES)
+        parameters = merge_limited(self.parameters, other.parameters, MAX_STATE_ITEMS)
+        if (
+            sources is self.sources
+            and transforms is self.transforms
+            and literal_values is self.literal_values
+            and parameters is self.parameters
+            and self.tainted >= other.tainted
+            and self.suspicious_callable >= other.suspicious_callable
+            and self.sql_template >= other.sql_template
+            and self.upload_file_entry >= other.upload_file_entry
+        ):
+            return self
         return ValueState(
             tainted=self.tainted or other.tainted,
             suspicious_callable=self.suspicious_callable or other.suspicious_callable,
             sql_template=self.sql_template or other.sql_template,
             upload_file_entry=self.upload_file_entry or other.upload_file_entry,
-            sources=self._merge_limited(self.sources, other.sources, MAX_STATE_ITEMS),
-            transforms=self._merge_limited(self.transforms, other.transforms, MAX_STATE_ITEMS),
-            literal_values=self._merge_limited(self.literal_values, other.literal_values, MAX_LITERAL_VALUES),
+            sources=sources,
+            transforms=transforms,
+            literal_values=literal_values,
+            parameters=parameters,
         )
 
-    @staticmethod
-    def _merge_limited(left: list[str], right: list[str], limit: int) -> list[str]:
-        values = list(left[:limit])
-        for item in right:
-            if item not in values:
-                values.append(item)
-                if len(values) >= limit:
-                    break
-        return values
+    def with_transforms(self, *transforms: str) -> ValueState:
+        merged = merge_limited(self.transforms, transforms, MAX_STATE_ITEMS)
+        return self if merged is self.transforms else replace(self, transforms=merged)
+
+
+EMPTY = ValueState()
+
+
+@dataclass(frozen=True, slots=True)
+class ParameterSink:
+    parameter: int
+    rule_id: str
+    rule_name: str
+    severity: str
+    line: int
+    match: str
+    transforms: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class FunctionSummary:
+    name: str
+    file_path: str
+    parameters: tuple[str, ...]
+    variadic: bool
+    sinks: tuple[ParameterSink, ...]
+    returns: ValueState
+
+
+@dataclass(frozen=True, slots=True)
+class TaintUnit:
+    exports: Mapping[str, FunctionSummary]
+    imports: tuple[str, ...]
+    findings: frozenset[tuple[str, int, str]]
+
+
+@dataclass(frozen=True, slots=True)
+class NamespaceScope:
+    start: int
+    end: int
+    name: str
+    classes: Mapping[str, str]
+    functions: Mapping[str, str]
+
+
+GLOBAL_NAMESPACE = NamespaceScope(start=0, end=0, name="", classes={}, functions={})
+
+
+@dataclass
+class FunctionScope:
+    class_name: str | None
+    global_variables: dict[str, ValueState]
+    returns: ValueState = EMPTY
+    sinks: list[ParameterSink] = field(default_factory=list)
+
+
+def merge_limited(left: tuple[Item, ...], right: tuple[Item, ...], limit: int) -> tuple[Item, ...]:
+    if not right or len(left) >= limit:
+        return left
+    if not left and len(right) <= limit:
+        return right
+    seen = set(left)
+    values = list(left)
+    for item in right:
+        if item not in seen:
+            seen.add(item)
+            values.append(item)
+            if len(values) >= limit:
+                break
+    return left if len(values) == len(left) else tuple(values)
+
+
+def unique_limited(values: Iterable[str], limit: int) -> tuple[str, ...]:
+    return merge_limited((), tuple(dict.fromkeys(values)), limit)
+
+
+def analysis_budget(source_size: int) -> tuple[int, float]:
+    scale = min(max(source_size * ANALYSIS_NODES_PER_BYTE / MAX_ANALYSIS_NODES, 1.0), MAX_ANALYSIS_BUDGET_SCALE)
+    return int(MAX_ANALYSIS_NODES * scale), MAX_ANALYSIS_SECONDS * scale
 
 
 class TaintAnalyzer:
-    def __init__(self):
+    def __init__(self, control: ScanControl | None = None):
+        self.control = control
         self.superglobals = {"$_GET", "$_POST", "$_REQUEST", "$_COOKIE", "$_SERVER", "$_FILES"}
         self.client_server_keys = {
             "HTTP_HOST",
@@ -100,43 +211,143 @@ class TaintAnalyzer:
         self.sql_escapers = {"mysql_real_escape_string", "mysqli_real_escape_string", "addslashes"}
         self.strong_sql_escapers = {"mysql_real_escape_string", "mysqli_real_escape_string"}
         self.dangerous_callable_names = self.code_sinks | self.command_sinks | {"preg_replace"}
+        self.builtin_functions = (
+            self.dangerous_callable_names
+            | self.sql_sinks
+            | self.file_sinks
+            | self.deserialize_sinks
+            | self.callback_sinks
+            | self.decode_functions
+            | self.sanitizers
+            | self.sql_value_normalizers
+            | self.sql_escapers
+            | {"move_uploaded_file", "cookie"}
+        )
         self.suspicious_command_pattern = re.compile(
             r"\b(wget|curl|nc|ncat|netcat|bash|sh|php|python|perl|ruby|powershell|cmd|certutil|whoami|id)\b|"
             r"base64_decode|hex2bin|gzuncompress|gzinflate|str_rot13|/bin/sh|/bin/bash|\be\s+/bin/",
             re.IGNORECASE,
         )
+        self.statement_handlers: dict[str, Callable[[Node], ValueState]] = {
+            "expression_statement": self._process_expression_statement,
+            "assignment_expression": self._process_assignment,
+            "if_statement": self._process_if_statement,
+            "switch_statement": self._process_switch_statement,
+            "case_statement": self._process_case_statement,
+            "default_statement": self._process_case_statement,
+            "function_call_expression": self._eval_function_call,
+            "member_call_expression": self._eval_member_call,
+            "echo_statement": partial(self._eval_output_statement, name="echo"),
+            "print_intrinsic": partial(self._eval_output_statement, name="print"),
+            "include_expression": self._eval_include_expression,
+            "include_once_expression": self._eval_include_expression,
+            "require_expression": self._eval_include_expression,
+            "require_once_expression": self._eval_include_expression,
+            "scoped_call_expression": self._eval_scoped_call,
+            "function_definition": self._process_function_definition,
+            "method_declaration": self._process_function_definition,
+            "anonymous_function": self._process_closure,
+            "return_statement": self._process_return,
+            "global_declaration": self._process_global_declaration,
+        }
+        self.expression_handlers: dict[str, Callable[[Node], ValueState]] = {
+            "variable_name": self._eval_variable,
+            "subscript_expression": self._eval_subscript,
+            "assignment_expression": self._process_node,
+            "conditional_expression": self._eval_conditional_expression,
+            "cast_expression": self._eval_cast_expression,
+            "function_call_expression": self._eval_function_call,
+            "member_call_expression": self._eval_member_call,
+            "encapsed_string": self._eval_string,
+            "string": self._eval_string,
+            "string_literal": self._eval_string,
+            "binary_expression": self._eval_binary_expression,
+            "scoped_call_expression": self._eval_scoped_call,
+            "anonymous_function": self._process_closure,
+            "include_expression": self._eval_include_expression,
+            "include_once_expression": self._eval_include_expression,
+            "require_expression": self._eval_include_expression,
+            "require_once_expression": self._eval_include_expression,
+        }
         self.variables: dict[str, ValueState] = {}
+        self.scope: FunctionScope | None = None
+        self.functions: dict[str, Node] = {}
+        self.namespaces: list[NamespaceScope] = []
+        self.namespace_starts: list[int] = []
+        self.summaries: dict[int, FunctionSummary | None] = {}
+        self.external: Mapping[str, FunctionSummary] = {}
+        self.imports: set[str] = set()
         self.results: list[dict[str, Any]] = []
         self.validated_expression_stack: list[set[str]] = []
         self.source = b""
+        self.lines: LineIndex | None = None
         self.file_path = ""
         self.started_at = 0.0
         self.visited_nodes = 0
+        self.node_budget = MAX_ANALYSIS_NODES
+        self.time_budget = MAX_ANALYSIS_SECONDS
+        self.truncations: list[AnalysisTruncation] = []
 
     @safe_operation
-    def analyze(self, ast: PHPAst, file_path: str) -> list[dict[str, Any]]:
+    def analyze(self, ast: PHPAst, file_path: str, external: Mapping[str, FunctionSummary] | None = None) -> list[dict[str, Any]]:
         self.variables = {}
+        self.scope = None
+        self.summaries = {}
+        self.external = external or {}
+        self.imports = set()
         self.results = []
         self.validated_expression_stack = []
         self.source = ast.source
+        self.lines = None
         self.file_path = file_path
         self.started_at = time.perf_counter()
         self.visited_nodes = 0
+        self.node_budget, self.time_budget = analysis_budget(len(ast.source))
+        self.namespaces = self._index_namespaces(ast.tree.root_node)
+        self.namespace_starts = [namespace.start for namespace in self.namespaces]
+        self.functions = self._index_functions(ast.tree.root_node)
         try:
             self._process_block(ast.tree.root_node)
         except TimeoutError as exc:
-            logger.warning("跳过文件 %s: %s", file_path, exc)
-            return []
+            self._truncate(str(exc))
+        except RecursionError:
+            self._truncate("语法树嵌套超过递归深度限制")
         self.results = self._dedupe_results(self.results)
         logger.info("污点分析在文件 %s 中发现 %s 个问题", file_path, len(self.results))
         return self.results
 
+    def _truncate(self, reason: str) -> None:
+        logger.warning("污点分析在文件 %s 中提前结束，保留已发现的 %s 个问题: %s", self.file_path, len(self.results), reason)
+        self.truncations.append(AnalysisTruncation(
+            analyzer="污点分析",
+            file_path=self.file_path,
+            reason=reason,
+            visited_nodes=min(self.visited_nodes, self.node_budget),
+            node_budget=self.node_budget,
+            elapsed=time.perf_counter() - self.started_at,
+        ))
+
+    def project_unit(self) -> TaintUnit:
+        exports = {
+            key: summary
+            for key, node in self.functions.items()
+            if (summary := self.summaries.get(node.start_byte)) is not None and self._declared_unconditionally(node)
+        }
+        findings = frozenset((result["rule_id"], result["line"], result["match"]) for result in self.results)
+        return TaintUnit(exports=exports, imports=tuple(sorted(self.imports)), findings=findings)
+
+    def take_truncations(self) -> list[AnalysisTruncation]:
+        truncations, self.truncations = self.truncations, []
+        return truncations
+
     def _check_budget(self) -> None:
         self.visited_nodes += 1
-        if self.visited_nodes > MAX_ANALYSIS_NODES:
-            raise TimeoutError(f"污点分析节点数超过限制: {MAX_ANALYSIS_NODES}")
-        if self.started_at and time.perf_counter() - self.started_at > MAX_ANALYSIS_SECONDS:
-            raise TimeoutError(f"污点分析超过 {MAX_ANALYSIS_SECONDS:.0f} 秒")
+        if self.control and self.visited_nodes % CONTROL_CHECK_INTERVAL == 0:
+            self.started_at += self.control.checkpoint()
+        if self.visited_nodes > self.node_budget:
+            raise TimeoutError(f"节点数超过限制 {self.node_budget}")
+        if self.started_at and time.perf_counter() - self.started_at > self.time_budget:
+            raise TimeoutError(f"分析超过 {self.time_budget:.1f} 秒")
 
     def _process_block(self, node: Node) -> None:
         self._check_budget()
@@ -147,143 +358,388 @@ class TaintAnalyzer:
 
     def _process_node(self, node: Node) -> ValueState:
         self._check_budget()
-        if node.type == "expression_statement":
-            state = ValueState()
-            for child in node.children:
-                state = state.merge(self._process_node(child))
-            return state
+        handler = self.statement_handlers.get(node.type)
+        if handler:
+            return handler(node)
+        return self._merge_named_children(node, self._process_node, self.statement_handlers)
 
-        if node.type == "assignment_expression":
-            right = self._child_by_field(node, "right")
-            left = self._child_by_field(node, "left")
-            state = self._eval_expr(right) if right else ValueState()
-            variable = self._variable_key(left)
-            if variable:
-                self._mark_callable_state(state)
-                self.variables[variable] = state
-                self._check_sql_assignment(node, variable, right, state)
-            access_key = self._access_key(left)
-            if access_key:
-                self._check_session_assignment(node, access_key, state)
-                self.variables[access_key] = state
-            return state
-
-        if node.type == "if_statement":
-            return self._process_if_statement(node)
-
-        if node.type == "switch_statement":
-            return self._process_switch_statement(node)
-
-        if node.type in {"case_statement", "default_statement"}:
-            return self._process_case_statement(node)
-
-        if node.type == "function_call_expression":
-            return self._eval_function_call(node)
-
-        if node.type == "member_call_expression":
-            return self._eval_member_call(node)
-
-        if node.type == "echo_statement":
-            return self._eval_output_statement(node, "echo")
+    def _eval_expr(self, node: Node | None) -> ValueState:
+        self._check_budget()
+        if node is None:
+            return EMPTY
+        handler = self.expression_handlers.get(node.type)
+        if handler:
+            return handler(node)
+        return self._merge_named_children(node, self._eval_expr, self.expression_handlers)
+
+    def _merge_named_children(
+        self,
+        node: Node,
+        evaluate: Callable[[Node], ValueState],
+        handlers: dict[str, Callable[[Node], ValueState]],
+    ) -> ValueState:
+        state = EMPTY
+        stack = node.children[::-1]
+        while stack:
+            child = stack.pop()
+            if not child.is_named:
+                continue
+            if child.type in handlers:
+                state = state.merge(evaluate(child))
+                continue
+            self._check_budget()
+            stack.extend(child.children[::-1])
+        return state
 
-        if node.type == "print_intrinsic":
-            return self._eval_output_statement(node, "print")
+    def _process_expression_statement(self, node: Node) -> ValueState:
+        state = EMPTY
+        for child in node.children:
+            state = state.merge(self._process_node(child))
+        return state
 
-        if node.type in {"include_expression", "include_once_expression", "require_expression", "require_once_expression"}:
-            return self._eval_include_expression(node)
+    def _process_assignment(self, node: Node) -> ValueState:
+        right = self._child_by_field(node, "right")
+        left = self._child_by_field(node, "left")
+        state = self._eval_expr(right) if right else EMPTY
+        variable = self._variable_key(left)
+        if variable:
+            state = self._sql_assignment_state(variable, right, self._callable_state(state))
+            self.variables[variable] = state
+        access_key = self._access_key(left)
+        if access_key:
+            self._check_session_assignment(node, access_key, state)
+            self.variables[access_key] = state
+        return state
 
-        state = ValueState()
+    def _eval_variable(self, node: Node) -> ValueState:
+        variable = self._text(node)
+        if variable in self.superglobals:
+            return ValueState(tainted=True, sources=(variable,))
+        return self.variables.get(variable, EMPTY)
+
+    def _eval_subscript(self, node: Node) -> ValueState:
+        upload_state = self._eval_upload_file_access(node)
+        if upload_state is not None:
+            return upload_state
+        access_key = self._access_key(node)
+        if access_key and self._is_validated_expression(access_key):
+            return EMPTY
+        if access_key and access_key in self.variables:
+            return self.variables[access_key]
+        server_state = self._eval_server_access(node)
+        if server_state is not None:
+            return server_state
+        if self._is_files_entry_access(node):
+            return ValueState(tainted=True, upload_file_entry=True, sources=(self._text(node),))
+        if self._is_superglobal_access(node):
+            return ValueState(tainted=True, sources=(self._text(node),))
+        state = EMPTY
         for child in node.children:
-            if child.is_named:
-                state = state.merge(self._process_node(child))
+            state = state.merge(self._eval_expr(child))
         return state
 
-    def _eval_expr(self, node: Node | None) -> ValueState:
-        self._check_budget()
-        if node is None:
-            return ValueState()
+    def _eval_cast_expression(self, node: Node) -> ValueState:
+        cast_type = next((self._text(child).lower() for child in node.children if child.type == "cast_type"), "")
+        if cast_type in {"int", "integer", "float", "double", "real", "bool", "boolean"}:
+            return EMPTY
+        return self._merge_states(self._eval_expr(child) for child in node.children if child.is_named and child.type != "cast_type")
 
-        if node.type == "variable_name":
-            variable = self._text(node)
-            if variable in self.superglobals:
-                return ValueState(tainted=True, sources=[variable])
-            return self.variables.get(variable, ValueState())
-
-        if node.type == "subscript_expression":
-            upload_state = self._eval_upload_file_access(node)
-            if upload_state is not None:
-                return upload_state
-            access_key = self._access_key(node)
-            if access_key and self._is_validated_expression(access_key):
-                return ValueState()
-            if access_key and access_key in self.variables:
-                return self.variables[access_key]
-            server_state = self._eval_server_access(node)
-            if server_state is not None:
-                return server_state
-            if self._is_files_entry_access(node):
-                return ValueState(tainted=True, upload_file_entry=True, sources=[self._text(node)])
-            if self._is_superglobal_access(node):
-                return ValueState(tainted=True, sources=[self._text(node)])
-            state = ValueState()
-            for child in node.children:
+    def _eval_string(self, node: Node) -> ValueState:
+        literal = self._literal_string(node)
+        state = ValueState(literal_values=(literal,)) if literal else EMPTY
+        for child in node.children:
+            if child.is_named:
                 state = state.merge(self._eval_expr(child))
-            return state
-
-        if node.type == "assignment_expression":
-            return self._process_node(node)
-
-        if node.type == "conditional_expression":
-            return self._eval_conditional_expression(node)
-
-        if node.type == "cast_expression":
-            cast_type = next((self._text(child).lower() for child in node.children if child.type == "cast_type"), "")
-            if cast_type in {"int", "integer", "float", "double", "real", "bool", "boolean"}:
-                return ValueState()
-            return self._merge_states(self._eval_expr(child) for child in node.children if child.is_named and child.type != "cast_type")
-
-        if node.type == "function_call_expression":
-            return self._eval_function_call(node)
-
-        if node.type == "member_call_expression":
-            return self._eval_member_call(node)
-
-        if self._is_string_node(node):
-            literal = self._literal_string(node)
-            state = ValueState(literal_values=[literal] if literal else [])
-            for child in node.children:
-                if child.is_named:
-                    state = state.merge(self._eval_expr(child))
-            if self._looks_like_sql(self._text(node)):
-                state.sql_template = True
-                if self._has_risky_dynamic_interpolation(node):
-                    state.transforms.append("dynamic-sql-template")
-            return state
+        if self._looks_like_sql(self._text(node)):
+            state = replace(state, sql_template=True)
+            if self._has_risky_dynamic_interpolation(node):
+                state = state.with_transforms("dynamic-sql-template")
+        return state
 
-        if node.type == "binary_expression":
+    def _eval_binary_expression(self, node: Node) -> ValueState:
+        operands: list[Node | None] = []
+        while True:
+            operands.append(node.named_children[1] if node.named_child_count >= 2 else None)
             left = node.named_children[0] if node.named_child_count >= 1 else None
-            right = node.named_children[1] if node.named_child_count >= 2 else None
-            left_state = self._eval_expr(left)
-            right_state = self._eval_expr(right)
-            merged = left_state.merge(right_state)
-            concatenated = [
-                left_value + right_value
-                for left_value in left_state.literal_values[:MAX_LITERAL_VALUES]
-                for right_value in right_state.literal_values[:MAX_LITERAL_VALUES]
-            ]
-            merged.literal_values = ValueState._merge_limited(merged.literal_values, concatenated, MAX_LITERAL_VALUES)
+            if left is None or left.type != "binary_expression":
+                break
+            self._check_budget()
+            node = left
+        state = self._eval_expr(left)
+        for right in reversed(operands):
+            state = self._concat_states(state, self._eval_expr(right))
+        return state
+
+    def _concat_states(self, left_state: ValueState, right_state: ValueState) -> ValueState:
+        merged = left_state.merge(right_state)
+        if not left_state.literal_values or not right_state.literal_values:
             return merged
+        concatenated = tuple(
+            left_value + right_value
+            for left_value in left_state.literal_values
+            for right_value in right_state.literal_values
+        )
+        literal_values = merge_limited(merged.literal_values, concatenated, MAX_LITERAL_VALUES)
+        return merged if literal_values is merged.literal_values else replace(merged, literal_values=literal_values)
 
-        state = ValueState()
-        for child in node.children:
-            if child.is_named:
-                state = state.merge(self._eval_expr(child))
+    def _process_function_definition(self, node: Node) -> ValueState:
+        self._function_summary(node)
+        return EMPTY
+
+    def _process_closure(self, node: Node) -> ValueState:
+        captured: dict[str, ValueState] = {}
+        for clause in node.named_children:
+            if clause.type != "anonymous_function_use_clause":
+                continue
+            for child in clause.named_children:
+                variable = child if child.type == "variable_name" else next((item for item in child.named_children if item.type == "variable_name"), None)
+                if variable:
+                    name = self._text(variable)
+                    captured[name] = self.variables.get(name, EMPTY)
+        self._function_summary(node, captured)
+        return EMPTY
+
+    def _process_return(self, node: Node) -> ValueState:
+        state = self._merge_states(self._eval_expr(child) for child in node.named_children)
+        if self.scope:
+            self.scope.returns = self.scope.returns.merge(state)
         return state
 
+    def _process_global_declaration(self, node: Node) -> ValueState:
+        if self.scope:
+            for child in node.named_children:
+                if child.type == "variable_name":
+                    name = self._text(child)
+                    self.variables[name] = self.scope.global_variables.get(name, EMPTY)
+        return EMPTY
+
+    def _index_functions(self, root: Node) -> dict[str, Node]:
+        functions: dict[str, Node] = {}
+        for match in FUNCTION_NAME_PATTERN.finditer(self.source):
+            name = root.named_descendant_for_byte_range(match.start(1), match.end(1))
+            definition = name.parent if name else None
+            if definition is None or definition.type not in FUNCTION_TYPES:
+                continue
+            key = self._function_key(definition)
+            if key:
+                functions.setdefault(key, definition)
+        return functions
+
+    def _function_key(self, node: Node) -> str | None:
+        name = self._child_by_field(node, "name")
+        if not name:
+            return None
+        if node.type == "function_definition":
+            return self._qualify(self._namespace(node).name, self._text(name))
+        class_name = self._class_name(node)
+        return f"{self._class_key(class_name, node)}::{self._text(name)}".lower() if class_name else None
+
+    def _index_namespaces(self, root: Node) -> list[NamespaceScope]:
+        namespaces: list[NamespaceScope] = []
+        start, name = 0, ""
+        classes: dict[str, str] = {}
+        functions: dict[str, str] = {}
+        for child in root.named_children:
+            if child.type == "namespace_use_declaration":
+                self._add_use_declaration(child, classes, functions)
+                continue
+            if child.type != "namespace_definition":
+                continue
+            namespaces.append(NamespaceScope(start, child.start_byte, name, classes, functions))
+            name_node = self._child_by_field(child, "name")
+            body = self._child_by_field(child, "body")
+            start, name, classes, functions = child.start_byte, self._text(name_node).lower() if name_node else "", {}, {}
+            if body:
+                for statement in body.named_children:
+                    if statement.type == "namespace_use_declaration":
+                        self._add_use_declaration(statement, classes, functions)
+                namespaces.append(NamespaceScope(start, child.end_byte, name, classes, functions))
+                start, name, classes, functions = child.end_byte, "", {}, {}
+        namespaces.append(NamespaceScope(start, root.end_byte, name, classes, functions))
+        return [namespace for namespace in namespaces if namespace.end > namespace.start]
+
+    def _add_use_declaration(self, node: Node, classes: dict[str, str], functions: dict[str, str]) -> None:
+        declaration_kind = next((self._text(child).lower() for child in node.children if child.type in {"function", "const"}), "")
+        prefix = next((self._text(child).strip("\\") for child in node.named_children if child.type in {"namespace_name", "qualified_name", "name"}), "")
+        group = self._child_by_field(node, "body")
+        clauses = group.named_children if group else node.named_children
+        for clause in clauses:
+            if clause.type != "namespace_use_clause":
+                continue
+            kind_node = self._child_by_field(clause, "type")
+            kind = self._text(kind_node).lower() if kind_node else declaration_kind
+            target = next((child for child in clause.named_children if child.type in {"name", "qualified_name"}), None)
+            if not target:
+                continue
+            full_name = self._text(target).lstrip("\\")
+            if group and prefix:
+                full_name = f"{prefix}\\{full_name}"
+            alias = self._child_by_field(clause, "alias")
+            short_name = (self._text(alias) if alias else full_name.rsplit("\\", 1)[-1]).lower()
+            if kind == "function":
+                functions[short_name] = full_name.lower()
+            elif not kind:
+                classes[short_name] = full_name.lower()
+
+    def _declared_unconditionally(self, node: Node) -> bool:
+        declaration: Node | None = node
+        if node.type == "method_declaration":
+            while declaration and declaration.type not in CLASS_LIKE_TYPES:
+                declaration = declaration.parent
+        parent = declaration.parent if declaration else None
+        if parent and parent.type == "compound_statement":
+            parent = parent.parent
+        return parent is not None and parent.type in {"program", "namespace_definition"}
+
+    def _namespace(self, node: Node) -> NamespaceScope:
+        index = bisect.bisect_right(self.namespace_starts, node.start_byte) - 1
+        if index < 0:
+            return GLOBAL_NAMESPACE
+        namespace = self.namespaces[index]
+        return namespace if node.start_byte < namespace.end else GLOBAL_NAMESPACE
+
+    def _qualify(self, namespace: str, name: str) -> str:
+        return f"{namespace}\\{name}".lower() if namespace else name.lower()
+
+    def _function_keys(self, function_node: Node) -> tuple[str, ...]:
+        name = self._text(function_node)
+        if name.startswith("\\"):
+            return (name[1:].lower(),)
+        namespace = self._namespace(function_node)
+        lowered = name.lower()
+        if "\\" in name:
+            first, rest = lowered.split("\\", 1)
+            if first == "namespace":
+                return (self._qualify(namespace.name, rest),)
+            alias = namespace.classes.get(first)
+            return (f"{alias}\\{rest}",) if alias else (self._qualify(namespace.name, lowered),)
+        if lowered in namespace.functions:
+            return (namespace.functions[lowered],)
+        return (self._qualify(namespace.name, lowered), lowered) if namespace.name else (lowered,)
+
+    def _class_key(self, class_name: str, node: Node) -> str:
+        if class_name.startswith("\\"):
+            return class_name[1:].lower()
+        namespace = self._namespace(node)
+        lowered = class_name.lower()
+        first, _separator, rest = lowered.partition("\\")
+        if first == "namespace" and rest:
+            return self._qualify(namespace.name, rest)
+        alias = namespace.classes.get(first)
+        if alias:
+            return f"{alias}\\{rest}" if rest else alias
+        return self._qualify(namespace.name, lowered)
+
+    def _class_name(self, node: Node) -> str | None:
+        parent = node.parent
+        while parent and parent.type not in CLASS_LIKE_TYPES:
+            parent = parent.parent
+        name = self._child_by_field(parent, "name") if parent else None
+        return self._text(name) if name else None
+
+    def _function_summary(self, node: Node, captured: dict[str, ValueState] | None = None) -> FunctionSummary | None:
+        if node.start_byte in self.summaries:
+            return self.summaries[node.start_byte]
+        self.summaries[node.start_byte] = None
+        parameters, variadic = self._parameters(node)
+        variables = dict(captured or {})
+        for index, parameter in enumerate(parameters):
+            variables[parameter] = ValueState(parameters=(index,))
+        scope = FunctionScope(
+            class_name=None if node.type == "function_definition" else self._class_name(node),
+            global_variables=self.scope.global_variables if self.scope else self.variables,
+        )
+        saved = self.variables, self.scope, self.validated_expression_stack
+        self.variables, self.scope, self.validated_expression_stack = variables, scope, []
+        try:
+            body = self._child_by_field(node, "body")
+            if body:
+                self._process_block(body)
+        finally:
+            self.variables, self.scope, self.validated_expression_stack = saved
+        name = self._child_by_field(node, "name")
+        label = self._text(name) if name else "匿名函数"
+        summary = FunctionSummary(
+            name=f"{scope.class_name}::{label}" if scope.class_name and name else label,
+            file_path=self.file_path,
+            parameters=parameters,
+            variadic=variadic,
+            sinks=tuple(scope.sinks),
+            returns=scope.returns,
+        )
+        self.summaries[node.start_byte] = summary
+        return summary
+
+    def _parameters(self, node: Node) -> tuple[tuple[str, ...], bool]:
+        parameters_node = self._child_by_field(node, "parameters")
+        if not parameters_node:
+            return (), False
+        names: list[str] = []
+        variadic = False
+        for child in parameters_node.named_children:
+            name = self._child_by_field(child, "name")
+            if name:
+                names.append(self._text(name))
+                variadic = child.type == "variadic_parameter"
+        return tuple(names), variadic
+
+    def _call_summary(self, *keys: str) -> FunctionSummary | None:
+        for key in keys:
+            node = self.functions.get(key)
+            if node:
+                return self._function_summary(node)
+            self.imports.add(key)
+            summary = self.external.get(key)
+            if summary:
+                return summary
+        return None
+
+    def _apply_summary(self, node: Node, summary: FunctionSummary, argument_states: list[ValueState]) -> ValueState:
+        location = "" if summary.file_path == self.file_path else f" {os.path.basename(summary.file_path)} "
+        for sink in summary.sinks:
+            state = self._parameter_state(summary, argument_states, sink.parameter)
+            if not state.controlled:
+                continue
+            reached = state.with_transforms(*sink.transforms)
+            if sink.rule_id == "PHP_SQL_INJECTION_TAINT" and self._is_strong_sql_escaped(reached):
+                continue
+            self._add_taint_result(
+                node,
+                sink.rule_id,
+                sink.rule_name,
+                sink.severity,
+                f"{summary.name} 的参数 {summary.parameters[sink.parameter]} 来自 {', '.join(state.sources) or '用户输入'}，在{location}第 {sink.line} 行进入 {sink.match}",
+                reached,
+                self._text(node),
+            )
+        returned = replace(summary.returns, parameters=()) if summary.returns.parameters else summary.returns
+        for index in summary.returns.parameters:
+            returned = returned.merge(self._parameter_state(summary, argument_states, index))
+        return returned
+
+    def _parameter_state(self, summary: FunctionSummary, argument_states: list[ValueState], index: int) -> ValueState:
+        if summary.variadic and index == len(summary.parameters) - 1:
+            return self._merge_states(argument_states[index:])
+        return argument_states[index] if index < len(argument_states) else EMPTY
+
+    def _eval_scoped_call(self, node: Node) -> ValueState:
+        argument_states = [self._eval_expr(argument) for argument in self._arguments(node)]
+        scope_node = self._child_by_field(node, "scope")
+        name = self._child_by_field(node, "name")
+        class_name = None
+        if scope_node and scope_node.type == "relative_scope" and self._text(scope_node).lower() in {"self", "static"}:
+            class_name = self.scope.class_name if self.scope else None
+        elif scope_node and scope_node.type in {"name", "qualified_name", "relative_name"}:
+            class_name = self._text(scope_node)
+        summary = self._call_summary(f"{self._class_key(class_name, node)}::{self._text(name)}".lower()) if class_name and name else None
+        if summary:
+            return self._apply_summary(node, summary, argument_states)
+        return self._merge_states(argument_states)
+
     def _process_if_statement(self, node: Node) -> ValueState:
         condition = next((child for child in node.children if child.is_named and child.type == "parenthesized_expression"), None)
         validated = self._validated_inputs_from_condition(condition)
-        state = self._eval_expr(condition) if condition else ValueState()
+        state = self._eval_expr(condition) if condition else EMPTY
         body_seen = False
 
         for child in node.children:
@@ -301,7 +757,7 @@ class TaintAnalyzer:
         return state
 
     def _process_switch_statement(self, node: Node) -> ValueState:
-        state = ValueState()
+        state = EMPTY
         condition = next((child for child in node.children if child.is_named and child.type == "parenthesized_expression"), None)
         if condition:
             state = state.merge(self._eval_expr(condition))
@@ -317,16 +773,16 @@ class TaintAnalyzer:
                     self.variables = dict(base_variables)
                     state = state.merge(self._process_node(case_child))
                     for key, value in self.variables.items():
-                        branch_variables[key] = branch_variables.get(key, ValueState()).merge(value)
+                        branch_variables[key] = branch_variables.get(key, EMPTY).merge(value)
                 continue
             state = state.merge(self._process_node(child))
         self.variables = dict(base_variables)
         for key, value in branch_variables.items():
-            self.variables[key] = self.variables.get(key, ValueState()).merge(value)
+            self.variables[key] = self.variables.get(key, EMPTY).merge(value)
         return state
 
     def _process_case_statement(self, node: Node) -> ValueState:
-        state = ValueState()
+        state = EMPTY
         for child in node.children:
             if not child.is_named:
                 continue
@@ -339,30 +795,34 @@ class TaintAnalyzer:
         function_node = self._child_by_field(node, "function")
         arguments = self._arguments(node)
         function_name = self._function_name(function_node)
-        argument_state = self._merge_states(self._eval_expr(argument) for argument in arguments)
+        argument_states = [self._eval_expr(argument) for argument in arguments]
+        argument_state = self._merge_states(argument_states)
 
         if function_name:
             lowered = function_name.lower()
+            summary = None if lowered in self.builtin_functions else self._call_summary(*self._function_keys(function_node))
+            if summary:
+                return self._apply_summary(node, summary, argument_states)
             if lowered == "file_get_contents" and self._has_php_input_argument(arguments):
-                return ValueState(tainted=True, sources=["php://input"], transforms=[self._text(node)])
+                return ValueState(tainted=True, sources=("php://input",), transforms=(self._text(node),))
             if lowered == "move_uploaded_file":
                 self._check_upload_sink(node, arguments)
-                return ValueState()
+                return EMPTY
             if lowered in self.file_read_sinks:
                 self._check_file_sink(node, lowered, argument_state)
-                return ValueState()
+                return EMPTY
             if lowered in self.sql_sinks:
                 self._check_sql_sink(node, lowered, argument_state, arguments)
-                return ValueState()
+                return EMPTY
             self._check_named_sink(node, lowered, arguments, argument_state)
             if lowered in self.callback_sinks:
                 self._check_callback_sink(node, lowered, arguments)
             if lowered == "cookie" and len(arguments) == 1:
-                return ValueState(tainted=True, sources=[self._text(node)], transforms=["cookie"])
+                return ValueState(tainted=True, sources=(self._text(node),), transforms=("cookie",))
             if lowered in self.sanitizers:
-                return ValueState()
-            if lowered in self.deserialize_sinks and argument_state.tainted:
-                self._add_result(
+                return EMPTY
+            if lowered in self.deserialize_sinks and argument_state.controlled:
+                self._add_taint_result(
                     node,
                     "PHP_UNSERIALIZE_TAINT",
                     "用户输入进入反序列化",
@@ -372,54 +832,54 @@ class TaintAnalyzer:
                     self._text(node),
                 )
             if lowered in self.sql_value_normalizers:
-                return ValueState()
+                return EMPTY
             if lowered in self.decode_functions:
                 return self._decode_state(lowered, arguments, argument_state)
             if lowered in self.sql_escapers:
-                argument_state.transforms.append(lowered)
-                return argument_state
+                return argument_state.with_transforms(lowered)
             return argument_state
 
         if function_node and function_node.type == "variable_name":
             callable_name = self._text(function_node)
-            callable_state = self.variables.get(callable_name, ValueState())
-            if callable_state.tainted:
+            callable_state = self.variables.get(callable_name, EMPTY)
+            if callable_state.controlled:
                 state = callable_state.merge(argument_state)
                 detail = f"动态函数名 {callable_name} 来自 {', '.join(callable_state.sources) or '用户输入'}"
                 if argument_state.tainted:
                     detail += f"，参数来自 {', '.join(argument_state.sources) or '用户输入'}"
-                self._add_result(
+                self._add_taint_result(
                     node,
                     "PHP_DYNAMIC_FUNCTION_NAME_TAINT",
                     "用户输入控制动态函数名",
                     "Critical",
                     detail,
-                    state,
+                    state if callable_state.tainted else callable_state,
                     self._text(node),
                 )
-                return ValueState()
-            if callable_state.suspicious_callable and argument_state.tainted:
-                self._add_result(
-                    node,
-                    "PHP_DYNAMIC_BACKDOOR",
-                    "可疑动态函数后门",
-                    "Critical",
-                    f"变量 {callable_name} 由可疑 callable 赋值后调用，参数来自 {', '.join(argument_state.sources) or '用户输入'}",
-                    callable_state.merge(argument_state),
-                    self._text(node),
-                )
-            elif callable_state.suspicious_callable and self._has_suspicious_command(argument_state):
-                self._add_result(
-                    node,
-                    "PHP_DYNAMIC_BACKDOOR",
-                    "可疑动态函数后门",
-                    "Critical",
-                    f"变量 {callable_name} 由可疑 callable 赋值后调用，参数包含下载执行、反连或混淆解码特征",
-                    callable_state.merge(argument_state),
-                    self._text(node),
-                )
-            elif argument_state.tainted:
-                self._add_result(
+                return EMPTY
+            if callable_state.suspicious_callable:
+                if argument_state.controlled:
+                    self._add_taint_result(
+                        node,
+                        "PHP_DYNAMIC_BACKDOOR",
+                        "可疑动态函数后门",
+                        "Critical",
+                        f"变量 {callable_name} 由可疑 callable 赋值后调用，参数来自 {', '.join(argument_state.sources) or '用户输入'}",
+                        callable_state.merge(argument_state),
+                        self._text(node),
+                    )
+                if not argument_state.tainted and self._has_suspicious_command(argument_state):
+                    self._add_result(
+                        node,
+                        "PHP_DYNAMIC_BACKDOOR",
+                        "可疑动态函数后门",
+                        "Critical",
+                        f"变量 {callable_name} 由可疑 callable 赋值后调用，参数包含下载执行、反连或混淆解码特征",
+                        callable_state.merge(argument_state),
+                        self._text(node),
+                    )
+            elif argument_state.controlled:
+                self._add_taint_result(
                     node,
                     "PHP_DYNAMIC_TAINT_CALL",
                     "动态函数调用用户输入",
@@ -428,28 +888,39 @@ class TaintAnalyzer:
                     argument_state,
                     self._text(node),
                 )
-            return ValueState()
+            return EMPTY
 
         return argument_state
 
     def _eval_member_call(self, node: Node) -> ValueState:
         arguments = self._arguments(node)
         method_name = self._member_method_name(node)
-        argument_state = self._merge_states(self._eval_expr(argument) for argument in arguments)
+        argument_states = [self._eval_expr(argument) for argument in arguments]
+        argument_state = self._merge_states(argument_states)
+        key = self._this_method_key(node, method_name)
+        summary = self._call_summary(key) if key else None
+        if summary:
+            return self._apply_summary(node, summary, argument_states)
         if method_name and self._is_request_input_call(node, method_name):
-            return ValueState(tainted=True, sources=[self._text(node)], transforms=[f"request->{method_name}"])
+            return ValueState(tainted=True, sources=(self._text(node),), transforms=(f"request->{method_name}",))
         if method_name and method_name.lower() in self.validator_methods:
-            return ValueState(transforms=[method_name.lower()])
+            return ValueState(transforms=(method_name.lower(),))
         if method_name and method_name.lower() in self.sql_methods:
             self._check_sql_sink(node, f"->{method_name}", argument_state, arguments)
-            return ValueState()
+            return EMPTY
         return argument_state
 
+    def _this_method_key(self, node: Node, method_name: str | None) -> str | None:
+        target = self._child_by_field(node, "object")
+        if not (method_name and self.scope and self.scope.class_name and target and self._text(target) == "$this"):
+            return None
+        return f"{self._class_key(self.scope.class_name, node)}::{method_name}".lower()
+
     def _eval_include_expression(self, node: Node) -> ValueState:
         expression = next((child for child in node.children if child.is_named), None)
         state = self._eval_expr(expression)
-        if state.tainted:
-            self._add_result(
+        if state.controlled:
+            self._add_taint_result(
                 node,
                 "PHP_FILE_INCLUDE_TAINT",
                 "用户输入进入文件包含函数",
@@ -466,12 +937,12 @@ class TaintAnalyzer:
             fallback_state = self._eval_expr(named[2])
             if not fallback_state.tainted:
                 method = self._member_method_name(named[0]) or "validator"
-                return ValueState(transforms=[method.lower()])
+                return ValueState(transforms=(method.lower(),))
         return self._merge_states(self._eval_expr(child) for child in named)
 
     def _check_named_sink(self, node: Node, name: str, arguments: list[Node], argument_state: ValueState) -> None:
-        if name in self.code_sinks and argument_state.tainted:
-            self._add_result(
+        if name in self.code_sinks and argument_state.controlled:
+            self._add_taint_result(
                 node,
                 "PHP_CODE_EXEC_TAINT",
                 "用户输入进入代码执行函数",
@@ -480,30 +951,31 @@ class TaintAnalyzer:
                 argument_state,
                 self._text(node),
             )
-        elif name in self.command_sinks and argument_state.tainted:
-            self._add_result(
-                node,
-                "PHP_COMMAND_EXEC_TAINT",
-                "用户输入进入命令执行函数",
-                "Critical",
-                f"命令执行函数 {name} 的参数来自 {', '.join(argument_state.sources) or '用户输入'}",
-                argument_state,
-                self._text(node),
-            )
-        elif name in self.command_sinks and self._has_suspicious_command(argument_state):
-            self._add_result(
-                node,
-                "PHP_COMMAND_EXEC_SUSPICIOUS",
-                "命令执行函数运行可疑命令",
-                "Critical",
-                f"命令执行函数 {name} 的参数包含下载执行、反连或混淆解码特征",
-                argument_state,
-                self._text(node),
-            )
+        elif name in self.command_sinks:
+            if argument_state.controlled:
+                self._add_taint_result(
+                    node,
+                    "PHP_COMMAND_EXEC_TAINT",
+                    "用户输入进入命令执行函数",
+                    "Critical",
+                    f"命令执行函数 {name} 的参数来自 {', '.join(argument_state.sources) or '用户输入'}",
+                    argument_state,
+                    self._text(node),
+                )
+            if not argument_state.tainted and self._has_suspicious_command(argument_state):
+                self._add_result(
+                    node,
+                    "PHP_COMMAND_EXEC_SUSPICIOUS",
+                    "命令执行函数运行可疑命令",
+                    "Critical",
+                    f"命令执行函数 {name} 的参数包含下载执行、反连或混淆解码特征",
+                    argument_state,
+                    self._text(node),
+                )
         elif name in self.sql_sinks:
             self._check_sql_sink(node, name, argument_state, arguments)
             return
-        elif name in self.file_sinks and argument_state.tainted:
+        elif name in self.file_sinks and argument_state.controlled:
             rule_id = "PHP_FILE_INCLUDE_TAINT" if name in self.file_include_sinks else "PHP_FILE_READ_TAINT"
             rule_name = "用户输入进入文件包含函数" if name in self.file_include_sinks else "用户输入进入文件读取函数"
             description = (
@@ -511,41 +983,38 @@ class TaintAnalyzer:
                 if name in self.file_include_sinks
                 else f"文件读取函数 {name} 的路径参数来自用户输入"
             )
-            self._add_result(node, rule_id, rule_name, "High", description, argument_state, self._text(node))
-        elif name == "preg_replace" and self._is_preg_replace_eval(arguments) and argument_state.tainted:
-            self._add_result(
-                node,
-                "PHP_PREG_REPLACE_E_TAINT",
-                "preg_replace /e 代码执行",
-                "Critical",
-                "preg_replace 使用 /e 修饰符且参数包含用户输入",
-                argument_state,
-                self._text(node),
-            )
-        elif name == "preg_replace" and self._is_preg_replace_eval(arguments) and self._has_suspicious_command(argument_state):
-            self._add_result(
-                node,
-                "PHP_PREG_REPLACE_E_SUSPICIOUS",
-                "preg_replace /e 执行可疑命令",
-                "Critical",
-                "preg_replace 使用 /e 修饰符，替换表达式包含可疑命令执行特征",
-                argument_state,
-                self._text(node),
-            )
+            self._add_taint_result(node, rule_id, rule_name, "High", description, argument_state, self._text(node))
+        elif name == "preg_replace" and self._is_preg_replace_eval(arguments):
+            if argument_state.controlled:
+                self._add_taint_result(
+                    node,
+                    "PHP_PREG_REPLACE_E_TAINT",
+                    "preg_replace /e 代码执行",
+                    "Critical",
+                    "preg_replace 使用 /e 修饰符且参数包含用户输入",
+                    argument_state,
+                    self._text(node),
+                )
+            if not argument_state.tainted and self._has_suspicious_command(argument_state):
+                self._add_result(
+                    node,
+                    "PHP_PREG_REPLACE_E_SUSPICIOUS",
+                    "preg_replace /e 执行可疑命令",
+                    "Critical",
+                    "preg_replace 使用 /e 修饰符，替换表达式包含可疑命令执行特征",
+                    argument_state,
+                    self._text(node),
+                )
 
-    def _check_sql_assignment(self, node: Node, variable: str, right: Node | None, state: ValueState) -> None:
-        if not right or not state.sql_template:
-            return
-        if not state.tainted:
-            return
-        for item in (variable, self._text(right)):
-            if item not in state.transforms:
-                state.transforms.append(item)
+    def _sql_assignment_state(self, variable: str, right: Node | None, state: ValueState) -> ValueState:
+        if not right or not state.sql_template or not state.tainted:
+            return state
+        return state.with_transforms(variable, self._text(right))
 
     def _check_sql_sink(self, node: Node, name: str, argument_state: ValueState, arguments: list[Node]) -> None:
         if self._is_parameterized_query(arguments):
             return
-        if not argument_state.tainted:
+        if not argument_state.controlled:
             return
         escaped = any(transform in self.sql_escapers for transform in argument_state.transforms)
         if self._is_strong_sql_escaped(argument_state):
@@ -554,7 +1023,7 @@ class TaintAnalyzer:
         description = f"SQL 查询函数 {name} 的 SQL 参数来自 {source}"
         if escaped:
             description += "；检测到转义函数处理，但拼接 SQL 仍应使用参数化查询，并确认数值上下文已加引号或强制类型转换"
-        self._add_result(
+        self._add_taint_result(
             node,
             "PHP_SQL_INJECTION_TAINT",
             "用户输入进入 SQL 查询",
@@ -579,18 +1048,18 @@ class TaintAnalyzer:
         callback_state = self._eval_expr(arguments[0])
         rest_state = self._merge_states(self._eval_expr(argument) for argument in arguments[1:])
         dangerous = bool(callback and callback.lower() in self.dangerous_callable_names)
-        if callback_state.tainted:
+        if callback_state.controlled:
             state = callback_state.merge(rest_state)
             detail = f"{name} 的回调函数名来自 {', '.join(callback_state.sources) or '用户输入'}"
             if rest_state.tainted:
                 detail += f"，回调参数来自 {', '.join(rest_state.sources) or '用户输入'}"
-            self._add_result(
+            self._add_taint_result(
                 node,
                 "PHP_DYNAMIC_CALLBACK_NAME_TAINT",
                 "用户输入控制动态回调",
                 "Critical",
                 detail,
-                state,
+                state if callback_state.tainted else callback_state,
                 self._text(node),
             )
             return
@@ -605,8 +1074,10 @@ class TaintAnalyzer:
                 self._text(node),
             )
             return
-        if (dangerous or callback_state.suspicious_callable) and rest_state.tainted:
-            self._add_result(
+        if not (dangerous or callback_state.suspicious_callable):
+            return
+        if rest_state.controlled:
+            self._add_taint_result(
                 node,
                 "PHP_CALLBACK_TAINT",
                 "用户输入进入危险回调",
@@ -615,7 +1086,7 @@ class TaintAnalyzer:
                 callback_state.merge(rest_state),
                 self._text(node),
             )
-        elif (dangerous or callback_state.suspicious_callable) and self._has_suspicious_command(rest_state):
+        if not rest_state.tainted and self._has_suspicious_command(rest_state):
             self._add_result(
                 node,
                 "PHP_CALLBACK_SUSPICIOUS_COMMAND",
@@ -627,9 +1098,9 @@ class TaintAnalyzer:
             )
 
     def _check_session_assignment(self, node: Node, access_key: str, state: ValueState) -> None:
-        if not access_key.startswith("$_SESSION[") or not state.tainted:
+        if not access_key.startswith("$_SESSION[") or not state.controlled:
             return
-        self._add_result(
+        self._add_taint_result(
             node,
             "PHP_SESSION_TAINT_WRITE",
             "用户输入写入 Session",
@@ -641,8 +1112,8 @@ class TaintAnalyzer:
 
     def _eval_output_statement(self, node: Node, name: str) -> ValueState:
         state = self._merge_states(self._eval_expr(child) for child in node.named_children)
-        if state.tainted and not state.upload_file_entry:
-            self._add_result(
+        if state.controlled and not state.upload_file_entry:
+            self._add_taint_result(
                 node,
                 "PHP_OUTPUT_TAINT",
                 "用户输入输出到响应",
@@ -660,9 +1131,9 @@ class TaintAnalyzer:
         if len(arguments) < 2:
             return
         destination_state = self._eval_expr(arguments[1])
-        if not destination_state.tainted:
+        if not destination_state.controlled:
             return
-        self._add_result(
+        self._add_taint_result(
             node,
             "PHP_UPLOAD_TAINTED_DESTINATION",
             "上传文件保存路径可控",
@@ -680,8 +1151,12 @@ class TaintAnalyzer:
             tainted=argument_state.tainted,
             suspicious_callable=bool(decoded) or argument_state.suspicious_callable,
             sources=argument_state.sources,
-            transforms=[*argument_state.transforms, *transforms, *[f"dangerous:{value}" for value in dangerous]],
-            literal_values=[*argument_state.literal_values, *decoded],
+            transforms=unique_limited(
+                [*argument_state.transforms, *transforms, *[f"dangerous:{value}" for value in dangerous]],
+                MAX_STATE_ITEMS,
+            ),
+            literal_values=unique_limited([*argument_state.literal_values, *decoded], MAX_LITERAL_VALUES),
+            parameters=argument_state.parameters,
         )
 
     def _decoded_literals(self, decoder: str, node: Node) -> list[str]:
@@ -716,9 +1191,12 @@ class TaintAnalyzer:
     def _has_suspicious_command(self, state: ValueState) -> bool:
         return any(self.suspicious_command_pattern.search(value) for value in state.literal_values + state.transforms)
 
-    def _mark_callable_state(self, state: ValueState) -> None:
+    def _callable_state(self, state: ValueState) -> ValueState:
+        if state.suspicious_callable:
+            return state
         if any(value.lower().lstrip("\\") in self.dangerous_callable_names for value in state.literal_values):
-            state.suspicious_callable = True
+            return replace(state, suspicious_callable=True)
+        return state
 
     def _is_preg_replace_eval(self, arguments: list[Node]) -> bool:
         if not arguments:
@@ -726,6 +1204,16 @@ class TaintAnalyzer:
         pattern = self._literal_string(arguments[0]) or ""
         return bool(re.search(r"/[a-zA-Z]*e[a-zA-Z]*$", pattern))
 
+    def _add_taint_result(self, node: Node, rule_id: str, rule_name: str, severity: str, description: str, state: ValueState, match: str) -> None:
+        if state.tainted:
+            self._add_result(node, rule_id, rule_name, severity, description, state, match)
+        elif self.scope:
+            line = self._line(node)
+            self.scope.sinks.extend(
+                ParameterSink(parameter, rule_id, rule_name, severity, line, match, state.transforms)
+                for parameter in state.parameters
+            )
+
     def _add_result(self, node: Node, rule_id: str, rule_name: str, severity: str, description: str, state: ValueState, match: str) -> None:
         self.results.append({
             "type": "TaintAnalysis",
@@ -733,12 +1221,12 @@ class TaintAnalyzer:
             "rule_name": rule_name,
             "severity": severity,
             "file": self.file_path,
-            "line": node.start_point.row + 1,
+            "line": self._line(node),
             "description": description,
             "match": match,
             "details": {
-                "sources": state.sources,
-                "transforms": state.transforms,
+                "sources": list(state.sources),
+                "transforms": list(state.transforms),
             },
         })
 
@@ -784,7 +1272,7 @@ class TaintAnalyzer:
         if "$_FILES" in self._text(base):
             return True
         if base.type == "variable_name":
-            return self.variables.get(self._text(base), ValueState()).upload_file_entry
+            return self.variables.get(self._text(base), EMPTY).upload_file_entry
         return self._eval_expr(base).upload_file_entry
 
     def _is_files_entry_access(self, node: Node) -> bool:
@@ -800,22 +1288,22 @@ class TaintAnalyzer:
             return None
 
         if base.type == "variable_name" and self._text(base) == "$_FILES":
-            return ValueState(upload_file_entry=True, sources=[self._text(node)])
+            return ValueState(upload_file_entry=True, sources=(self._text(node),))
 
         if base.type == "subscript_expression":
             base_state = self._eval_upload_file_access(base)
         elif base.type == "variable_name":
-            base_state = self.variables.get(self._text(base), ValueState())
+            base_state = self.variables.get(self._text(base), EMPTY)
         else:
-            base_state = ValueState()
+            base_state = EMPTY
 
         if not base_state.upload_file_entry:
             return None
         if key in {"tmp_name", "size", "error"}:
-            return ValueState()
+            return EMPTY
         if key in {"name", "type", "full_path"}:
-            return ValueState(tainted=True, upload_file_entry=True, sources=[self._text(node)])
-        return ValueState(tainted=True, upload_file_entry=True, sources=[self._text(node)])
+            return ValueState(tainted=True, upload_file_entry=True, sources=(self._text(node),))
+        return ValueState(tainted=True, upload_file_entry=True, sources=(self._text(node),))
 
     def _is_superglobal_access(self, node: Node) -> bool:
         base = self._subscript_base(node)
@@ -827,8 +1315,8 @@ class TaintAnalyzer:
             return None
         key = self._subscript_key(node)
         if key in self.client_server_keys or (key and key.startswith("HTTP_")):
-            return ValueState(tainted=True, sources=[self._text(node)])
-        return ValueState()
+            return ValueState(tainted=True, sources=(self._text(node),))
+        return EMPTY
 
     def _subscript_base(self, node: Node) -> Node | None:
         return next((child for child in node.children if child.is_named and child.type != "string"), None)
@@ -840,7 +1328,7 @@ class TaintAnalyzer:
     def _function_name(self, node: Node | None) -> str | None:
         if not node:
             return None
-        if node.type in {"name", "qualified_name", "namespace_name"}:
+        if node.type in {"name", "qualified_name", "namespace_name", "relative_name"}:
             return self._text(node).lstrip("\\")
         return None
 
@@ -915,7 +1403,7 @@ class TaintAnalyzer:
         return node.child_by_field_name(field)
 
     def _merge_states(self, states) -> ValueState:
-        merged = ValueState()
+        merged = EMPTY
         for state in states:
             merged = merged.merge(state)
         return merged
@@ -941,5 +1429,10 @@ class TaintAnalyzer:
     def _looks_like_sql(self, value: str) -> bool:
         return bool(re.search(r"\b(select|insert|update|delete|replace|with)\b.+\b(from|into|set|where|values)\b", value, re.IGNORECASE | re.DOTALL))
 
+    def _line(self, node: Node) -> int:
+        if self.lines is None:
+            self.lines = LineIndex(self.source)
+        return self.lines.line_at(node.start_byte)
+
     def _text(self, node: Node) -> str:
         return self.source[node.start_byte:node.end_byte].decode("utf-8", "replace")
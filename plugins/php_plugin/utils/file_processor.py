@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Iterator
 
 from core.exception_handler import safe_operation
+from modules.file_module import FileModule
 
 logger = logging.getLogger(__name__)
 
@@ -22,23 +23,12 @@ class FileProcessor:
     @staticmethod
     @safe_operation
     def read_file_with_encoding(file_path: str) -> str:
-        path = Path(file_path)
-        for encoding in ("utf-8", "gbk", "latin1"):
-            try:
-                return path.read_text(encoding=encoding)
-            except UnicodeDecodeError:
-                continue
-        raise UnicodeError(f"Unable to read file with supported encodings: {path}")
+        return FileModule.read_file_with_encoding(file_path)
 
     @staticmethod
     @safe_operation
     def chunk_read_file(file_path: str, chunk_size: int = 8192) -> Iterator[str]:
-        path = Path(file_path)
-        try:
-            with path.open("r", encoding="utf-8") as file:
-                while chunk := file.read(chunk_size):
-                    yield chunk
-        except UnicodeDecodeError:
-            with path.open("r", encoding="gbk") as file:
-                while chunk := file.read(chunk_size):
-                    yield chunk
+        encoding = FileModule.file_encoding(file_path)
+        with Path(file_path).open("r", encoding=encoding, errors="replace") as file:
+            while chunk := file.read(chunk_size):
+                yield chunk
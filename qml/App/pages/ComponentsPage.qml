@@ -8,7 +8,8 @@ PageFrame {
 
     property var bridge: auditBridge
     property int pluginCardWidth: 252
-    property int pluginCardHeight: 154
+    property int pluginCardHeight: 286
+    property var scanWorkerOptions: ["自动", "1", "2", "4", "8", "16"]
 
     Popup {
         id: aiConfigPopup
@@ -257,6 +258,78 @@ PageFrame {
                         }
                     }
                 }
+
+                Row {
+                    width: parent.width
+                    spacing: 10
+
+                    Text {
+                        width: parent.width - workerCombo.width - 10
+                        height: 44
+                        text: "扫描进程"
+                        verticalAlignment: Text.AlignVCenter
+                        font.family: Styles.Theme.typography.family
+                        font.pixelSize: 13
+                        color: Styles.Theme.color.onSurfaceVariant
+                    }
+
+                    MD.ComboBox {
+                        id: workerCombo
+                        width: 110
+                        dense: true
+                        model: scanWorkerOptions
+                        currentText: bridge && bridge.scanWorkers > 0 ? String(bridge.scanWorkers) : "自动"
+                        onActivated: function(text) {
+                            if (bridge) bridge.setScanWorkers(text === "自动" ? 0 : parseInt(text))
+                        }
+                    }
+                }
+
+                Row {
+                    width: parent.width
+                    spacing: 10
+
+                    Text {
+                        width: parent.width - incrementalSwitch.width - 10
+                        height: 32
+                        text: "增量扫描"
+                        verticalAlignment: Text.AlignVCenter
+                        font.family: Styles.Theme.typography.family
+                        font.pixelSize: 13
+                        color: Styles.Theme.color.onSurfaceVariant
+                    }
+
+                    MD.Switch {
+                        id: incrementalSwitch
+                        checked: bridge ? bridge.incrementalScan : true
+                        onToggled: function(checked) {
+                            if (bridge) bridge.setIncrementalScan(checked)
+                        }
+                    }
+                }
+
+                Row {
+                    width: parent.width
+                    spacing: 10
+
+                    Text {
+                        width: parent.width - watchSwitch.width - 10
+                        height: 32
+                        text: "监视变更"
+                        verticalAlignment: Text.AlignVCenter
+                        font.family: Styles.Theme.typography.family
+                        font.pixelSize: 13
+                        color: Styles.Theme.color.onSurfaceVariant
+                    }
+
+                    MD.Switch {
+                        id: watchSwitch
+                        checked: bridge ? bridge.watchMode : false
+                        onToggled: function(checked) {
+                            if (bridge) bridge.setWatchMode(checked)
+                        }
+                    }
+                }
             }
         }
 
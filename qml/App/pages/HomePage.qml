@@ -214,12 +214,30 @@ PageFrame {
                 spacing: 10
 
                 MD.Button {
-                    text: bridge && bridge.scanning ? "扫描中" : "扫描项目"
+                    text: bridge && bridge.scanning
+                          ? (bridge.scanFilesTotal > 0 ? "扫描中 " + bridge.scanFilesDone + "/" + bridge.scanFilesTotal : "扫描中")
+                          : "扫描项目"
                     icon: "play_arrow"
                     enabled: bridge && !bridge.scanning
                     onClicked: bridge.startScan()
                 }
 
+                MD.Button {
+                    visible: bridge && bridge.scanCancellable
+                    text: bridge && bridge.scanPaused ? "继续" : "暂停"
+                    icon: bridge && bridge.scanPaused ? "play_arrow" : "pause"
+                    type: "tonal"
+                    onClicked: bridge.scanPaused ? bridge.resumeScan() : bridge.pauseScan()
+                }
+
+                MD.Button {
+                    visible: bridge && bridge.scanCancellable
+                    text: "取消"
+                    icon: "stop"
+                    type: "outlined"
+                    onClicked: bridge.cancelScan()
+                }
+
                 MD.Button {
                     text: "AI分析"
                     icon: "psychology"
@@ -268,7 +286,7 @@ PageFrame {
             width: parent.width
             height: 190
             clip: true
-            model: bridge ? bridge.findings : []
+            model: bridge ? bridge.findings : null
 
             delegate: Rectangle {
                 width: ListView.view.width
@@ -283,15 +301,15 @@ PageFrame {
 
                     Text {
                         width: 86
-                        text: modelData.severity
+                        text: model.severity
                         font.pixelSize: 12
                         font.weight: Font.DemiBold
-                        color: modelData.severity === "HIGH" ? Styles.Theme.color.error : Styles.Theme.color.primary
+                        color: model.severity === "HIGH" ? Styles.Theme.color.error : Styles.Theme.color.primary
                     }
 
                     Text {
                         width: 180
-                        text: modelData.ruleName
+                        text: model.ruleName
                         elide: Text.ElideRight
                         color: Styles.Theme.color.onSurface
                         font.pixelSize: 13
@@ -299,7 +317,7 @@ PageFrame {
 
                     Text {
                         width: 230
-                        text: modelData.file + ":" + modelData.line
+                        text: model.file + ":" + model.line
                         elide: Text.ElideMiddle
                         color: Styles.Theme.color.onSurfaceVariant
                         font.pixelSize: 13
@@ -307,7 +325,7 @@ PageFrame {
 
                     Text {
                         width: parent.width - 520
-                        text: modelData.description
+                        text: model.description
                         elide: Text.ElideRight
                         color: Styles.Theme.color.onSurfaceVariant
                         font.pixelSize: 13
@@ -319,7 +337,7 @@ PageFrame {
                     anchors.fill: parent
                     hoverEnabled: true
                     cursorShape: Qt.PointingHandCursor
-                    onClicked: bridge.openFinding(modelData.absolutePath, modelData.line)
+                    onClicked: bridge.openFinding(model.absolutePath, model.line)
                 }
             }
         }
@@ -328,4 +328,125 @@ PageFrame {
             }
         }
     }
+
+    MD.Card {
+        width: parent.width
+        height: 420
+
+        Item {
+            width: parent.width
+            height: parent.height
+
+            Text {
+                id: costTitle
+                anchors.left: parent.left
+                anchors.right: parent.right
+                anchors.top: parent.top
+                height: 56
+                verticalAlignment: Text.AlignVCenter
+                text: "规则耗时"
+                font.pixelSize: 18
+                font.weight: Font.DemiBold
+                color: Styles.Theme.color.onSurface
+            }
+
+            Row {
+                id: costHeader
+                anchors.left: parent.left
+                anchors.right: parent.right
+                anchors.top: costTitle.bottom
+                anchors.leftMargin: 14
+                height: 32
+                property int numberWidth: 96
+
+                Repeater {
+                    model: [
+                        { key: "id", title: "规则" },
+                        { key: "seconds", title: "总耗时(ms)" },
+                        { key: "averageMs", title: "平均(ms)" },
+                        { key: "files", title: "文件" },
+                        { key: "matches", title: "命中" },
+                        { key: "skipped", title: "跳过" }
+                    ]
+
+                    delegate: Text {
+                        width: index === 0 ? costHeader.width - costHeader.numberWidth * 5 - 14 : costHeader.numberWidth
+                        height: costHeader.height
+                        verticalAlignment: Text.AlignVCenter
+                        horizontalAlignment: index === 0 ? Text.AlignLeft : Text.AlignRight
+                        text: modelData.title + (rulesBridge && rulesBridge.costSortKey === modelData.key ? (rulesBridge.costSortDescending ? " ▼" : " ▲") : "")
+                        font.pixelSize: 13
+                        font.weight: Font.DemiBold
+                        color: rulesBridge && rulesBridge.costSortKey === modelData.key ? Styles.Theme.color.primary : Styles.Theme.color.onSurfaceVariant
+
+                        MouseArea {
+                            anchors.fill: parent
+                            cursorShape: Qt.PointingHandCursor
+                            onClicked: if (rulesBridge) rulesBridge.sortRuleCosts(modelData.key)
+                        }
+                    }
+                }
+            }
+
+            Rectangle {
+                anchors.left: parent.left
+                anchors.right: parent.right
+                anchors.top: costHeader.bottom
+                anchors.bottom: parent.bottom
+                radius: Styles.Theme.shape.medium
+                color: Styles.Theme.color.surfaceContainer
+                clip: true
+
+                Text {
+                    anchors.centerIn: parent
+                    visible: !rulesBridge || rulesBridge.ruleCosts.length === 0
+                    text: "完成一次扫描后显示各规则的耗时"
+                    font.pixelSize: 13
+                    color: Styles.Theme.color.onSurfaceVariant
+                }
+
+                ListView {
+                    anchors.fill: parent
+                    anchors.margins: 6
+                    clip: true
+                    model: rulesBridge ? rulesBridge.ruleCosts : []
+
+                    delegate: Row {
+                        width: ListView.view.width
+                        height: 34
+
+                        Text {
+                            width: parent.width - costHeader.numberWidth * 5 - 6
+                            anchors.verticalCenter: parent.verticalCenter
+                            leftPadding: 8
+                            text: "[" + modelData.language + "] " + modelData.id + (modelData.type === "AST_QUERY" ? "  · 语法树" : modelData.type === "CONTEXT" ? "  · 解码、行号与字符串/注释区间" : "")
+                            elide: Text.ElideRight
+                            font.pixelSize: 13
+                            color: Styles.Theme.color.onSurface
+                        }
+
+                        Repeater {
+                            model: [
+                                (modelData.seconds * 1000).toFixed(1),
+                                modelData.averageMs.toFixed(2),
+                                modelData.files,
+                                modelData.matches,
+                                modelData.skipped
+                            ]
+
+                            delegate: Text {
+                                width: costHeader.numberWidth
+                                anchors.verticalCenter: parent.verticalCenter
+                                horizontalAlignment: Text.AlignRight
+                                text: modelData
+                                font.pixelSize: 13
+                                font.family: Styles.Fonts.monoFamily
+                                color: Styles.Theme.color.onSurfaceVariant
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
 }
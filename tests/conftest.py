@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import importlib
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+from core.plugin_loader import PluginLoader
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="session")
+def php_plugin() -> ModuleType:
+    plugin = PluginLoader(str(APP_ROOT / "plugins")).load_plugin("php_plugin")
+    assert plugin is not None
+    return plugin
+
+
+@pytest.fixture(scope="session")
+def project_taint(php_plugin: ModuleType) -> ModuleType:
+    return importlib.import_module(f"{php_plugin.__name__}.project_taint")
+
+
+@pytest.fixture
+def make_tree(tmp_path: Path) -> Callable[[Mapping[str, str]], Path]:
+    def write(files: Mapping[str, str]) -> Path:
+        for relative_path, content in files.items():
+            path = tmp_path / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        return tmp_path
+
+    return write
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from pinesawfly.diff_scan import DiffScanPipeline
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="需要 git")
+
+HELPER = """<?php
+function shell($cmd) {
+    strlen($cmd);
+}
+function wrap($x) {
+    shell("ls " . $x);
+}
+"""
+CALLER = """<?php
+require_once __DIR__ . '/../lib/db.php';
+$dir = $_POST['dir'];
+wrap($dir);
+system("ls " . $_GET['d']); wrap($_GET['d']);
+"""
+UNRELATED = "<?php\necho 'ok';\n"
+
+
+@pytest.fixture
+def repository(make_tree, tmp_path: Path, monkeypatch) -> Path:
+    for name in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{name}_NAME", "tests")
+        monkeypatch.setenv(f"GIT_{name}_EMAIL", "tests@example.com")
+    monkeypatch.setenv("PINESAWFLY_CACHE_DIR", str(tmp_path / "cache"))
+    root = make_tree({"project/lib/db.php": HELPER, "project/web/index.php": CALLER, "project/web/other.php": UNRELATED}) / "project"
+    git(root, "init", "-q")
+    commit(root, "base")
+    return root
+
+
+def git(root: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+def commit(root: Path, message: str) -> None:
+    git(root, "add", "-A")
+    git(root, "commit", "-q", "-m", message)
+
+
+def edit_helper(root: Path, body: str) -> None:
+    path = root / "lib/db.php"
+    path.write_text(path.read_text(encoding="utf-8").replace("strlen($cmd);", body), encoding="utf-8")
+    commit(root, "helper")
+
+
+def diff_rows(root: Path) -> tuple[DiffScanPipeline, list[tuple[str, int, str, str, bool]]]:
+    pipeline = DiffScanPipeline(str(root), "HEAD~1")
+    results = pipeline.run()
+    return pipeline, sorted(
+        (str(row["file"]), int(row["line"]), str(row["ruleId"]), str(row["diffStatus"]), bool(row.get("crossFile")))
+        for row in results
+    )
+
+
+def test_helper_change_reports_new_findings_in_include_dependents(repository: Path) -> None:
+    edit_helper(repository, "system($cmd);")
+
+    pipeline, rows = diff_rows(repository)
+
+    assert [change.path for change in pipeline.changes] == ["lib/db.php"]
+    assert pipeline.dependents == ["web/index.php"]
+    assert ("web/index.php", 4, "PHP_COMMAND_EXEC_TAINT", "new", True) in rows
+    assert ("lib/db.php", 3, "PHP004", "new", False) in rows
+    assert not any(file == "web/other.php" for file, *_rest in rows)
+
+
+def test_local_and_cross_file_findings_on_one_line_merge(repository: Path) -> None:
+    edit_helper(repository, "system($cmd);")
+
+    pipeline, rows = diff_rows(repository)
+
+    assert [row for row in rows if row[0] == "web/index.php" and row[1] == 5] == [("web/index.php", 5, "PHP_COMMAND_EXEC_TAINT", "unchanged", True)]
+    assert pipeline.status_counts["new"] == sum(1 for row in rows if row[3] == "new")
+
+
+def test_reverting_helper_sink_reports_fixed_findings(repository: Path) -> None:
+    edit_helper(repository, "system($cmd);")
+    (repository / "lib/db.php").write_text(HELPER, encoding="utf-8")
+    commit(repository, "revert")
+
+    _pipeline, rows = diff_rows(repository)
+
+    assert ("web/index.php", 4, "PHP_COMMAND_EXEC_TAINT", "fixed", True) in rows
+    assert ("lib/db.php", 3, "PHP004", "fixed", False) in rows
+    assert ("web/index.php", 5, "PHP_COMMAND_EXEC_TAINT", "unchanged", False) in rows
+
+
+def test_unrelated_change_scans_only_that_file(repository: Path) -> None:
+    (repository / "web/other.php").write_text("<?php\neval($_GET['c']);\n", encoding="utf-8")
+    commit(repository, "other")
+
+    pipeline, rows = diff_rows(repository)
+
+    assert pipeline.dependents == []
+    assert {row[0] for row in rows} == {"web/other.php"}
+    assert all(status == "new" for _file, _line, _rule, status, _cross in rows)
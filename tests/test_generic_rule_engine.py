@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import pytest
+
+from modules.analysis_context import AnalysisContext
+from modules.generic_rule_engine import GenericRuleEngine
+
+PHP_SAMPLE = """<?php
+// eval($commented) is skipped
+$code = $_GET['code'];
+eval($code);
+# system($commented) is skipped too
+$cmd = $_POST['cmd'];
+system($cmd);
+$data = unserialize($_COOKIE['data']);
+echo "eval($in_string)";
+assert($code);
+"""
+
+
+@pytest.fixture(scope="module")
+def engine() -> GenericRuleEngine:
+    return GenericRuleEngine()
+
+
+def finding_keys(results: list[dict]) -> list[tuple[str, int, str]]:
+    return sorted((result["rule_id"], result["line"], result["match"]) for result in results)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"], ids=["lf", "crlf", "cr"])
+def test_mapped_scan_matches_decoded_scan(engine: GenericRuleEngine, tmp_path, newline: str) -> None:
+    path = tmp_path / "sample.php"
+    path.write_bytes(PHP_SAMPLE.replace("\n", newline).encode("ascii"))
+
+    decoded = finding_keys(engine.scan_file(str(path), AnalysisContext.from_file(path)))
+    mapped = finding_keys(engine.scan_mapped_file(str(path)))
+
+    assert decoded
+    assert mapped == decoded
+    assert {line for _rule_id, line, _match in decoded} >= {4, 7, 10}
+
+
+PHP_LEXER_SAMPLE = """<p>eval($html)</p>
+<?php
+$a = 'it\\'s eval($x)'; // system($c)
+# shell_exec($d)
+/* multi
+   exec($e) */ $b = "q\\"uote";
+$h = <<<EOT
+system($inside)
+EOT;
+$n = <<<'RAW'
+eval($raw)
+RAW;
+echo `ls`;
+?>
+tail eval($t)
+<?= 'short' ?>
+<?php $u = "unterminated"""
+
+
+def test_php_ignored_spans(engine: GenericRuleEngine) -> None:
+    spans = [(context, PHP_LEXER_SAMPLE[start:end]) for start, end, context in engine._php_ignored_spans(PHP_LEXER_SAMPLE)]
+
+    assert spans == [
+        ("outside_php", "<p>eval($html)</p>\n<?php"),
+        ("string", "'it\\'s eval($x)'"),
+        ("comment", "// system($c)"),
+        ("comment", "# shell_exec($d)"),
+        ("comment", "/* multi\n   exec($e) */"),
+        ("string", '"q\\"uote"'),
+        ("string", "<<<EOT\nsystem($inside)\nEOT"),
+        ("string", "<<<'RAW'\neval($raw)\nRAW"),
+        ("string", "`ls`"),
+        ("outside_php", "?>\ntail eval($t)\n<?="),
+        ("string", "'short'"),
+        ("outside_php", "?>\n<?php"),
+        ("string", '"unterminated'),
+    ]
+
+
+def test_php_ignored_spans_without_open_tag(engine: GenericRuleEngine) -> None:
+    assert engine._php_ignored_spans("eval($x);") == [(0, 9, "outside_php")]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [PHP_LEXER_SAMPLE, "<?php\n$s = <<<ÉTIQUETTE\nsystem($x) « ok »\nÉTIQUETTE;\neval($y); // « note »\n"],
+    ids=["ascii", "non-ascii"],
+)
+def test_php_byte_spans_match_text_spans(engine: GenericRuleEngine, source: str) -> None:
+    raw = source.encode("utf-8")
+
+    byte_spans = [(raw[start:end].decode("utf-8"), context) for start, end, context in engine._php_ignored_spans(raw)]
+    text_spans = [(source[start:end], context) for start, end, context in engine._php_ignored_spans(source)]
+
+    assert byte_spans == text_spans
+
+
+def test_rules_skip_strings_comments_and_heredocs(engine: GenericRuleEngine, tmp_path) -> None:
+    path = tmp_path / "lexer.php"
+    path.write_text(PHP_LEXER_SAMPLE.replace("echo `ls`;", "echo `ls`;\neval($code);"), encoding="utf-8")
+
+    lines = {line for rule_id, line, _match in finding_keys(engine.scan_file(str(path), AnalysisContext.from_file(path))) if rule_id == "PHP001"}
+
+    assert lines == {14}
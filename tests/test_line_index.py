@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+
+from modules.line_index import LineIndex
+
+TEXT = "first\nsecond line\n\nlast"
+
+
+@pytest.mark.parametrize("text", [TEXT, TEXT.encode("ascii")], ids=["str", "bytes"])
+def test_positions(text: str | bytes) -> None:
+    index = LineIndex(text)
+
+    assert len(index) == 4
+    assert index.position(0) == (1, 1)
+    assert index.position(5) == (1, 6)
+    assert index.position(6) == (2, 1)
+    assert index.position(text.index("line" if isinstance(text, str) else b"line")) == (2, 8)
+    assert index.line_at(18) == 3
+    assert index.position(len(text)) == (4, 5)
+    assert index.column_at(19) == 1
+
+
+def test_positions_match_counted_newlines() -> None:
+    text = "<?php\r\n$a = 1;\n\n  eval($a);\n"
+    index = LineIndex(text)
+
+    for offset in range(len(text) + 1):
+        line = text.count("\n", 0, offset) + 1
+        column = offset - (text.rfind("\n", 0, offset) + 1) + 1
+        assert index.position(offset) == (line, column)
+
+
+def test_line_bounds() -> None:
+    index = LineIndex(TEXT)
+
+    assert [TEXT[index.line_start(line):index.line_end(line)] for line in range(1, 5)] == ["first", "second line", "", "last"]
+    assert index.line_start(0) == 0
+    assert index.line_start(99) == index.line_start(4)
+    assert index.line_end(99) == len(TEXT)
+
+
+def test_trailing_newline_starts_an_empty_line() -> None:
+    index = LineIndex("a\n")
+
+    assert len(index) == 2
+    assert index.position(2) == (2, 1)
+    assert index.line_end(2) == 2
+
+
+def test_empty_text() -> None:
+    index = LineIndex("")
+
+    assert len(index) == 1
+    assert index.position(0) == (1, 1)
+    assert index.line_end(1) == 0
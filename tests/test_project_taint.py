@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import pytest
+
+from modules.project_walker import walk_project
+from pinesawfly.scan_pipeline import FileScanner
+
+HELPERS = {
+    "lib/db.php": """<?php
+function run_query($sql) {
+    return mysqli_query($GLOBALS['conn'], $sql);
+}
+function shell($cmd) {
+    system($cmd);
+}
+function wrap($x) {
+    shell("ls " . $x);
+}
+""",
+    "lib/input.php": """<?php
+function get_param($name) {
+    return htmlspecialchars($_GET[$name]);
+}
+""",
+    "web/index.php": """<?php
+require_once '../lib/db.php';
+$id = $_GET['id'];
+run_query("SELECT * FROM t WHERE id = " . $id);
+wrap($_POST['dir']);
+$p = get_param('p');
+echo $p;
+""",
+}
+
+CHAIN = {
+    "lib/c.php": "<?php\nfunction step_c($x) {\n    system($x);\n}\n",
+    "lib/b.php": "<?php\nfunction step_b($x) {\n    step_c($x);\n}\n",
+    "lib/a.php": "<?php\nfunction step_a($x) {\n    step_b($x);\n}\n",
+    "web/index.php": "<?php\nstep_a($_GET['cmd']);\n",
+}
+
+
+class Project:
+    def __init__(self, root: Path, project_taint: ModuleType, cache_path: Path | None = None) -> None:
+        self.root = root
+        self.project_taint = project_taint
+        self.cache_path = cache_path
+        self.scanner = FileScanner(str(root), walk_project(root))
+        self.tasks: list[list[str]] = []
+
+    @property
+    def files(self) -> list[str]:
+        return sorted(str(path) for path in self.root.rglob("*.php"))
+
+    def path(self, relative_path: str) -> str:
+        return str(self.root / relative_path)
+
+    def units(self, relative_paths: list[str] | None = None) -> dict[str, Any]:
+        paths = self.files if relative_paths is None else [self.path(relative_path) for relative_path in relative_paths]
+        units: dict[str, Any] = {}
+        for file_path in paths:
+            self.scanner.scan(file_path)
+            units[file_path] = self.scanner.take_project_unit()
+        return units
+
+    def run(self, tasks: list[tuple[str, Any]]) -> list[tuple[str, Any, list[dict], list]]:
+        self.tasks.append([Path(file_path).relative_to(self.root).as_posix() for file_path, _external in tasks])
+        return [(file_path, *analyzed) for file_path, external in tasks if (analyzed := self.scanner.analyze_project_file(file_path, external))]
+
+    def solve(self, units: dict[str, Any] | None = None, version: str = "1") -> tuple[Any, dict[str, list[tuple[str, int]]]]:
+        self.tasks = []
+        solver = self.project_taint.ProjectTaintSolver(self.root, self.run, self.cache_path, version)
+        findings = solver.solve(self.files, self.units() if units is None else units)
+        return solver, {
+            Path(file_path).relative_to(self.root).as_posix(): sorted((result["rule_id"], result["line"]) for result in results)
+            for file_path, results in findings.items()
+        }
+
+
+@pytest.fixture
+def project(make_tree, project_taint: ModuleType, tmp_path: Path) -> Project:
+    return Project(make_tree(HELPERS), project_taint, tmp_path / "cache" / "taint-summaries.json")
+
+
+def test_caller_gets_findings_through_helper_summaries(project: Project) -> None:
+    solver, findings = project.solve()
+
+    assert findings == {"web/index.php": [("PHP_COMMAND_EXEC_TAINT", 5), ("PHP_SQL_INJECTION_TAINT", 4)]}
+    assert project.tasks == [["web/index.php"]]
+    assert solver.rounds == 1
+
+
+def test_helper_edit_updates_only_its_callers(project: Project) -> None:
+    project.solve()
+    db_path = project.root / "lib/db.php"
+    db_path.write_text(db_path.read_text(encoding="utf-8").replace("system($cmd);", "strlen($cmd);"), encoding="utf-8")
+
+    solver, findings = project.solve(project.units(["lib/db.php"]))
+
+    assert findings == {"web/index.php": [("PHP_SQL_INJECTION_TAINT", 4)]}
+    assert project.tasks == [["web/index.php"]]
+    assert solver.solved_files == 1
+
+
+def test_helper_edit_without_effect_change_reuses_callers(project: Project) -> None:
+    project.solve()
+    db_path = project.root / "lib/db.php"
+    db_path.write_text(db_path.read_text(encoding="utf-8") + "\n// reviewed\n", encoding="utf-8")
+
+    solver, findings = project.solve(project.units(["lib/db.php"]))
+
+    assert findings == {"web/index.php": [("PHP_COMMAND_EXEC_TAINT", 5), ("PHP_SQL_INJECTION_TAINT", 4)]}
+    assert project.tasks == []
+    assert solver.solved_files == 0
+
+
+def test_duplicate_function_names_are_not_resolved(project: Project, make_tree) -> None:
+    make_tree({"lib/compat.php": "<?php\nfunction run_query($sql) {\n    return $sql;\n}\n"})
+
+    _solver, findings = project.solve()
+
+    assert findings == {"web/index.php": [("PHP_COMMAND_EXEC_TAINT", 5)]}
+
+
+def test_removing_a_duplicate_restores_resolution(project: Project, make_tree) -> None:
+    make_tree({"lib/compat.php": "<?php\nfunction run_query($sql) {\n    return $sql;\n}\n"})
+    project.solve()
+    (project.root / "lib/compat.php").unlink()
+
+    _solver, findings = project.solve({})
+
+    assert findings == {"web/index.php": [("PHP_COMMAND_EXEC_TAINT", 5), ("PHP_SQL_INJECTION_TAINT", 4)]}
+
+
+def test_summaries_propagate_through_a_chain(make_tree, project_taint: ModuleType) -> None:
+    project = Project(make_tree(CHAIN), project_taint)
+
+    solver, findings = project.solve()
+
+    assert findings == {"web/index.php": [("PHP_COMMAND_EXEC_TAINT", 2)]}
+    assert project.tasks == [["lib/b.php"], ["lib/a.php"], ["web/index.php"]]
+    assert solver.rounds == 3
+
+
+def test_solver_stops_after_max_rounds(make_tree, project_taint: ModuleType, monkeypatch, caplog) -> None:
+    monkeypatch.setattr(project_taint, "MAX_SOLVE_ROUNDS", 2)
+    project = Project(make_tree(CHAIN), project_taint)
+
+    with caplog.at_level(logging.WARNING):
+        solver, findings = project.solve()
+
+    assert findings == {}
+    assert solver.rounds == 2
+    assert project.tasks == [["lib/b.php"], ["lib/a.php"]]
+    assert "仍未收敛" in caplog.text
+
+
+def test_cache_reuses_solved_files(project: Project) -> None:
+    _solver, first = project.solve()
+
+    solver, cached = project.solve({})
+
+    assert cached == first
+    assert project.tasks == []
+    assert solver.rounds == 0
+
+
+def test_cache_is_ignored_for_another_plugin_version(project: Project) -> None:
+    _solver, first = project.solve()
+
+    _solver, findings = project.solve({}, version="2")
+
+    assert findings == first
+    assert project.tasks == [sorted(Path(file_path).relative_to(project.root).as_posix() for file_path in project.files), ["web/index.php"]]
+
+
+def test_truncated_files_are_not_cached(project: Project) -> None:
+    solver = project.project_taint.ProjectTaintSolver(project.root, project.run, project.cache_path, "1")
+    solver.solve(project.files, project.units(), truncated={project.path("web/index.php")})
+
+    _solver, findings = project.solve({})
+
+    assert findings == {"web/index.php": [("PHP_COMMAND_EXEC_TAINT", 5), ("PHP_SQL_INJECTION_TAINT", 4)]}
+    assert project.tasks == [["web/index.php"], ["web/index.php"]]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from modules.project_walker import ProjectWalker, is_ignored_path, walk_project
+
+TREE = {
+    "index.php": "<?php\n",
+    "src/App.PHP": "<?php\n",
+    "src/view.html": "<p></p>\n",
+    ".git/config": "[core]\n",
+    "src/__pycache__/cached.py": "",
+    "composer.json": "{}\n",
+    "vendor/autoload.php": "<?php\n",
+    "vendor/acme/lib.php": "<?php\n",
+    "package.json": "{}\n",
+    "node_modules/left-pad/index.js": "\n",
+    "assets/node_modules/keep.js": "\n",
+    "thinkphp/base.php": "<?php\n",
+    "thinkphp/library/think/App.php": "<?php\n",
+}
+
+
+def relative_files(root: Path, include_dependencies: bool = False) -> set[str]:
+    return set(walk_project(root, include_dependencies).relative_files)
+
+
+def test_walk_skips_always_ignored_and_dependency_dirs(make_tree) -> None:
+    root = make_tree(TREE)
+
+    assert relative_files(root) == {
+        "index.php",
+        "src/App.PHP",
+        "src/view.html",
+        "composer.json",
+        "package.json",
+        "assets/node_modules/keep.js",
+    }
+
+
+def test_walk_includes_dependencies_on_request(make_tree) -> None:
+    root = make_tree(TREE)
+
+    files = relative_files(root, include_dependencies=True)
+
+    assert {"vendor/acme/lib.php", "node_modules/left-pad/index.js", "thinkphp/library/think/App.php"} <= files
+    assert not any(path.startswith(".git/") or "__pycache__" in path for path in files)
+
+
+def test_dependency_dirs_are_listed_but_not_entered(make_tree) -> None:
+    inventory = walk_project(make_tree(TREE))
+
+    assert inventory.has_dir("vendor")
+    assert inventory.has_dir("node_modules")
+    assert not inventory.has_dir("vendor/acme")
+    assert not inventory.has_dir(".git")
+
+
+def test_vendor_without_composer_markers_is_project_code(make_tree) -> None:
+    root = make_tree({"vendor/tool.php": "<?php\n"})
+
+    assert relative_files(root) == {"vendor/tool.php"}
+
+
+@pytest.mark.parametrize(
+    ("relative_path", "expected"),
+    [
+        ("vendor/acme/lib.php", True),
+        ("node_modules/left-pad/index.js", True),
+        ("assets/node_modules/keep.js", False),
+        ("thinkphp/base.php", True),
+        (".git/config", True),
+        ("src/App.PHP", False),
+    ],
+)
+def test_is_ignored_agrees_with_walk(make_tree, relative_path: str, expected: bool) -> None:
+    root = make_tree(TREE)
+
+    assert ProjectWalker().is_ignored(root / relative_path, root) is expected
+    assert ProjectWalker().is_ignored(Path(relative_path), root) is expected
+    assert is_ignored_path(root / relative_path) is expected
+    assert ProjectWalker(include_dependencies=True).is_ignored(root / relative_path, root) is (relative_path == ".git/config")
+
+
+def test_inventory_queries(make_tree) -> None:
+    inventory = walk_project(make_tree(TREE))
+
+    assert [path.name for path in inventory.files_with_suffix({".php"})] == ["index.php", "App.PHP"]
+    assert inventory.has_file("src/view.html")
+    assert inventory.any_match("src/*.html")
+    assert inventory.any_match("**/keep.js")
+    assert not inventory.any_match("vendor/**/*.php")
+
+
+def test_with_changes_adds_and_removes_paths(make_tree) -> None:
+    root = make_tree(TREE)
+    inventory = walk_project(root)
+
+    changed = inventory.with_changes(
+        added_files=[root / "lib/new.php"],
+        removed_paths=[root / "src"],
+        added_dirs=[root / "lib"],
+    )
+
+    assert changed.has_file("lib/new.php")
+    assert changed.has_dir("lib")
+    assert not changed.has_dir("src")
+    assert not any(path.startswith("src/") for path in changed.relative_files)
+    assert inventory.has_file("src/App.PHP")
+    assert list(changed.files) == sorted(changed.files)
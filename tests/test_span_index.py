@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from modules.span_index import OUTSIDE_PHP, IgnoredSpans
+
+SPANS = [
+    (0, 6, OUTSIDE_PHP),
+    (10, 20, "string"),
+    (15, 25, "comment"),
+    (30, 30, "string"),
+    (40, 50, "string"),
+    (45, 48, "string"),
+]
+
+
+def test_covers_merges_overlapping_spans_of_selected_contexts() -> None:
+    spans = IgnoredSpans(lambda: SPANS)
+    both = frozenset({"string", "comment"})
+
+    assert [offset for offset in range(60) if spans.covers(offset, both)] == [*range(10, 25), *range(40, 50)]
+    assert [offset for offset in range(60) if spans.covers(offset, frozenset({"comment"}))] == list(range(15, 25))
+    assert [offset for offset in range(60) if spans.covers(offset, frozenset({OUTSIDE_PHP}))] == list(range(6))
+
+
+def test_empty_contexts_cover_nothing_without_loading() -> None:
+    loads: list[int] = []
+    spans = IgnoredSpans(lambda: loads.append(1) or SPANS)
+
+    assert not spans.covers(12, frozenset())
+    spans.prepare([frozenset()])
+    assert loads == []
+
+
+def test_spans_load_once_and_prepare_matches_lazy_lookup() -> None:
+    loads: list[int] = []
+    prepared = IgnoredSpans(lambda: loads.append(1) or SPANS)
+    lazy = IgnoredSpans(lambda: SPANS)
+    contexts = [frozenset({"string"}), frozenset({"comment", OUTSIDE_PHP})]
+
+    prepared.prepare(contexts)
+    prepared.prepare(contexts)
+
+    assert loads == [1]
+    for rule_contexts in contexts:
+        assert [prepared.covers(offset, rule_contexts) for offset in range(60)] == [lazy.covers(offset, rule_contexts) for offset in range(60)]
+    assert loads == [1]